@@ -0,0 +1,338 @@
+"""
+Basic strategy: the decision with the best expected value for every player
+hand against every dealer up card, computed exactly by dynamic programming.
+
+The rules are the simulation's: an infinite deck (every card equally likely,
+like deal_card), naturals settled before anyone plays, and a dealer who stands
+on soft 17 or hits it. On top of hitting and standing, the player may double
+(one more card for twice the bet) on the first two cards, and split a pair
+once, doubling allowed after the split and one card only to split aces.
+
+Computing a table takes a fraction of a second; it is still cached to disk as
+JSON, so the worker processes of a parallel simulation and every game just
+read it. A table is a chart like the ones printed on cards in casinos, one
+code per hand and up card:
+
+  - H: hit, S: stand, P: split.
+  - Dh: double, or hit if doubling is not allowed (after the first two cards).
+  - Ds: double, or stand if doubling is not allowed.
+
+Usage:
+    python basic_strategy.py --dealer h17
+"""
+
+import argparse
+import json
+from collections import Counter
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from cards import CARD_A, deck_of_cards
+
+# Bump when the computation changes, to recompute the tables cached on disk.
+VERSION = 1
+CACHE_DIR = Path(__file__).with_name("strategy_cache")
+
+# The probability of drawing each card value, with aces as 1.
+CARD_PROBABILITIES: dict = {
+    value: count / len(deck_of_cards)
+    for value, count in sorted(
+        Counter(
+            1 if card == CARD_A else points for card, points in deck_of_cards.items()
+        ).items()
+    )
+}
+# Dealer up cards, with an ace as 11 like the simulation's strategies get it.
+UPCARDS = range(2, 12)
+# The dealer's final totals, in the order of the distributions below.
+DEALER_FINALS = (17, 18, 19, 20, 21, "bust")
+
+HIT = "hit"
+STAND = "stand"
+DOUBLE = "double"
+SPLIT = "split"
+
+# The rows of a table: hard totals, soft totals (an ace counted as 11) and
+# pairs by the value of one of their cards (11 for aces). Totals start at a
+# single card, as the game asks for a decision after the first one.
+HARD_TOTALS = range(2, 22)
+SOFT_TOTALS = range(11, 22)
+PAIRS = range(2, 12)
+
+
+def hand_value(hard: int, has_ace: bool) -> tuple[int, bool]:
+    """The total of a hand from its hard total (aces as 1), and whether it is soft."""
+    soft: bool = has_ace and hard <= 11
+    return hard + 10 * soft, soft
+
+
+@lru_cache(maxsize=None)
+def dealer_finals(hard: int, has_ace: bool, hit_soft_17: bool) -> np.ndarray:
+    """
+    The probabilities of the dealer's final totals (DEALER_FINALS) from a hand
+    of hard total ``hard``.
+    """
+    total, soft = hand_value(hard, has_ace)
+    finals = np.zeros(len(DEALER_FINALS))
+    if total > 21:
+        finals[-1] = 1.0
+    elif total > 17 or (total == 17 and not (hit_soft_17 and soft)):
+        finals[total - 17] = 1.0
+    else:
+        for value, probability in CARD_PROBABILITIES.items():
+            finals += probability * dealer_finals(
+                hard + value, has_ace or value == 1, hit_soft_17
+            )
+    return finals
+
+
+@lru_cache(maxsize=None)
+def dealer_outcomes(upcard: int, hit_soft_17: bool) -> np.ndarray:
+    """
+    The probabilities of the dealer's final totals when showing ``upcard``
+    (2 to 11), knowing the dealer has no natural: naturals are settled first.
+    """
+    up: int = 1 if upcard == 11 else upcard
+    # A ten under an ace, or an ace under a ten, would have been a natural.
+    holes: dict = {
+        value: probability
+        for value, probability in CARD_PROBABILITIES.items()
+        if value + up != 11 or 1 not in (value, up)
+    }
+    weight: float = sum(holes.values())
+    return sum(
+        probability / weight * dealer_finals(up + value, 1 in (up, value), hit_soft_17)
+        for value, probability in holes.items()
+    )
+
+
+class Solver:
+    """The expected values of every decision against one dealer up card."""
+
+    def __init__(self, upcard: int, hit_soft_17: bool):
+        finals = dealer_outcomes(upcard, hit_soft_17)
+        # Standing on each total up to 21: win on a dealer bust or a lower
+        # total, lose to a higher one.
+        self.stand_values: list = [
+            finals[-1]
+            + finals[:-1][[final < total for final in DEALER_FINALS[:-1]]].sum()
+            - finals[:-1][[final > total for final in DEALER_FINALS[:-1]]].sum()
+            for total in range(22)
+        ]
+        self.best = lru_cache(maxsize=None)(self.best)
+
+    def draw(self, hard: int, has_ace: bool, then) -> float:
+        """The expected value of drawing one card and playing on with ``then``."""
+        value: float = 0.0
+        for card, probability in CARD_PROBABILITIES.items():
+            total, soft = hand_value(hard + card, has_ace or card == 1)
+            value += probability * (-1.0 if total > 21 else then(total, soft))
+        return value
+
+    def stand(self, hard: int, has_ace: bool) -> float:
+        return self.stand_values[hand_value(hard, has_ace)[0]]
+
+    def hit(self, hard: int, has_ace: bool) -> float:
+        return self.draw(hard, has_ace, self.best_total)
+
+    def double(self, hard: int, has_ace: bool) -> float:
+        return 2 * self.draw(hard, has_ace, self.stand_total)
+
+    def best(self, hard: int, has_ace: bool) -> float:
+        """The expected value of hitting or standing, whichever is better."""
+        if hand_value(hard, has_ace)[0] == 21:
+            return self.stand(hard, has_ace)
+        return max(self.stand(hard, has_ace), self.hit(hard, has_ace))
+
+    def best_total(self, total: int, soft: bool) -> float:
+        return self.best(total - 10 if soft else total, soft)
+
+    def split(self, card: int) -> float:
+        """
+        The expected value of splitting a pair of ``card`` (2 to 11): two hands
+        of one card each, played independently.
+        """
+        if card == 11:
+            # Split aces get one card each.
+            return 2 * self.draw(1, True, self.stand_total)
+        return 2 * self.draw(card, False, self.first_two_total)
+
+    def stand_total(self, total: int, soft: bool) -> float:
+        return self.stand_values[total]
+
+    def first_two_total(self, total: int, soft: bool) -> float:
+        return self.first_two(total - 10 if soft else total, soft)[1]
+
+    def first_two(self, hard: int, has_ace: bool) -> tuple[str, float]:
+        """The best code on two cards (H, S, Dh or Ds) and its expected value."""
+        stand: float = self.stand(hard, has_ace)
+        if hand_value(hard, has_ace)[0] == 21:
+            return "S", stand
+        hit: float = self.hit(hard, has_ace)
+        double: float = self.double(hard, has_ace)
+        if double > max(stand, hit):
+            return ("Dh" if hit > stand else "Ds"), double
+        return ("H", hit) if hit > stand else ("S", stand)
+
+
+def compute_table(hit_soft_17: bool = False) -> dict:
+    """
+    Returns the basic strategy chart, as ``{"hard": rows, "soft": rows,
+    "pairs": rows}``, where ``rows[total][upcard]`` is a code (H, S, Dh, Ds or
+    P) and the rows before the first total of a kind are empty.
+    """
+    table: dict = {
+        "hard": [[] for _ in range(HARD_TOTALS.stop)],
+        "soft": [[] for _ in range(SOFT_TOTALS.stop)],
+        "pairs": [[] for _ in range(PAIRS.stop)],
+    }
+    for upcard in UPCARDS:
+        solver = Solver(upcard, hit_soft_17)
+        for total in HARD_TOTALS:
+            table["hard"][total].append(solver.first_two(total, False)[0])
+        for total in SOFT_TOTALS:
+            table["soft"][total].append(solver.first_two(total - 10, True)[0])
+        for card in PAIRS:
+            value: int = 1 if card == 11 else card
+            code, unsplit = solver.first_two(2 * value, value == 1)
+            table["pairs"][card].append("P" if solver.split(card) > unsplit else code)
+    # Pad every row so it is indexed by the up card itself.
+    for rows in table.values():
+        for row in rows:
+            if row:
+                row[:0] = [None] * UPCARDS.start
+    return table
+
+
+def cached_table(name: str, compute: Callable[[], dict | list]) -> dict | list:
+    """
+    Returns the table in the JSON file ``name`` of CACHE_DIR when it holds one
+    of this VERSION, and computes it with ``compute`` and caches it otherwise.
+    """
+    path: Path = CACHE_DIR / name
+    try:
+        cached: dict = json.loads(path.read_text())
+        if cached["version"] == VERSION:
+            return cached["table"]
+    except (OSError, ValueError, KeyError):
+        pass
+    table: dict | list = compute()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": VERSION, "table": table}))
+    return table
+
+
+@lru_cache(maxsize=None)
+def load_table(hit_soft_17: bool = False) -> dict:
+    """Returns the chart of compute_table(), cached on disk by cached_table()."""
+    return cached_table(
+        f"basic_strategy_{'h17' if hit_soft_17 else 's17'}.json",
+        partial(compute_table, hit_soft_17),
+    )
+
+
+def decide(
+    total: int,
+    soft: bool,
+    upcard: int,
+    can_double: bool = False,
+    pair: int | None = None,
+    hit_soft_17: bool = False,
+) -> str:
+    """
+    Returns the basic strategy decision for a hand: HIT, STAND, DOUBLE or
+    SPLIT. After the first call for a rule, a lookup is a few list indexes.
+
+    Parameters:
+        total (int): The hand's total, with an ace counted as 11 if that does
+            not bust it.
+        soft (bool): Whether an ace is counted as 11.
+        upcard (int): The dealer's up card, 2 to 11 (an ace).
+        can_double (bool): Whether the hand may double (its first two cards).
+        pair (int | None): The card value (2 to 11) of a pair that may be
+            split.
+        hit_soft_17 (bool): Whether the dealer hits soft 17.
+
+    Example:
+        decide(16, False, 10)
+        'hit'
+        decide(11, False, 6, can_double=True)
+        'double'
+    """
+    if total >= 21:
+        return STAND
+    table: dict = load_table(hit_soft_17)
+    if pair is not None:
+        code: str = table["pairs"][pair][upcard]
+        if code == "P":
+            return SPLIT
+    else:
+        code = table["soft" if soft else "hard"][total][upcard]
+    if code[0] == "D":
+        return DOUBLE if can_double else {"h": HIT, "s": STAND}[code[1]]
+    return HIT if code == "H" else STAND
+
+
+@lru_cache(maxsize=None)
+def hit_array(hit_soft_17: bool) -> np.ndarray:
+    """
+    Whether basic strategy hits without doubling, as a boolean array indexed
+    by [soft, total, upcard] for every total up to 31.
+    """
+    hits = np.zeros((2, 32, 12), dtype=bool)
+    for soft, totals in ((False, HARD_TOTALS), (True, SOFT_TOTALS)):
+        for total in totals:
+            for upcard in UPCARDS:
+                hits[int(soft), total, upcard] = (
+                    decide(total, soft, upcard, hit_soft_17=hit_soft_17) == HIT
+                )
+    return hits
+
+
+def table_hits(hit_soft_17: bool, total, soft, upcard):
+    return hit_array(hit_soft_17)[np.asarray(soft, dtype=np.intp), total, upcard]
+
+
+def player_strategy(hit_soft_17: bool = False):
+    """
+    Returns basic strategy as a simulation strategy: whether to hit, on ints
+    or arrays, with doubles played as hits or stands since the simulation
+    does not double or split.
+
+    Example:
+        player_strategy()(12, False, 3)
+        True
+    """
+    return partial(table_hits, hit_soft_17)
+
+
+def chart(hit_soft_17: bool = False) -> str:
+    """The table as text, with a row per hand and a column per up card."""
+    table: dict = load_table(hit_soft_17)
+    lines: list = [
+        "      " + "".join(f"{'A' if up == 11 else up:>4}" for up in UPCARDS)
+    ]
+    for kind, totals, label in (
+        ("hard", range(5, 21), str),
+        ("soft", range(13, 21), lambda total: f"A,{total - 11}"),
+        ("pairs", PAIRS, lambda card: "A,A" if card == 11 else f"{card},{card}"),
+    ):
+        lines.append(kind)
+        for total in totals:
+            row: list = table[kind][total][UPCARDS.start :]
+            lines.append(f"{label(total):>6}" + "".join(f"{code:>4}" for code in row))
+    return "\n".join(lines)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Print the basic strategy chart.")
+    parser.add_argument("--dealer", choices=("s17", "h17"), default="s17")
+    args = parser.parse_args(argv)
+    print(chart(args.dealer == "h17"))
+
+
+if __name__ == "__main__":
+    main()
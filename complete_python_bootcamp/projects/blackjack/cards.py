@@ -0,0 +1,31 @@
+# Defining constants for the cards
+CARD_2 = "2"
+CARD_3 = "3"
+CARD_4 = "4"
+CARD_5 = "5"
+CARD_6 = "6"
+CARD_7 = "7"
+CARD_8 = "8"
+CARD_9 = "9"
+CARD_10 = "10"
+CARD_J = "J"
+CARD_Q = "Q"
+CARD_K = "K"
+CARD_A = "A"
+
+# Mapping card names to points.
+deck_of_cards = {
+    CARD_2: 2,
+    CARD_3: 3,
+    CARD_4: 4,
+    CARD_5: 5,
+    CARD_6: 6,
+    CARD_7: 7,
+    CARD_8: 8,
+    CARD_9: 9,
+    CARD_10: 10,
+    CARD_J: 10,
+    CARD_Q: 10,
+    CARD_K: 10,
+    CARD_A: 11,
+}
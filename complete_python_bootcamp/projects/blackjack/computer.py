@@ -1,6 +1,18 @@
+from hand import Hand
+
+
 class Computer:
     def __init__(self, points: int = 0):
         # Computers points
         self.points: int = points
         # Computers hand
-        self.hand: list = []
+        self.hand: Hand = Hand()
+
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Hand | list) -> None:
+        # A list of cards is scored into a Hand.
+        self._hand: Hand = cards if isinstance(cards, Hand) else Hand(cards)
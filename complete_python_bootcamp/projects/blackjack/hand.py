@@ -0,0 +1,136 @@
+"""
+A blackjack hand that keeps its score as cards are added, instead of
+rescanning every card like count_points() does.
+
+Usage:
+    python hand.py --hands 100000
+"""
+
+import argparse
+import random
+import timeit
+
+from cards import CARD_A, deck_of_cards
+
+
+class Hand:
+    """
+    The cards of a player or of the computer, with their total kept up to
+    date in O(1) per card.
+
+    Aces count as 11 until that would bust the hand, then as 1, one at a
+    time: ``soft_aces`` is the number of aces still counted as 11.
+
+    Example:
+        hand = Hand([CARD_A, CARD_6])
+        hand.total, hand.soft
+        (17, True)
+        hand.add(CARD_10)
+        hand.total, hand.soft
+        (17, False)
+    """
+
+    __slots__ = ("cards", "total", "soft_aces")
+
+    def __init__(self, cards: list | tuple = ()):
+        self.cards: list = []
+        self.total: int = 0
+        self.soft_aces: int = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: str) -> None:
+        """
+        Adds a card to the hand and updates its total.
+
+        Raises:
+            KeyError: If the card is not in deck_of_cards.
+        """
+        self.total += deck_of_cards[card]
+        self.cards.append(card)
+        if card == CARD_A:
+            self.soft_aces += 1
+        # Each ace is turned from 11 into 1 at most once over the whole hand.
+        while self.total > 21 and self.soft_aces:
+            self.total -= 10
+            self.soft_aces -= 1
+
+    def clear(self) -> None:
+        self.cards.clear()
+        self.total = 0
+        self.soft_aces = 0
+
+    @property
+    def soft(self) -> bool:
+        """Whether an ace counts as 11, so a card cannot bust the hand."""
+        return self.soft_aces > 0
+
+    @property
+    def bust(self) -> bool:
+        return self.total > 21
+
+    @property
+    def blackjack(self) -> bool:
+        """Whether the hand is 21 with its first two cards."""
+        return self.total == 21 and len(self.cards) == 2
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __repr__(self) -> str:
+        return f"Hand({self.cards!r})"
+
+
+def benchmark(hands: int, seed: int = 0) -> str:
+    """
+    Returns the time per card of scoring hands of 2 to 8 cards as they are
+    dealt: by calling count_points() before and after each card like
+    deal_card() used to, and with Hand.add().
+    """
+    # main imports this module through player, so it is imported here.
+    from main import count_points
+
+    rng = random.Random(seed)
+    lines: list = [f"{'cards':>5} {'count_points':>14} {'Hand':>10} {'speedup':>8}"]
+    for size in range(2, 9):
+        dealt: list = [rng.choices(list(deck_of_cards), k=size) for _ in range(hands)]
+
+        def rescan():
+            for cards in dealt:
+                hand: list = []
+                for card in cards:
+                    count_points(hand)
+                    hand.append(card)
+                    count_points(hand)
+
+        def incremental():
+            for cards in dealt:
+                hand = Hand()
+                for card in cards:
+                    hand.add(card)
+                    hand.total
+
+        before: float = min(timeit.repeat(rescan, number=1, repeat=3))
+        after: float = min(timeit.repeat(incremental, number=1, repeat=3))
+        per_card: float = 1e9 / (hands * size)
+        lines.append(
+            f"{size:>5} {before * per_card:>11.0f} ns {after * per_card:>7.0f} ns "
+            f"{before / after:>7.1f}x"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare count_points() with Hand's incremental total."
+    )
+    parser.add_argument("--hands", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    print(benchmark(args.hands))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,41 @@
+import argparse
 import random
+from cards import (
+    CARD_2,
+    CARD_3,
+    CARD_4,
+    CARD_5,
+    CARD_6,
+    CARD_7,
+    CARD_8,
+    CARD_9,
+    CARD_10,
+    CARD_J,
+    CARD_Q,
+    CARD_K,
+    CARD_A,
+    deck_of_cards,
+)
 from computer import Computer
+from exact_ev import decide
 from player import Player
+from shoe import Shoe
 
 # Declare GAME_RUNNING as a global variable at the top of the code
 GAME_RUNNING = True
 
-# Defining constants for the cards
-CARD_2 = "2"
-CARD_3 = "3"
-CARD_4 = "4"
-CARD_5 = "5"
-CARD_6 = "6"
-CARD_7 = "7"
-CARD_8 = "8"
-CARD_9 = "9"
-CARD_10 = "10"
-CARD_J = "J"
-CARD_Q = "Q"
-CARD_K = "K"
-CARD_A = "A"
-
-# Mapping card names to points.
-deck_of_cards = {
-    CARD_2: 2,
-    CARD_3: 3,
-    CARD_4: 4,
-    CARD_5: 5,
-    CARD_6: 6,
-    CARD_7: 7,
-    CARD_8: 8,
-    CARD_9: 9,
-    CARD_10: 10,
-    CARD_J: 10,
-    CARD_Q: 10,
-    CARD_K: 10,
-    CARD_A: 11,
-}
-
 
 def count_points(hand: list) -> int:
     """
     Calculates the total points in a given hand based on card values.
 
     Special handling:
-      - If a card is marked as 'A.' (indicating an Ace adjusted to avoid busting),
-        it is counted as 1 point.
+      - Aces count as 11; while the total exceeds 21, one Ace at a time counts as 1 instead.
       - All other cards are evaluated using the deck_of_cards mapping.
+      - This rescans the whole hand: Hand keeps the same total as cards are added.
 
     Parameters:
-        hand (list of str): A list of card representations. Each card is a string that should be a key in the deck_of_cards dictionary.
-                            Use 'A.' to denote an Ace counted as 1 point later.
+        hand (list of str | Hand): A list of card representations. Each card is a string that should be a key in the deck_of_cards dictionary.
 
     Returns:
         int: The total point value calculated from the hand.
@@ -60,27 +46,32 @@ def count_points(hand: list) -> int:
     """
 
     points = 0
+    aces = 0
     for card in hand:
         points += deck_of_cards[card]
+        aces += card == CARD_A
 
     # If points exceed 21, and we have Aces, adjust Aces from 11 to 1
-    while points > 21 and CARD_A in hand:
+    while points > 21 and aces:
         points -= 10  # Adjust one Ace from 11 to 1
+        aces -= 1
 
     return points
 
 
-def deal_card(entity: Player | Computer, role: str) -> str:
+def deal_card(entity: Player | Computer, role: str, shoe: Shoe | None = None) -> str:
     """
     Deals a random card to an entity and updates its hand accordingly.
 
     Special handling:
       - If the entity's points exceed 21 after receiving the card, it results in a bust (the entity loses).
       - The function selects a card at random from the deck and adds it to the entity's hand.
+      - With a shoe, the card is the next one dealt from it instead, so cards run out and can be counted.
 
     Parameters:
-        entity (Player | Computer): The entity (either a Player or Computer) receiving the card. The entity must have a `hand` attribute that is a list representing its current cards.
+        entity (Player | Computer): The entity (either a Player or Computer) receiving the card. The entity must have a `hand` attribute that is a Hand representing its current cards.
         role (str): A string representing the role of the entity (e.g., "Player" or "Computer") used in the response message.
+        shoe (Shoe | None): A finite shoe to deal from, instead of an infinite deck.
 
     Returns:
         str: A message indicating the card dealt to the entity and its updated point total, or a bust message if the total exceeds 21.
@@ -90,16 +81,14 @@ def deal_card(entity: Player | Computer, role: str) -> str:
         "Player got 10! Points: 15"
     """
 
-    current: int = count_points(entity.hand)
-    if current > 21:
+    if entity.hand.bust:
         return f"{role} busts! Points exceeded 21."
 
-    card: str = random.choice(list(deck_of_cards.keys()))
+    card: str = shoe.deal() if shoe else random.choice(list(deck_of_cards.keys()))
 
-    entity.hand.append(card)
-    current: int = count_points(entity.hand)  # Recalculate points after a card is added
+    entity.hand.add(card)  # The hand updates its points as the card is added
 
-    return f"{role} got {card}! Points: {current}"
+    return f"{role} got {card}! Points: {entity.hand.total}"
 
 
 def reset_points(comp: Computer, play: Player) -> str:
@@ -249,31 +238,73 @@ def player_input() -> tuple[float, float]:
     return total, betting
 
 
-def handle_game_round(result: str, player: Player, computer: Computer) -> str:
+def auto_choice(player: Player, computer: Computer) -> str:
+    """
+    Chooses the player's action by the game's best play (exact_ev.decide), for the auto-play mode.
+
+    Special handling:
+      - The decision is the one with the best expected value under the game's rules, given both totals.
+      - The table of decisions is computed on first use and cached on disk, like basic strategy's.
+      - A player without cards hits.
+
+    Parameters:
+        player (Player): The player entity, whose hand is played.
+        computer (Computer): The computer entity, whose whole hand is looked at.
+
+    Returns:
+        str: "hit" or "stand".
+
+    Example:
+        auto_choice(player, computer)
+        "hit"
+    """
+
+    if not player.hand:
+        return "hit"
+    return decide(player.hand.total, player.hand.soft, computer.hand.total)
+
+
+def handle_game_round(
+    result: str,
+    player: Player,
+    computer: Computer,
+    auto: bool = False,
+    shoe: Shoe | None = None,
+) -> str:
     """
     Handles the decision-making process at the end of a game round.
 
     This function is responsible for checking the game result, resetting the game state,
     and processing the player's actions (stand, hit, exit) based on the outcome.
+    A shoe whose cut card has come out is reshuffled before the new game's cards are dealt.
 
     Parameters:
         result (str): The result of the game round (e.g., "Game continues..", "Player wins!", "Computer wins!").
         player (Player): The player entity.
         computer (Computer): The computer entity.
+        auto (bool): Whether the game's best play chooses the player's action instead of the player.
+        shoe (Shoe | None): A finite shoe to deal from, instead of an infinite deck.
 
     Returns:
         str: A message indicating the next step of the game (e.g., "New Game!", "GAME OVER").
     """
     if result != "Game continues..":
         print(f"\nNew Game!")
-        print(deal_card(player, "Player"))
-        print(deal_card(computer, "Computer"))
+        if shoe and shoe.needs_shuffle:
+            shoe.shuffle()
+            print("The shoe is reshuffled.")
+        print(deal_card(player, "Player", shoe))
+        print(deal_card(computer, "Computer", shoe))
         return "New Game!"
 
-    # If the game continues, ask the player for their action (hit, stand, or exit)
-    player_choice: str = (
-        input('Player chooses to "stand", "hit", "exit": ').strip().lower()
-    )
+    if auto:
+        player_choice: str = auto_choice(player, computer)
+        print(f'Player chooses to "{player_choice}"')
+    else:
+        # If the game continues, ask the player for their action (hit, stand, or exit)
+        player_choice = (
+            input('Player chooses to "stand", "hit", "exit": ').strip().lower()
+        )
 
     while player_choice not in ("stand", "hit", "exit"):
         print("Invalid input. Please choose 'stand', 'hit' or 'exit'.")
@@ -282,11 +313,11 @@ def handle_game_round(result: str, player: Player, computer: Computer) -> str:
         )
 
     if player_choice == "stand":
-        print(deal_card(computer, "Computer"))
+        print(deal_card(computer, "Computer", shoe))
         print(f"Player points: {player.points}")
     elif player_choice == "hit":
-        print(deal_card(player, "Player"))
-        print(deal_card(computer, "Computer"))
+        print(deal_card(player, "Player", shoe))
+        print(deal_card(computer, "Computer", shoe))
     elif player_choice == "exit":
         global GAME_RUNNING
         GAME_RUNNING = False
@@ -295,7 +326,13 @@ def handle_game_round(result: str, player: Player, computer: Computer) -> str:
     return "Game continues.."
 
 
-def game(player: Player, computer: Computer, betting_amount: float) -> str:
+def game(
+    player: Player,
+    computer: Computer,
+    betting_amount: float,
+    auto_rounds: int | None = None,
+    shoe: Shoe | None = None,
+) -> str:
     """
     Runs the game loop where the player competes against the computer, managing rounds and actions.
 
@@ -304,11 +341,15 @@ def game(player: Player, computer: Computer, betting_amount: float) -> str:
       - The player can choose to "stand", "hit", or "exit" during their turn.
       - If the player or computer busts or hits 21, the game outcome is determined and the round ends.
       - The game loops, prompting the player for decisions and updating the hands, points, and outcome after each round.
+      - With auto_rounds, the game's best play plays for the player instead, and the game ends after that many rounds.
+      - With a shoe, the cards are dealt from it and it is reshuffled between rounds once its cut card has come out.
 
     Parameters:
         player (Player): The player entity who participates in the game.
         computer (Computer): The computer entity, which competes against the player.
         betting_amount (float): The amount the player is betting for the current round.
+        auto_rounds (int | None): The number of rounds to auto-play, or None to ask the player.
+        shoe (Shoe | None): A finite shoe to deal from, instead of an infinite deck.
 
     Returns:
         str: A message indicating the game outcome or "GAME OVER" if the game ends.
@@ -320,33 +361,64 @@ def game(player: Player, computer: Computer, betting_amount: float) -> str:
 
     global GAME_RUNNING  # Declare GAME_RUNNING as global before using it
 
+    auto: bool = auto_rounds is not None
+    rounds_played: int = 0
     while GAME_RUNNING:
         if player.total_amount <= 0:
             return "Player doesn't have enough money to play!"
 
         # Update current points for both player and computer
-        player.points = count_points(player.hand)
-        computer.points = count_points(computer.hand)
+        player.points = player.hand.total
+        computer.points = computer.hand.total
 
         # Determine the outcome of the game round
         result = game_outcome(betting_amount, computer, player)
         print(result)
 
         # Use the handle_game_round function to process the outcome
-        result_message = handle_game_round(result, player, computer)
+        result_message = handle_game_round(result, player, computer, auto, shoe)
 
         if result_message == "GAME OVER":
             break
 
+        if result_message == "New Game!":
+            rounds_played += 1
+            if auto and rounds_played >= auto_rounds:
+                break
+
     return "GAME OVER"
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blackjack: Player vs. Computer.")
+    parser.add_argument(
+        "--auto",
+        type=int,
+        metavar="ROUNDS",
+        help="Let the best play play this many rounds for the player.",
+    )
+    parser.add_argument(
+        "--decks",
+        type=int,
+        help="Deal from a shoe of this many decks instead of an infinite deck.",
+    )
+    parser.add_argument(
+        "--penetration",
+        type=float,
+        default=0.75,
+        help="Share of the shoe dealt before it is reshuffled.",
+    )
+    args = parser.parse_args()
+    try:
+        shoe = Shoe(args.decks, args.penetration) if args.decks else None
+    except ValueError as error:
+        parser.error(str(error))
+
     total_amount, betting_amount = player_input()
     player = Player(total_amount)
     computer = Computer()
 
     # Deal initial card to both.
-    print(deal_card(player, "Player"))
-    print(deal_card(computer, "Computer"))
-    game(player, computer, betting_amount)
+    print(deal_card(player, "Player", shoe))
+    print(deal_card(computer, "Computer", shoe))
+    game(player, computer, betting_amount, args.auto, shoe)
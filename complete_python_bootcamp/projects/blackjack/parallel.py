@@ -0,0 +1,236 @@
+"""
+Runs simulations on every core: the hands are split into chunks of CHUNK_SIZE
+hands, the chunks are played by a pool of worker processes, and their results
+are merged in chunk order. Like simulate(), the workers play the game of
+main.py by default, and casino blackjack with rules=CasinoRules(...).
+
+Every chunk has its own random stream, spawned from the run's seed with
+numpy.random.SeedSequence. The streams are statistically independent, and the
+same seed gives the same hands whatever the number of workers.
+
+Usage:
+    python parallel.py --hands 100000000 --workers 4 --seed 1
+    python parallel.py --rules casino --player basic --dealer h17
+    python parallel.py --benchmark
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from rules import GAME_RULES, Rules
+from simulation import (
+    BLACKJACK,
+    DEALER_STRATEGIES,
+    PLAYER_STRATEGIES,
+    CasinoRules,
+    SimulationResult,
+    Strategy,
+    Tally,
+    rules_from,
+    simulate,
+    stand_on,
+)
+
+# Hands per chunk: enough to amortize sending a chunk to a worker, few enough
+# to keep every worker busy until the end of the run.
+CHUNK_SIZE = 1_000_000
+
+
+def chunk_seeds(
+    hands: int, seed: int | None, chunk_size: int = CHUNK_SIZE
+) -> list[tuple[int, np.random.SeedSequence]]:
+    """
+    Splits ``hands`` into chunks of at most ``chunk_size`` hands and returns
+    the size and seed of each.
+
+    Example:
+        chunk_seeds(2_500_000, 1)
+        [(1000000, SeedSequence(...)), (1000000, ...), (500000, ...)]
+    """
+    sizes: list = [
+        min(chunk_size, hands - start) for start in range(0, hands, chunk_size)
+    ]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def play_chunk(
+    engine: Callable, size: int, seed: np.random.SeedSequence, tally: bool, kwargs: dict
+) -> SimulationResult | Tally:
+    """Plays one chunk in a worker process."""
+    result: SimulationResult = engine(size, seed=seed, **kwargs)
+    return result.tally() if tally else result
+
+
+def run(
+    hands: int,
+    workers: int | None,
+    seed: int | None,
+    tally: bool,
+    engine: Callable,
+    chunk_size: int,
+    **kwargs,
+) -> list:
+    """The results of every chunk, in chunk order."""
+    chunks: list = chunk_seeds(hands, seed, chunk_size)
+    if not chunks:
+        return []
+    sizes, seeds = zip(*chunks)
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(
+            pool.map(
+                partial(play_chunk, engine, tally=tally, kwargs=kwargs), sizes, seeds
+            )
+        )
+
+
+def simulate_parallel(
+    hands: int,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+    seed: int | None = None,
+    workers: int | None = None,
+    engine: Callable = simulate,
+    chunk_size: int = CHUNK_SIZE,
+) -> SimulationResult:
+    """
+    Plays ``hands`` hands like simulate(), on ``workers`` processes (one per
+    core by default), and returns the payout of every hand. ``rules`` is
+    GAME_RULES (the game of main.py) or a CasinoRules.
+
+    Special handling:
+      - The result depends on ``seed`` and ``chunk_size`` only, not on
+        ``workers``. It differs from simulate() with the same seed, which
+        plays every hand from one stream.
+      - Every payout is sent back to this process: for runs too large for
+        that, use tally_parallel().
+
+    Parameters:
+        engine (Callable): Plays a chunk: called as ``engine(size, seed=...,
+            player=..., rules=...)`` in the workers, so it and the strategies
+            must be module-level (picklable).
+    """
+    return SimulationResult.concatenate(
+        run(
+            hands,
+            workers,
+            seed,
+            False,
+            engine,
+            chunk_size,
+            player=player,
+            rules=rules,
+        )
+    )
+
+
+def tally_parallel(
+    hands: int,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+    seed: int | None = None,
+    workers: int | None = None,
+    engine: Callable = simulate,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tally:
+    """
+    Same as simulate_parallel(), but the workers only send back the tally of
+    each chunk, so any number of hands fits in memory.
+    """
+    return sum(
+        run(
+            hands,
+            workers,
+            seed,
+            True,
+            engine,
+            chunk_size,
+            player=player,
+            rules=rules,
+        ),
+        Tally(),
+    )
+
+
+def scaling_benchmark(
+    hands: int,
+    max_workers: int,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+) -> str:
+    """
+    Returns the hands per second of tally_parallel() with 1, 2, 4... up to
+    ``max_workers`` workers, and the speedup and efficiency against one.
+    """
+    counts: list = sorted(
+        {2**power for power in range(max_workers.bit_length())} | {max_workers}
+    )
+    lines: list = [f"{'workers':>7} {'seconds':>8} {'hands/s':>14} {'speedup':>8}"]
+    baseline: float = 0.0
+    for workers in counts:
+        started: float = time.perf_counter()
+        tally_parallel(hands, player, rules, seed=0, workers=workers)
+        rate: float = hands / (time.perf_counter() - started)
+        baseline = baseline or rate
+        lines.append(
+            f"{workers:>7} {hands / rate:>8.2f} {rate:>14,.0f} "
+            f"{rate / baseline:>7.2f}x ({rate / baseline / workers:.0%} efficiency)"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Blackjack simulation on every core.")
+    parser.add_argument("--hands", type=int, default=100_000_000)
+    parser.add_argument("--player", choices=PLAYER_STRATEGIES, default="stand-17")
+    parser.add_argument(
+        "--rules",
+        choices=("game", "casino"),
+        default="game",
+        help="The game of main.py, or casino blackjack.",
+    )
+    parser.add_argument(
+        "--dealer", choices=DEALER_STRATEGIES, default="s17", help="Casino rules."
+    )
+    parser.add_argument(
+        "--blackjack-pays", type=float, default=BLACKJACK, help="Casino rules."
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Measure how the run scales from one worker to --workers.",
+    )
+    args = parser.parse_args(argv)
+    rules: Rules | CasinoRules = rules_from(parser, args)
+    player: Strategy = PLAYER_STRATEGIES[args.player]
+
+    if args.benchmark:
+        print(f"{os.cpu_count()} cores, {args.hands:,} hands, {args.rules} rules")
+        print(scaling_benchmark(args.hands, args.workers, player, rules))
+        return
+    started: float = time.perf_counter()
+    result: Tally = tally_parallel(
+        args.hands, player, rules, seed=args.seed, workers=args.workers
+    )
+    elapsed: float = time.perf_counter() - started
+    rates: dict = result.rates()
+    print(
+        f"Hands:    {result.hands:,} on {args.workers} workers in {elapsed:.1f}s\n"
+        f"Wins:     {rates['win']:.3%}\n"
+        f"Losses:   {rates['loss']:.3%}\n"
+        f"Draws:    {rates['draw']:.3%}\n"
+        f"EV/hand:  {result.expected_value:+.5f} "
+        f"± {1.96 * result.standard_error:.5f} bets (95%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
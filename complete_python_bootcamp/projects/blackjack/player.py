@@ -1,3 +1,6 @@
+from hand import Hand
+
+
 class Player:
     def __init__(self, total_amount: float, points: int = 0):
         # Player points
@@ -5,4 +8,13 @@ class Player:
         # Players total amount of money
         self.total_amount: float = total_amount
         # Player hand
-        self.hand: list = []
+        self.hand: Hand = Hand()
+
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Hand | list) -> None:
+        # A list of cards is scored into a Hand.
+        self._hand: Hand = cards if isinstance(cards, Hand) else Hand(cards)
@@ -0,0 +1,40 @@
+"""
+The payouts of the game in main.py, shared by the simulations and the exact
+expected value.
+
+As game_outcome() and handle_game_round() play it, a round starts with one
+card each; every turn the computer gets a card, and the player one too on a
+hit. The round ends as soon as a hand busts or reaches 21.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rules:
+    """What each ending of a round pays the player, in bets, as in game_outcome."""
+
+    computer_bust: float = 2.0
+    player_21: float = 3.0
+    player_bust: float = -1.0
+    computer_21: float = -1.0
+    both_bust: float = 0.0
+
+    def settle(self, player: int, computer: int) -> float | None:
+        """The payout of a round at these totals, or None if it goes on."""
+        if player > 21 and computer > 21:
+            return self.both_bust
+        if player > 21:
+            return self.player_bust
+        if computer > 21:
+            return self.computer_bust
+        if player == 21:
+            return self.player_21
+        if computer == 21:
+            return self.computer_21
+        return None
+
+
+# The payouts of game_outcome() today: x2 on a computer bust, x3 on a
+# player's 21.
+GAME_RULES = Rules()
@@ -0,0 +1,359 @@
+"""
+Finite multi-deck shoes with Hi-Lo card counting.
+
+A shoe is shuffled once into an array and dealt by moving a cursor along it,
+so dealing a card is O(1) and never rebuilds a list. A cut card placed at the
+penetration marks when the shoe must be reshuffled; like in a casino, that
+happens between hands, never in the middle of one.
+
+  - Shoe is a single shoe dealing the card names of deck_of_cards, for the
+    game (deal_card) and for hand-by-hand simulations.
+  - Shoes is a rack of many independent shoes dealt with NumPy, one hand per
+    shoe at a time, for the batch engines of simulation.py and
+    simulate_counting().
+
+simulate_counting() plays many shoes side by side to measure how the
+player's edge moves with the true count, and what a bet spread makes of it.
+Like simulate(), it plays the game of main.py by default, and casino
+blackjack with rules=CasinoRules(...).
+
+Usage:
+    python shoe.py --shoes 10000 --rounds 1000 --decks 6 --penetration 0.75 --spread 8
+    python shoe.py --rules casino --player basic --spread 8
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from cards import CARD_A, deck_of_cards
+from rules import GAME_RULES, Rules
+from simulation import (
+    BLACKJACK,
+    DEALER_STRATEGIES,
+    PLAYER_STRATEGIES,
+    CasinoRules,
+    Strategy,
+    play_batch,
+    rules_from,
+    stand_on,
+)
+
+CARDS: list = list(deck_of_cards)
+DECK_SIZE = 52
+
+# Hi-Lo count tag of every card: +1 for 2 to 6, 0 for 7 to 9, -1 for tens and
+# aces.
+HI_LO: dict = {
+    card: 1 if points <= 6 else 0 if points <= 9 else -1
+    for card, points in deck_of_cards.items()
+}
+# The same, indexed by card value with aces as 1, for Shoes.
+HI_LO_BY_VALUE = np.array([0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1], dtype=np.int16)
+# One deck as card values with aces as 1, as the engines of simulation.py count.
+DECK_VALUES = np.repeat(
+    [1 if card == CARD_A else points for card, points in deck_of_cards.items()], 4
+).astype(np.int16)
+
+# Cards left behind the cut card, at least: enough to finish any hand.
+MIN_RESERVE = 26
+
+
+def check_shoe(decks: int, penetration: float) -> int:
+    """
+    Returns the index of the cut card of a shoe of ``decks`` decks dealt to
+    ``penetration`` (the share of the shoe dealt before reshuffling).
+
+    Raises:
+        ValueError: If there are no decks or the cut card leaves fewer than
+            MIN_RESERVE cards to finish the last hand.
+    """
+    if decks < 1:
+        raise ValueError("A shoe needs at least one deck.")
+    cut: int = int(decks * DECK_SIZE * penetration)
+    if not 0 < cut <= decks * DECK_SIZE - MIN_RESERVE:
+        raise ValueError(
+            f"A penetration of {penetration} leaves too few cards behind the cut "
+            f"card of {decks} decks."
+        )
+    return cut
+
+
+class Shoe:
+    """
+    ``decks`` decks of cards shuffled together and dealt in order.
+
+    Example:
+        shoe = Shoe(decks=6, penetration=0.75, seed=1)
+        shoe.deal()
+        '9'
+        shoe.running_count, shoe.true_count
+        (0, 0.0)
+    """
+
+    def __init__(
+        self, decks: int = 6, penetration: float = 0.75, seed: int | None = None
+    ):
+        self.decks: int = decks
+        self.cut: int = check_shoe(decks, penetration)
+        self.rng = random.Random(seed)
+        self.cards: list = CARDS * 4 * decks
+        self.shuffle()
+
+    def shuffle(self) -> None:
+        """Shuffles every card back into the shoe and resets the count."""
+        self.rng.shuffle(self.cards)
+        self.cursor: int = 0
+        self.running_count: int = 0
+
+    def deal(self) -> str:
+        """Deals the next card and counts it."""
+        card: str = self.cards[self.cursor]
+        self.cursor += 1
+        self.running_count += HI_LO[card]
+        return card
+
+    @property
+    def remaining(self) -> int:
+        return len(self.cards) - self.cursor
+
+    @property
+    def true_count(self) -> float:
+        """The running count per deck left in the shoe."""
+        return self.running_count / (self.remaining / DECK_SIZE)
+
+    @property
+    def needs_shuffle(self) -> bool:
+        """Whether the cut card has come out: shuffle before the next hand."""
+        return self.cursor >= self.cut
+
+
+class Shoes:
+    """
+    ``count`` independent shoes of ``decks`` decks, stored as one
+    (count, cards) array of card values with a cursor and a running count per
+    shoe. Dealing to any subset of the shoes is one array operation.
+
+    Works as the card source of simulation.play_games() and play_hands():
+    hand i of a batch is dealt from shoe i.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        decks: int = 6,
+        penetration: float = 0.75,
+        rng: np.random.Generator | None = None,
+    ):
+        self.decks: int = decks
+        self.cut: int = check_shoe(decks, penetration)
+        self.rng = rng or np.random.default_rng()
+        self.cards = self.rng.permuted(np.tile(DECK_VALUES, (count, decks)), axis=1)
+        self.cursor = np.zeros(count, dtype=np.int64)
+        self.running_count = np.zeros(count, dtype=np.int64)
+
+    def deal(self, shoes: np.ndarray, count: int) -> np.ndarray:
+        """
+        Deals ``count`` cards from each of the shoes at the indexes ``shoes``,
+        as a (count, len(shoes)) array of card values (aces as 1).
+        """
+        positions = self.cursor[shoes] + np.arange(count)[:, None]
+        cards = self.cards[shoes, positions]
+        self.cursor[shoes] += count
+        self.running_count[shoes] += HI_LO_BY_VALUE[cards].sum(axis=0)
+        return cards
+
+    def shuffle_finished(self) -> None:
+        """Reshuffles the shoes whose cut card has come out."""
+        finished = np.flatnonzero(self.cursor >= self.cut)
+        if finished.size:
+            self.cards[finished] = self.rng.permuted(self.cards[finished], axis=1)
+            self.cursor[finished] = 0
+            self.running_count[finished] = 0
+
+    @property
+    def true_count(self) -> np.ndarray:
+        """The running count of every shoe per deck left in it."""
+        remaining = self.cards.shape[1] - self.cursor
+        return self.running_count / (remaining / DECK_SIZE)
+
+
+def flat_bet(true_count: np.ndarray) -> np.ndarray:
+    return np.ones_like(true_count)
+
+
+def count_bet(units: int, true_count: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor(true_count), 1, units)
+
+
+def bet_spread(units: int) -> Callable:
+    """
+    Returns a betting strategy that bets one unit up to a true count of 1,
+    then one unit per true count, up to ``units``.
+
+    Example:
+        bet_spread(8)(np.array([-2.5, 1.9, 3.2, 12.0]))
+        array([1., 1., 3., 8.])
+    """
+    return partial(count_bet, units)
+
+
+@dataclass
+class CountingResult:
+    """
+    The hands of simulate_counting(), as (rounds, shoes) arrays: row i holds
+    the i-th hand dealt from every shoe.
+    """
+
+    # In bets.
+    payouts: np.ndarray
+    # In units.
+    bets: np.ndarray
+    # Before the first card of each hand.
+    true_counts: np.ndarray
+
+    @property
+    def hands(self) -> int:
+        return self.payouts.size
+
+    @property
+    def expected_value(self) -> float:
+        """The average payout per hand, in bets, whatever the bet."""
+        return float(self.payouts.mean(dtype=np.float64))
+
+    @property
+    def return_on_wagers(self) -> float:
+        """What the bets won per unit wagered: the edge of the bet spread."""
+        won: float = float(np.sum(self.payouts * self.bets, dtype=np.float64))
+        return won / float(self.bets.sum(dtype=np.float64))
+
+    def by_true_count(self, low: int = -5, high: int = 5) -> dict:
+        """
+        Returns the number of hands and their expected value in bets, per
+        true count rounded down (counts outside ``low`` to ``high`` are
+        counted as those).
+        """
+        counts = np.clip(np.floor(self.true_counts), low, high).astype(np.int64)
+        bins = counts.ravel() - low
+        hands = np.bincount(bins, minlength=high - low + 1)
+        sums = np.bincount(bins, weights=self.payouts.ravel(), minlength=high - low + 1)
+        return {
+            count: (int(hands[bin]), float(sums[bin] / hands[bin]))
+            for bin, count in enumerate(range(low, high + 1))
+            if hands[bin]
+        }
+
+
+def simulate_counting(
+    shoes: int,
+    rounds: int,
+    decks: int = 6,
+    penetration: float = 0.75,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+    bets: Callable = flat_bet,
+    seed: int | np.random.SeedSequence | None = None,
+) -> CountingResult:
+    """
+    Deals ``rounds`` hands from each of ``shoes`` shoes, one player per shoe.
+
+    Every round is one call of the batch engine of ``rules`` over all the
+    shoes: the shoes whose cut card came out are reshuffled, the true count of
+    each is read, the player bets what ``bets`` says for it, and the hand is
+    played from that shoe.
+
+    Parameters:
+        shoes (int): Shoes played side by side; more shoes is more hands per
+            array operation.
+        rounds (int): Hands dealt from each shoe.
+        decks (int): Decks per shoe.
+        penetration (float): Share of the shoe dealt before reshuffling.
+        rules (Rules | CasinoRules): The game's rules and payouts (the
+            default), or casino blackjack's.
+        bets (Callable): Units bet from an array of true counts, like
+            flat_bet or bet_spread(8).
+        seed (int | SeedSequence | None): Makes the simulation reproducible.
+
+    Returns:
+        CountingResult: The payout, bet and true count of every hand.
+
+    Example:
+        simulate_counting(10_000, 100, seed=1).by_true_count()[3]
+        (12573, -0.0036...)
+    """
+    rack = Shoes(shoes, decks, penetration, np.random.default_rng(seed))
+    payouts = np.empty((rounds, shoes), dtype=np.float32)
+    stakes = np.empty((rounds, shoes), dtype=np.float32)
+    true_counts = np.empty((rounds, shoes), dtype=np.float32)
+    for hand in range(rounds):
+        rack.shuffle_finished()
+        true_counts[hand] = rack.true_count
+        stakes[hand] = bets(true_counts[hand])
+        payouts[hand] = play_batch(shoes, rack, player, rules)
+    return CountingResult(payouts, stakes, true_counts)
+
+
+def report(result: CountingResult) -> str:
+    """A text report of the edge per true count and of the bet spread."""
+    lines: list = [f"{'true count':>10} {'hands':>12} {'EV/hand':>9}"]
+    for count, (hands, expected_value) in result.by_true_count().items():
+        lines.append(f"{count:>+10} {hands:>12,} {expected_value:>+9.4f}")
+    lines.append(
+        f"Hands: {result.hands:,}, EV/hand {result.expected_value:+.4f} bets, "
+        f"{result.return_on_wagers:+.4f} per unit wagered"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Card counting simulation.")
+    parser.add_argument("--shoes", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=1_000)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--player", choices=PLAYER_STRATEGIES, default="stand-17")
+    parser.add_argument(
+        "--rules",
+        choices=("game", "casino"),
+        default="game",
+        help="The game of main.py, or casino blackjack.",
+    )
+    parser.add_argument(
+        "--dealer", choices=DEALER_STRATEGIES, default="s17", help="Casino rules."
+    )
+    parser.add_argument(
+        "--blackjack-pays", type=float, default=BLACKJACK, help="Casino rules."
+    )
+    parser.add_argument(
+        "--spread",
+        type=int,
+        default=1,
+        help="Bet up to this many units as the true count rises (1: flat bets).",
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    rules: Rules | CasinoRules = rules_from(parser, args)
+
+    started: float = time.perf_counter()
+    result = simulate_counting(
+        args.shoes,
+        args.rounds,
+        args.decks,
+        args.penetration,
+        PLAYER_STRATEGIES[args.player],
+        rules,
+        bet_spread(args.spread),
+        seed=args.seed,
+    )
+    elapsed: float = time.perf_counter() - started
+    print(report(result))
+    print(f"{result.hands / elapsed:,.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,681 @@
+"""
+Headless blackjack simulation: plays N rounds without any input() or print(),
+with pluggable player strategies, and reports win/loss/draw rates and
+bankroll trajectories.
+
+Two sets of rules can be played:
+  - The game of main.py, by default (rules.Rules): one card each to start,
+    then each turn the player stands or hits, the computer drawing a card
+    either way, until a hand busts or reaches 21. Rounds are settled like
+    game_outcome() settles them, with its payouts: x2 on a computer bust, x3
+    on a player's 21.
+  - Casino blackjack (CasinoRules): two cards each, naturals, a dealer who
+    plays by a rule once the player stands, even-money wins.
+
+Each has two engines:
+  - play_game() and play_hand() play one round in plain Python. They are the
+    reference the batch engines are tested against.
+  - play_games() and play_hands() play a whole batch of rounds at once with
+    NumPy: every step (dealing, each turn, settling) is one array operation
+    over all the rounds still playing.
+
+Usage:
+    python simulation.py --hands 1000000 --player best
+    python simulation.py --rules casino --player basic --dealer s17
+    python simulation.py --benchmark
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from basic_strategy import player_strategy
+from cards import CARD_A, deck_of_cards
+from exact_ev import best_strategy
+from rules import GAME_RULES, Rules
+
+# Point value of every card of deck_of_cards, with aces counted as 1: a hand
+# is tracked as its hard total and whether it holds an ace.
+CARD_VALUES: list = [
+    1 if card == CARD_A else points for card, points in deck_of_cards.items()
+]
+CARD_VALUE_ARRAY = np.array(CARD_VALUES, dtype=np.int16)
+
+# Hands played per NumPy batch, which bounds the memory used.
+BATCH_SIZE = 1_000_000
+
+# Payouts of casino blackjack, in bets. The game's are in rules.Rules.
+WIN = 1.0
+LOSS = -1.0
+PUSH = 0.0
+BLACKJACK = 1.5
+
+# A strategy decides whether to hit from the hand's total (aces counted as
+# 11 when that does not bust it), whether that total is soft (counts an ace as
+# 11) and what it plays against: the computer's total in the game, the
+# dealer's up card (an ace is 11) in casino blackjack. It is called with
+# Python ints and bools by the Python engines and with NumPy arrays by the
+# batch engines, so it must only use operators that work on both (<, ==, &,
+# |, ~ on arrays...).
+Strategy = Callable
+
+
+def hit_below(threshold: int, total, soft, upcard):
+    return total < threshold
+
+
+def dealer_hits(hit_soft_17: bool, total, soft, upcard):
+    if hit_soft_17:
+        return (total < 17) | ((total == 17) & soft)
+    return total < 17
+
+
+def stand_on(threshold: int) -> Strategy:
+    """
+    Returns a strategy that hits below ``threshold`` whatever the dealer shows.
+
+    Strategies are partials of module-level functions rather than closures,
+    so they can be pickled and sent to worker processes.
+
+    Example:
+        stand_on(17)(16, False, 10)
+        True
+    """
+    return partial(hit_below, threshold)
+
+
+def dealer_rule(hit_soft_17: bool = False) -> Strategy:
+    """
+    Returns the casino dealer's rule: hit below 17 and stand on 17 or more,
+    except on a soft 17 if ``hit_soft_17``.
+    """
+    return partial(dealer_hits, hit_soft_17)
+
+
+def never_hit(total, soft, upcard):
+    return total < 0
+
+
+@dataclass(frozen=True)
+class CasinoRules:
+    """
+    Casino blackjack, the opt-in alternative to the game's rules.Rules.
+
+    Parameters:
+        dealer (Strategy): When the dealer hits.
+        blackjack_pays (float): The payout of a natural, in bets.
+    """
+
+    dealer: Strategy = dealer_rule()
+    blackjack_pays: float = BLACKJACK
+
+
+CASINO_RULES = CasinoRules()
+
+PLAYER_STRATEGIES: dict = {
+    "never-hit": never_hit,
+    **{f"stand-{threshold}": stand_on(threshold) for threshold in range(12, 21)},
+    # The game's best play against the computer's total.
+    "best": best_strategy(),
+    # Casino rules only: basic strategy's hits and stands, for a dealer
+    # standing on or hitting soft 17.
+    "basic": player_strategy(False),
+    "basic-h17": player_strategy(True),
+}
+# The rules (--rules) that the strategies made for one of them need.
+STRATEGY_RULES: dict = {"best": "game", "basic": "casino", "basic-h17": "casino"}
+DEALER_STRATEGIES: dict = {"s17": dealer_rule(False), "h17": dealer_rule(True)}
+
+
+def hand_total(hard, has_ace):
+    """
+    Returns the total of a hand from its hard total (aces as 1) and whether it
+    holds an ace, and whether that total is soft. Works on ints and arrays.
+
+    Example:
+        hand_total(7, True)
+        (17, True)
+    """
+    soft = has_ace & (hard <= 11)
+    return hard + 10 * soft, soft
+
+
+def play_game(rng: random.Random, player: Strategy, rules: Rules = GAME_RULES) -> float:
+    """
+    Plays one round of the game against an infinite deck (every card is
+    equally likely, like deal_card) and returns the player's payout in bets.
+
+    Special handling:
+      - Both start with one card, which can settle nothing.
+      - Each turn the player hits while ``player`` says so, then the computer
+        draws a card whether the player hit or stood, like
+        handle_game_round().
+      - After each turn the round is settled by ``rules`` as game_outcome()
+        does: both bust, the player busts, the computer busts, the player has
+        21, the computer has 21. Every turn gives the computer a card, so
+        every round ends.
+
+    Example:
+        play_game(random.Random(1), stand_on(17))
+        -1.0
+    """
+    hard: list = [rng.choice(CARD_VALUES)]
+    computer_hard: list = [rng.choice(CARD_VALUES)]
+    while True:
+        total, soft = hand_total(sum(hard), 1 in hard)
+        computer_total, _ = hand_total(sum(computer_hard), 1 in computer_hard)
+        if player(total, soft, computer_total):
+            hard.append(rng.choice(CARD_VALUES))
+        computer_hard.append(rng.choice(CARD_VALUES))
+        payout: float | None = rules.settle(
+            hand_total(sum(hard), 1 in hard)[0],
+            hand_total(sum(computer_hard), 1 in computer_hard)[0],
+        )
+        if payout is not None:
+            return payout
+
+
+def play_hand(
+    rng: random.Random,
+    player: Strategy,
+    dealer: Strategy,
+    blackjack_pays: float = BLACKJACK,
+) -> float:
+    """
+    Plays one hand of casino blackjack against an infinite deck and returns
+    the player's payout in bets.
+
+    Special handling:
+      - Naturals (21 with the first two cards) are settled at once: a player's
+        natural pays ``blackjack_pays`` unless the dealer has one too.
+      - The player hits while ``player`` says so and is under 21; a bust loses
+        before the dealer plays.
+      - The dealer then hits while ``dealer`` says so and is under 21.
+
+    Example:
+        play_hand(random.Random(1), stand_on(17), dealer_rule())
+        -1.0
+    """
+    hard: list = [rng.choice(CARD_VALUES), rng.choice(CARD_VALUES)]
+    dealer_hard: list = [rng.choice(CARD_VALUES), rng.choice(CARD_VALUES)]
+    upcard: int = 11 if dealer_hard[0] == 1 else dealer_hard[0]
+
+    total, soft = hand_total(sum(hard), 1 in hard)
+    dealer_total, dealer_soft = hand_total(sum(dealer_hard), 1 in dealer_hard)
+    if total == 21 or dealer_total == 21:
+        if total == dealer_total:
+            return PUSH
+        return blackjack_pays if total == 21 else LOSS
+
+    while total < 21 and player(total, soft, upcard):
+        hard.append(rng.choice(CARD_VALUES))
+        total, soft = hand_total(sum(hard), 1 in hard)
+    if total > 21:
+        return LOSS
+
+    while dealer_total < 21 and dealer(dealer_total, dealer_soft, upcard):
+        dealer_hard.append(rng.choice(CARD_VALUES))
+        dealer_total, dealer_soft = hand_total(sum(dealer_hard), 1 in dealer_hard)
+    if dealer_total > 21 or total > dealer_total:
+        return WIN
+    return LOSS if total < dealer_total else PUSH
+
+
+class InfiniteDeck:
+    """
+    The card source of the batch engines for an infinite deck: every card is
+    equally likely, like deal_card. shoe.Shoes is the one for finite shoes.
+    """
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def deal(self, hands: np.ndarray, count: int) -> np.ndarray:
+        """
+        Deals ``count`` cards to each of the hands at the indexes ``hands``, as
+        a (count, len(hands)) array of card values (aces as 1).
+        """
+        return CARD_VALUE_ARRAY[
+            self.rng.integers(0, len(CARD_VALUES), (count, len(hands)), dtype=np.int8)
+        ]
+
+
+def play_games(
+    rounds: int, deck: InfiniteDeck, player: Strategy, rules: Rules = GAME_RULES
+) -> np.ndarray:
+    """
+    Plays ``rounds`` rounds of the game by the rules of play_game() and
+    returns the payout of each, in bets, as a float32 array.
+
+    Each turn deals a card to the rounds whose player hits, then one to the
+    computer of every round still playing, and settles the rounds that ended,
+    so a turn costs a few array operations over the rounds left.
+
+    Parameters:
+        deck (InfiniteDeck | shoe.Shoes): Where the cards come from: any
+            object whose ``deal(hands, count)`` deals ``count`` cards to each
+            of the rounds at the indexes ``hands``.
+    """
+    cards = deck.deal(np.arange(rounds), 2)
+    hard, computer_hard = cards[0], cards[1]
+    has_ace, computer_ace = hard == 1, computer_hard == 1
+    payouts = np.empty(rounds, dtype=np.float32)
+
+    playing = np.arange(rounds)
+    while playing.size:
+        total, soft = hand_total(hard[playing], has_ace[playing])
+        computer_total, _ = hand_total(computer_hard[playing], computer_ace[playing])
+        hitting = playing[player(total, soft, computer_total)]
+        # The player's card first, then the computer's, as the game deals them.
+        for hands, who_hard, who_ace in (
+            (hitting, hard, has_ace),
+            (playing, computer_hard, computer_ace),
+        ):
+            drawn = deck.deal(hands, 1)[0]
+            who_hard[hands] += drawn
+            who_ace[hands] |= drawn == 1
+
+        settled = settle_games(
+            rules,
+            hand_total(hard[playing], has_ace[playing])[0],
+            hand_total(computer_hard[playing], computer_ace[playing])[0],
+        )
+        done = ~np.isnan(settled)
+        payouts[playing[done]] = settled[done]
+        playing = playing[~done]
+    return payouts
+
+
+def settle_games(rules: Rules, total: np.ndarray, computer_total: np.ndarray):
+    """
+    The payout of each round at these totals by ``rules``, in the order of
+    game_outcome()'s checks, or NaN for the rounds that go on.
+    """
+    player_bust = total > 21
+    computer_bust = computer_total > 21
+    return np.select(
+        [
+            player_bust & computer_bust,
+            player_bust,
+            computer_bust,
+            total == 21,
+            computer_total == 21,
+        ],
+        [
+            rules.both_bust,
+            rules.player_bust,
+            rules.computer_bust,
+            rules.player_21,
+            rules.computer_21,
+        ],
+        np.nan,
+    )
+
+
+def play_hands(
+    hands: int,
+    deck: InfiniteDeck,
+    player: Strategy,
+    dealer: Strategy,
+    blackjack_pays: float = BLACKJACK,
+) -> np.ndarray:
+    """
+    Plays ``hands`` hands of casino blackjack by the rules of play_hand() and
+    returns the payout of each, in bets, as a float32 array.
+
+    Each round of hits draws cards only for the hands still hitting, and the
+    strategies are called on the totals of those hands only, so a round costs
+    a few array operations over the hands left rather than a Python loop.
+
+    Parameters:
+        deck (InfiniteDeck | shoe.Shoes): Where the cards come from: any
+            object whose ``deal(hands, count)`` deals ``count`` cards to each
+            of the hands at the indexes ``hands``.
+    """
+    cards = deck.deal(np.arange(hands), 4)
+    hard = cards[0] + cards[1]
+    has_ace = (cards[0] == 1) | (cards[1] == 1)
+    dealer_hard = cards[2] + cards[3]
+    dealer_ace = (cards[2] == 1) | (cards[3] == 1)
+    upcard = np.where(cards[2] == 1, 11, cards[2])
+
+    total, _ = hand_total(hard, has_ace)
+    dealer_total, _ = hand_total(dealer_hard, dealer_ace)
+    natural = total == 21
+    dealer_natural = dealer_total == 21
+
+    # The player's turn, then the dealer's for the hands that did not bust.
+    playing = np.flatnonzero(~(natural | dealer_natural))
+    hit_until(deck, playing, hard, has_ace, upcard, player)
+    total, _ = hand_total(hard, has_ace)
+    playing = playing[total[playing] <= 21]
+    hit_until(deck, playing, dealer_hard, dealer_ace, upcard, dealer)
+    dealer_total, _ = hand_total(dealer_hard, dealer_ace)
+
+    return np.select(
+        [
+            natural & dealer_natural,
+            natural,
+            dealer_natural,
+            total > 21,
+            (dealer_total > 21) | (total > dealer_total),
+            total < dealer_total,
+        ],
+        [PUSH, blackjack_pays, LOSS, LOSS, WIN, LOSS],
+        PUSH,
+    ).astype(np.float32)
+
+
+def hit_until(
+    deck: InfiniteDeck,
+    playing: np.ndarray,
+    hard: np.ndarray,
+    has_ace: np.ndarray,
+    upcard: np.ndarray,
+    strategy: Strategy,
+) -> None:
+    """
+    Deals cards to the hands at the indexes ``playing`` (in place) until
+    ``strategy`` stands or they reach 21.
+    """
+    while playing.size:
+        total, soft = hand_total(hard[playing], has_ace[playing])
+        playing = playing[(total < 21) & strategy(total, soft, upcard[playing])]
+        cards = deck.deal(playing, 1)[0]
+        hard[playing] += cards
+        has_ace[playing] |= cards == 1
+
+
+@dataclass
+class Tally:
+    """
+    The outcome counts and payout sums of a simulation: what is left of a
+    SimulationResult once the order of the hands no longer matters. Tallies of
+    separate runs add up to the tally of all of them.
+    """
+
+    hands: int = 0
+    wins: int = 0
+    losses: int = 0
+    # The sum of the payouts and of their squares, in bets.
+    total: float = 0.0
+    squares: float = 0.0
+
+    def __add__(self, other: "Tally") -> "Tally":
+        return Tally(
+            self.hands + other.hands,
+            self.wins + other.wins,
+            self.losses + other.losses,
+            self.total + other.total,
+            self.squares + other.squares,
+        )
+
+    @property
+    def draws(self) -> int:
+        return self.hands - self.wins - self.losses
+
+    @property
+    def expected_value(self) -> float:
+        """The average payout per hand, in bets: minus the house edge."""
+        return self.total / self.hands if self.hands else 0.0
+
+    @property
+    def standard_error(self) -> float:
+        """The standard error of ``expected_value``."""
+        if self.hands < 2:
+            return 0.0
+        variance: float = (self.squares - self.total**2 / self.hands) / (self.hands - 1)
+        return (variance / self.hands) ** 0.5
+
+    def rates(self) -> dict:
+        """The share of hands won, lost and drawn."""
+        return {
+            "win": self.wins / self.hands,
+            "loss": self.losses / self.hands,
+            "draw": self.draws / self.hands,
+        }
+
+
+@dataclass
+class SimulationResult:
+    """The payout of every hand of a simulation, in bets, in the order played."""
+
+    payouts: np.ndarray
+
+    @classmethod
+    def concatenate(cls, results: list) -> "SimulationResult":
+        """The hands of ``results``, one run after the other."""
+        return cls(
+            np.concatenate(
+                [result.payouts for result in results] or [np.empty(0, np.float32)]
+            )
+        )
+
+    def tally(self) -> Tally:
+        payouts = self.payouts.astype(np.float64)
+        return Tally(
+            self.hands,
+            self.wins,
+            self.losses,
+            float(payouts.sum()),
+            float(payouts @ payouts),
+        )
+
+    @property
+    def hands(self) -> int:
+        return len(self.payouts)
+
+    @property
+    def wins(self) -> int:
+        return int(np.count_nonzero(self.payouts > 0))
+
+    @property
+    def losses(self) -> int:
+        return int(np.count_nonzero(self.payouts < 0))
+
+    @property
+    def draws(self) -> int:
+        return self.hands - self.wins - self.losses
+
+    @property
+    def expected_value(self) -> float:
+        """The average payout per hand, in bets: minus the house edge."""
+        return float(self.payouts.mean(dtype=np.float64)) if self.hands else 0.0
+
+    def rates(self) -> dict:
+        """The share of hands won, lost and drawn."""
+        return {
+            "win": self.wins / self.hands,
+            "loss": self.losses / self.hands,
+            "draw": self.draws / self.hands,
+        }
+
+    def bankroll(self, start: float, bet: float, sessions: int = 1) -> np.ndarray:
+        """
+        Returns the bankroll trajectories of ``sessions`` players betting
+        ``bet`` on every hand from a bankroll of ``start``: the hands are split
+        into ``sessions`` consecutive runs of equal length (dropping the
+        remainder), and row i is the bankroll of session i before its first
+        hand and after each one.
+
+        Special handling:
+          - A player who can no longer cover the bet stops playing: the rest
+            of the row stays at that bankroll.
+
+        Example:
+            SimulationResult(np.array([1, -1, -1], np.float32)).bankroll(15, 10)
+            array([[15., 25., 15.,  5.]])
+        """
+        length: int = self.hands // sessions
+        steps = self.payouts[: length * sessions].reshape(sessions, length)
+        trajectory = np.empty((sessions, length + 1))
+        trajectory[:, 0] = start
+        np.cumsum(steps * bet, axis=1, out=trajectory[:, 1:])
+        trajectory[:, 1:] += start
+
+        broke = trajectory < bet
+        ruined = np.flatnonzero(broke.any(axis=1))
+        first = broke[ruined].argmax(axis=1)
+        after = np.arange(length + 1) > first[:, None]
+        trajectory[ruined] = np.where(
+            after, trajectory[ruined, first][:, None], trajectory[ruined]
+        )
+        return trajectory
+
+
+def play_batch(
+    hands: int, deck: InfiniteDeck, player: Strategy, rules: Rules | CasinoRules
+) -> np.ndarray:
+    """Plays ``hands`` rounds with the batch engine of ``rules``."""
+    if isinstance(rules, CasinoRules):
+        return play_hands(hands, deck, player, rules.dealer, rules.blackjack_pays)
+    return play_games(hands, deck, player, rules)
+
+
+def simulate(
+    hands: int,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+    seed: int | np.random.SeedSequence | None = None,
+) -> SimulationResult:
+    """
+    Plays ``hands`` rounds with the NumPy engine, ``BATCH_SIZE`` at a time.
+
+    Parameters:
+        hands (int): The number of rounds to play.
+        player (Strategy): When the player hits.
+        rules (Rules | CasinoRules): The game's rules and payouts (the
+            default), or casino blackjack's.
+        seed (int | SeedSequence | None): Makes the simulation reproducible.
+
+    Returns:
+        SimulationResult: The payout of every round.
+
+    Example:
+        simulate(1_000_000, seed=1).rates()
+        {'win': 0.65..., 'loss': 0.25..., 'draw': 0.09...}
+    """
+    deck = InfiniteDeck(np.random.default_rng(seed))
+    payouts = np.empty(hands, dtype=np.float32)
+    for start in range(0, hands, BATCH_SIZE):
+        size: int = min(BATCH_SIZE, hands - start)
+        payouts[start : start + size] = play_batch(size, deck, player, rules)
+    return SimulationResult(payouts)
+
+
+def simulate_python(
+    hands: int,
+    player: Strategy = stand_on(17),
+    rules: Rules | CasinoRules = GAME_RULES,
+    seed: int | None = None,
+) -> SimulationResult:
+    """Same as simulate(), one round at a time with play_game() or play_hand()."""
+    rng = random.Random(seed)
+    if isinstance(rules, CasinoRules):
+        play = partial(
+            play_hand,
+            rng,
+            player,
+            rules.dealer,
+            rules.blackjack_pays,
+        )
+    else:
+        play = partial(play_game, rng, player, rules)
+    return SimulationResult(np.array([play() for _ in range(hands)], dtype=np.float32))
+
+
+def benchmark(hands: int, python_hands: int) -> str:
+    """
+    Returns the hands per second of both engines, with the stand-on-17 player,
+    under the game's rules and against a casino dealer standing on soft 17.
+    """
+    lines: list = []
+    for rules_label, rules in (("game", GAME_RULES), ("casino", CASINO_RULES)):
+        for label, engine, count in (
+            ("python", simulate_python, python_hands),
+            ("numpy", simulate, hands),
+        ):
+            started: float = time.perf_counter()
+            engine(count, rules=rules, seed=0)
+            elapsed: float = time.perf_counter() - started
+            lines.append(
+                f"{rules_label:<7} {label:<7} {count:>12,} hands {elapsed:>8.2f}s "
+                f"{count / elapsed:>14,.0f} hands/s"
+            )
+    return "\n".join(lines)
+
+
+def report(result: SimulationResult, start: float, bet: float, sessions: int) -> str:
+    """A text report of the rates, the house edge and the bankrolls."""
+    rates: dict = result.rates()
+    final = result.bankroll(start, bet, sessions)[:, -1]
+    return (
+        f"Hands:     {result.hands:,}\n"
+        f"Wins:      {rates['win']:.2%}\n"
+        f"Losses:    {rates['loss']:.2%}\n"
+        f"Draws:     {rates['draw']:.2%}\n"
+        f"EV/hand:   {result.expected_value:+.4f} bets\n"
+        f"Bankrolls: {sessions:,} sessions of {result.hands // sessions:,} hands "
+        f"from {start:,.0f}, betting {bet:,.0f}: median {np.median(final):,.0f}, "
+        f"{np.mean(final < bet):.1%} broke"
+    )
+
+
+def rules_from(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Rules | CasinoRules:
+    """
+    The rules chosen on the command line (--rules, --dealer, --blackjack-pays).
+
+    Exits with a usage error if ``args.player`` was made for the other rules.
+    """
+    needed: str = STRATEGY_RULES.get(args.player, args.rules)
+    if needed != args.rules:
+        parser.error(f"--player {args.player} needs --rules {needed}.")
+    if args.rules == "casino":
+        return CasinoRules(DEALER_STRATEGIES[args.dealer], args.blackjack_pays)
+    return GAME_RULES
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless blackjack simulation.")
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--player", choices=PLAYER_STRATEGIES, default="stand-17")
+    parser.add_argument(
+        "--rules",
+        choices=("game", "casino"),
+        default="game",
+        help="The game of main.py, or casino blackjack.",
+    )
+    parser.add_argument(
+        "--dealer", choices=DEALER_STRATEGIES, default="s17", help="Casino rules."
+    )
+    parser.add_argument(
+        "--blackjack-pays", type=float, default=BLACKJACK, help="Casino rules."
+    )
+    parser.add_argument("--bankroll", type=float, default=1000)
+    parser.add_argument("--bet", type=float, default=10)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Measure the hands per second of both engines instead.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(benchmark(args.hands * 10, args.hands // 10))
+        return
+    rules = rules_from(parser, args)
+    result = simulate(args.hands, PLAYER_STRATEGIES[args.player], rules, args.seed)
+    print(report(result, args.bankroll, args.bet, args.sessions))
+
+
+if __name__ == "__main__":
+    main()
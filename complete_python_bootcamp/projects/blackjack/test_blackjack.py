@@ -1,4 +1,6 @@
+import random
 from unittest.mock import patch
+import numpy as np
 import pytest
 from computer import Computer
 from player import Player
@@ -13,12 +15,46 @@ from main import (
     CARD_A,
     CARD_2,
     CARD_3,
+    CARD_5,
     CARD_6,
     CARD_7,
     CARD_10,
     CARD_K,
+    deck_of_cards,
     CARD_Q,
     game,
+    auto_choice,
+)
+import simulation
+from parallel import chunk_seeds, simulate_parallel, tally_parallel
+import basic_strategy
+from basic_strategy import DOUBLE, HIT, SPLIT, STAND, decide, load_table
+import exact_ev
+from exact_ev import (
+    ExactEV,
+    ShoeEV,
+    always_stand,
+    best_strategy,
+    break_even,
+)
+from hand import Hand
+from rules import GAME_RULES, Rules
+from shoe import HI_LO, Shoe, Shoes, bet_spread, simulate_counting
+from simulation import (
+    CASINO_RULES,
+    InfiniteDeck,
+    SimulationResult,
+    Tally,
+    dealer_rule,
+    hand_total,
+    never_hit,
+    play_game,
+    play_games,
+    play_hand,
+    play_hands,
+    simulate,
+    simulate_python,
+    stand_on,
 )
 
 # ========================
@@ -389,6 +425,692 @@ def test_new_game():
     assert result == "New Game!"
 
 
+# ========================
+# Tests for Hand
+# ========================
+
+
+def test_hand_counts_aces_as_11_until_they_bust_it():
+    """
+    Test that a hand turns its aces from 11 into 1 one at a time, only while
+    it would otherwise bust.
+    """
+    hand = Hand([CARD_A, CARD_6])
+    assert (hand.total, hand.soft, hand.soft_aces) == (17, True, 1)
+
+    hand.add(CARD_A)
+    assert (hand.total, hand.soft_aces) == (18, 1)
+    hand.add(CARD_10)
+    assert (hand.total, hand.soft, hand.bust) == (18, False, False)
+    hand.add(CARD_5)
+    assert (hand.total, hand.bust) == (23, True)
+
+
+def test_hand_flags_blackjack_and_clears():
+    """
+    Test that only 21 with the first two cards is a blackjack, and that a
+    cleared hand starts over.
+    """
+    assert Hand([CARD_A, CARD_K]).blackjack
+    assert not Hand([CARD_7, CARD_7, CARD_7]).blackjack
+
+    hand = Hand([CARD_A, CARD_A, CARD_A, CARD_K])
+    assert (hand.total, len(hand), list(hand)) == (13, 4, [CARD_A] * 3 + [CARD_K])
+    hand.clear()
+    assert (hand.total, hand.soft_aces, hand.cards) == (0, 0, [])
+    with pytest.raises(KeyError):
+        hand.add("Z")
+
+
+def test_hand_matches_count_points():
+    """
+    Test that the incremental total equals count_points() after every card of
+    many random hands, and that a list assigned as a hand is scored.
+    """
+    rng = random.Random(6)
+    for _ in range(2_000):
+        hand = Hand()
+        cards = []
+        for card in rng.choices(list(deck_of_cards), k=8):
+            hand.add(card)
+            cards.append(card)
+            assert hand.total == count_points(cards)
+
+    player = Player(100)
+    player.hand = [CARD_K, CARD_A]
+    assert player.hand.total == 21 and player.hand.blackjack
+
+
+def test_count_points_turns_a_single_ace_into_1_once():
+    """
+    Test that count_points() no longer takes 10 off for the same ace again
+    and again: one ace over 21 is a bust, not a small total.
+    """
+    assert count_points([CARD_A, CARD_K, CARD_Q, CARD_5]) == 26
+    assert count_points([CARD_A, CARD_A, CARD_K]) == 12
+
+
+# ========================
+# Tests for basic strategy
+# ========================
+
+
+def test_basic_strategy_matches_the_published_chart():
+    """
+    Test decisions every basic strategy chart agrees on, and the ones that
+    change when the dealer hits soft 17.
+    """
+    assert decide(16, False, 10) == HIT
+    assert decide(12, False, 4) == STAND
+    assert decide(12, False, 2) == HIT
+    assert decide(11, False, 6, can_double=True) == DOUBLE
+    assert decide(11, False, 6) == HIT
+    assert decide(18, True, 3, can_double=True) == DOUBLE
+    assert decide(18, True, 3) == STAND
+    assert decide(18, True, 10) == HIT
+    assert decide(16, False, 10, pair=8) == SPLIT
+    assert decide(12, True, 6, pair=11) == SPLIT
+    assert decide(20, False, 6, pair=10) == STAND
+    assert decide(18, False, 7, pair=9) == STAND
+    assert decide(11, True, 5) == HIT  # A single ace.
+    assert decide(21, True, 10) == STAND
+
+    assert decide(11, False, 11, can_double=True) == HIT
+    assert decide(11, False, 11, can_double=True, hit_soft_17=True) == DOUBLE
+
+
+def test_basic_strategy_table_is_cached_on_disk(tmp_path):
+    """
+    Test that a table is computed once and read back from its file, and
+    recomputed when the file is from another version or unreadable.
+    """
+    with patch.object(basic_strategy, "CACHE_DIR", tmp_path):
+        load_table.cache_clear()
+        table = load_table(True)
+        path = tmp_path / "basic_strategy_h17.json"
+        assert path.exists()
+
+        with patch.object(basic_strategy, "compute_table") as compute:
+            load_table.cache_clear()
+            assert load_table(True) == table
+            compute.assert_not_called()
+
+            path.write_text('{"version": 0, "table": {}}')
+            compute.return_value = {"hard": []}
+            load_table.cache_clear()
+            assert load_table(True) == {"hard": []}
+
+            path.write_text("not json")
+            load_table.cache_clear()
+            assert load_table(True) == {"hard": []}
+            assert compute.call_count == 2
+    load_table.cache_clear()
+
+
+def test_basic_strategy_beats_standing_on_17():
+    """
+    Test that basic strategy's hits and stands lose far less than standing on
+    17 in the simulation.
+    """
+    basic = simulate(
+        400_000, simulation.PLAYER_STRATEGIES["basic"], CASINO_RULES, seed=4
+    )
+    assert -0.035 < basic.expected_value < -0.015
+    standing = simulate(400_000, rules=CASINO_RULES, seed=4)
+    assert basic.expected_value > standing.expected_value + 0.02
+
+
+@patch("main.GAME_RUNNING", True)
+@patch("builtins.input", side_effect=AssertionError("auto-play asked for input"))
+def test_game_auto_plays_the_best_play(mock_input: patch):
+    """
+    Test that auto-play chooses the game's best play from both hands, as
+    ExactEV decides it, and ends the game after the given number of rounds.
+    """
+    player = Player(100)
+    computer = Computer()
+    player.hand = [CARD_10, CARD_6]
+    computer.hand = [CARD_10]
+    assert auto_choice(player, computer) == "stand"
+    player.hand = [CARD_A, CARD_6]
+    assert auto_choice(player, computer) == "hit"
+    assert auto_choice(player, computer) == ExactEV().decision((7, True), (10, False))
+    player.hand = [CARD_A, CARD_6, CARD_10]
+    computer.hand = [CARD_A, CARD_5]
+    assert auto_choice(player, computer) == "stand"
+
+    player = Player(10_000)
+    computer = Computer()
+    assert game(player, computer, 10, auto_rounds=3) == "GAME OVER"
+    mock_input.assert_not_called()
+
+
+# ========================
+# Tests for the exact EV
+# ========================
+
+
+def settle_with_game_outcome(player_cards: list, computer_cards: list):
+    """The player's winnings on a bet of 1 per game_outcome(), or None."""
+    player = Player(100)
+    computer = Computer()
+    player.points = count_points(player_cards)
+    computer.points = count_points(computer_cards)
+    result = game_outcome(1, computer, player)
+    return None if result == "Game continues.." else player.total_amount - 100
+
+
+def brute_force_ev(cards: list, hits=None) -> float:
+    """
+    The expected value of a round dealt from ``cards``, by trying every card
+    left at every draw, without memoization, settled by game_outcome().
+    """
+
+    def draw(cards: list):
+        for card in set(cards):
+            left = cards.copy()
+            left.remove(card)
+            yield card, cards.count(card) / len(cards), left
+
+    def after(cards: list, player: list, computer: list) -> float:
+        payout = settle_with_game_outcome(player, computer)
+        return turn(cards, player, computer) if payout is None else payout
+
+    def stand(cards: list, player: list, computer: list) -> float:
+        return sum(
+            probability * after(left, player, computer + [card])
+            for card, probability, left in draw(cards)
+        )
+
+    def hit(cards: list, player: list, computer: list) -> float:
+        return sum(
+            probability * stand(left, player + [card], computer)
+            for card, probability, left in draw(cards)
+        )
+
+    def turn(cards: list, player: list, computer: list) -> float:
+        if hits is None:
+            return max(stand(cards, player, computer), hit(cards, player, computer))
+        hand = Hand(player)
+        if hits(hand.total, hand.soft, count_points(computer)):
+            return hit(cards, player, computer)
+        return stand(cards, player, computer)
+
+    return hit(cards, [], [])
+
+
+def test_exact_ev_matches_every_deal_of_a_small_shoe():
+    """
+    Test the memoized recursion against trying every order of a small shoe,
+    and ShoeEV's layers against the recursion, for fixed and best play, with
+    game_outcome() settling the rounds.
+    """
+    cards = [CARD_A] + [CARD_2] * 2 + [CARD_5] * 3 + [CARD_10] * 4
+    shoe = (1, 2, 0, 0, 3, 0, 0, 0, 0, 4)
+
+    def hit_below_12(total, soft, computer_total):
+        return total < 12
+
+    for hits in (always_stand, hit_below_12, None):
+        recursion = ExactEV(shoe=shoe, player=hits).expected_value()
+        assert recursion == pytest.approx(brute_force_ev(cards, hits))
+        assert ShoeEV(GAME_RULES, shoe, hits).expected_value() == pytest.approx(
+            recursion
+        )
+
+
+def test_shoe_ev_matches_the_recursion_on_a_short_deck():
+    """
+    Test ShoeEV against the recursion on a deck of aces, twos to fives and
+    tens: soft hands, hands reaching 21 and rounds of many cards. One whole
+    deck is priced by ShoeEV alone, as the recursion takes 40 s.
+    """
+    shoe = (4, 4, 4, 4, 4, 0, 0, 0, 0, 4)
+    assert ShoeEV(GAME_RULES, shoe).expected_value() == pytest.approx(
+        ExactEV(shoe=shoe).expected_value()
+    )
+    assert exact_ev.calculator(decks=1).expected_value() == pytest.approx(
+        1.5615403, abs=1e-7
+    )
+
+
+def test_exact_ev_settles_like_game_outcome():
+    """
+    Test the payouts in game_outcome's order, and the expected value of the
+    current rules on an infinite deck.
+    """
+    assert GAME_RULES.settle(22, 23) == 0
+    assert GAME_RULES.settle(22, 21) == -1
+    assert GAME_RULES.settle(21, 22) == 2
+    assert GAME_RULES.settle(21, 21) == 3
+    assert GAME_RULES.settle(15, 21) == -1
+    assert GAME_RULES.settle(20, 20) is None
+
+    best = ExactEV()
+    assert best.expected_value() == pytest.approx(1.564338, abs=1e-6)
+    assert best.house_edge() == -best.expected_value()
+    assert ExactEV(player=always_stand).expected_value() < best.expected_value()
+    assert best.decision((10, False), (10, False)) == "hit"
+    assert best.decision((20, False), (10, False)) == "stand"
+
+
+def test_break_even_payout():
+    """
+    Test that the house breaks even at the found payout, and that no payout
+    for a player's 21 makes it: always standing never reaches 21.
+    """
+    value = break_even(payout="computer_bust")
+    assert ExactEV(Rules(computer_bust=value)).expected_value() == pytest.approx(
+        0, abs=1e-5
+    )
+    with pytest.raises(ValueError):
+        break_even(payout="player_21")
+
+
+def test_best_play_table_is_cached_on_disk(tmp_path):
+    """
+    Test that the game's best play is computed once into a file named after
+    the payouts, and that decide() looks it up as ExactEV decides.
+    """
+    with patch.object(basic_strategy, "CACHE_DIR", tmp_path):
+        exact_ev.load_table.cache_clear()
+        assert exact_ev.decide(17, True, 10) == ExactEV().decision(
+            (7, True), (10, False)
+        )
+        assert (tmp_path / "best_play_2_3_-1_-1_0.json").exists()
+
+        with patch.object(exact_ev, "compute_table") as compute:
+            exact_ev.load_table.cache_clear()
+            assert exact_ev.decide(20, False, 10) == "stand"
+            compute.assert_not_called()
+    exact_ev.load_table.cache_clear()
+
+
+# ========================
+# Tests for the simulation
+# ========================
+
+
+class ScriptedRandom:
+    """A random.Random whose choice() returns the given card values in order."""
+
+    def __init__(self, *values: int):
+        self.values = list(values)
+
+    def choice(self, sequence: list) -> int:
+        return self.values.pop(0)
+
+
+class ScriptedGenerator:
+    """
+    A NumPy Generator whose integers() returns the given card indexes (into
+    deck_of_cards) in order, one array per non-empty draw.
+    """
+
+    def __init__(self, *draws: list):
+        self.draws = list(draws)
+
+    def integers(self, low, high, size, dtype) -> np.ndarray:
+        if not np.prod(size):
+            return np.zeros(size, dtype=dtype)
+        return np.array(self.draws.pop(0), dtype=dtype).reshape(size)
+
+
+def test_hand_total_counts_one_ace_as_11_when_it_fits():
+    """
+    Test that a hand is soft when an ace can count as 11, on ints and arrays.
+    """
+    assert hand_total(7, True) == (17, True)
+    assert hand_total(12, True) == (12, False)
+    assert hand_total(16, False) == (16, False)
+
+    total, soft = hand_total(np.array([2, 11, 21]), np.array([True, True, False]))
+    assert total.tolist() == [12, 21, 21]
+    assert soft.tolist() == [True, True, False]
+
+
+def test_strategies_work_on_ints_and_arrays():
+    """
+    Test that the built-in strategies give the same decisions for one hand and
+    for a batch of hands.
+    """
+    totals = np.array([16, 17, 17, 18])
+    soft = np.array([False, False, True, True])
+    upcards = np.full(4, 10)
+    for strategy in (
+        stand_on(17),
+        dealer_rule(),
+        dealer_rule(True),
+        never_hit,
+        simulation.PLAYER_STRATEGIES["basic"],
+        simulation.PLAYER_STRATEGIES["best"],
+    ):
+        batch = strategy(totals, soft, upcards).tolist()
+        single = [
+            bool(strategy(int(total), bool(is_soft), 10))
+            for total, is_soft in zip(totals, soft)
+        ]
+        assert batch == single
+    assert dealer_rule(True)(totals, soft, upcards).tolist() == [
+        True,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_play_hand_settles_naturals_busts_and_totals():
+    """
+    Test the payouts of one hand: a natural pays 3:2, a player bust loses
+    before the dealer draws, a dealer bust wins, and equal totals push.
+    """
+    player, dealer = stand_on(17), dealer_rule()
+    assert play_hand(ScriptedRandom(1, 10, 9, 7), player, dealer) == 1.5
+    assert play_hand(ScriptedRandom(1, 10, 1, 10), player, dealer) == 0.0
+    assert play_hand(ScriptedRandom(10, 6, 10, 7, 10), player, dealer) == -1.0
+    assert play_hand(ScriptedRandom(10, 8, 10, 6, 10), player, dealer) == 1.0
+    assert play_hand(ScriptedRandom(10, 7, 10, 6, 1), player, dealer) == 0.0
+    assert play_hand(ScriptedRandom(1, 10, 9, 7), player, dealer, 1.2) == 1.2
+
+
+def test_play_games_matches_play_game_on_the_same_cards():
+    """
+    Test that the game's NumPy engine deals and settles a batch like the
+    Python engine plays each of its rounds: the player's card before the
+    computer's, and game_outcome()'s payouts.
+    """
+    # deck_of_cards indexes: 0 is a 2, 3 a 5, 7 a 9, 8 a 10, 11 a K, 12 an ace.
+    rng = ScriptedGenerator(
+        [[8, 12, 7, 6, 8], [8, 3, 12, 7, 0]],  # The player's card, the computer's.
+        [8, 11, 3, 4, 4],  # Every player hits: the second has 21.
+        [4, 1, 8, 3, 1],  # The third computer has 21.
+        [8, 7],  # The first player stands on 20; the others hit 14 and 16.
+        [8, 8, 0],  # Computer bust, both bust, then the player's bust.
+    )
+    payouts = play_games(5, InfiniteDeck(rng), stand_on(17))
+
+    one_by_one = [
+        play_game(ScriptedRandom(*values), stand_on(17))
+        for values in (
+            [10, 10, 10, 6, 10],
+            [1, 5, 10, 3],
+            [9, 1, 5, 10],
+            [8, 9, 6, 5, 10, 10],
+            [10, 2, 6, 3, 9, 2],
+        )
+    ]
+    assert payouts.tolist() == one_by_one == [2.0, 3.0, -1.0, 0.0, -1.0]
+    rules = Rules(computer_bust=1.0, player_21=1.5)
+    assert play_game(ScriptedRandom(10, 10, 10, 6, 10), stand_on(17), rules) == 1.0
+
+
+def test_play_hands_matches_play_hand_on_the_same_cards():
+    """
+    Test that the NumPy engine settles a batch like the Python engine settles
+    each of its hands.
+    """
+    # Per hand: the player's two cards, then the dealer's, as deck_of_cards
+    # indexes (3 is a 5, 5 a 7, 7 a 9, 8 a 10, 11 a K and 12 an ace).
+    hands = [[12, 8, 8, 8], [11, 4, 6, 5], [7, 8, 8, 4], [5, 5, 8, 3]]
+    rng = ScriptedGenerator(
+        np.array(hands).T,
+        [8, 5],  # The second player busts from 16; the fourth hits 14 to 21.
+        [8, 3],  # The third dealer busts from 16; the fourth hits 15 to 20.
+    )
+    payouts = play_hands(4, InfiniteDeck(rng), stand_on(17), dealer_rule())
+
+    one_by_one = [
+        play_hand(ScriptedRandom(*values), stand_on(17), dealer_rule())
+        for values in (
+            [1, 10, 10, 10],
+            [10, 6, 8, 7, 10],
+            [9, 10, 10, 6, 10],
+            [7, 7, 10, 5, 7, 5],
+        )
+    ]
+    assert payouts.tolist() == one_by_one == [1.5, -1.0, 1.0, 1.0]
+
+
+def test_numpy_and_python_engines_agree():
+    """
+    Test that both engines play the same game under both rules: their outcome
+    rates and expected values are equal within sampling error.
+    """
+    for rules in (GAME_RULES, CASINO_RULES):
+        fast = simulate(400_000, rules=rules, seed=1)
+        slow = simulate_python(100_000, rules=rules, seed=1)
+        for outcome, rate in fast.rates().items():
+            assert abs(rate - slow.rates()[outcome]) < 0.01
+        assert abs(fast.expected_value - slow.expected_value) < 0.03
+    # Standing on 17 against a dealer standing on soft 17 loses about 5.7%.
+    assert -0.07 < fast.expected_value < -0.045
+
+
+def test_game_simulation_matches_the_exact_expected_value():
+    """
+    Test that the simulation plays the game of main.py by default: its
+    expected value matches exact_ev's within sampling error, for a few players.
+    """
+    for player in (stand_on(17), never_hit, best_strategy()):
+        result = simulate(400_000, player, seed=2)
+        exact = ExactEV(player=player).expected_value()
+        assert abs(result.expected_value - exact) < 4 * result.tally().standard_error
+    # The best play gains on standing by not busting, with no draws left.
+    assert result.draws == 0
+    assert exact == pytest.approx(ExactEV().expected_value())
+
+
+def test_simulate_is_reproducible_across_batches():
+    """
+    Test that a seed fixes the results, and that batches cover every hand.
+    """
+    with patch.object(simulation, "BATCH_SIZE", 1000):
+        result = simulate(2500, seed=7)
+    assert result.hands == 2500
+    assert result.wins + result.losses + result.draws == 2500
+    assert np.array_equal(
+        simulate(10_000, seed=3).payouts, simulate(10_000, seed=3).payouts
+    )
+
+
+def test_bankroll_trajectories_stop_when_broke():
+    """
+    Test that each session's bankroll follows its payouts and stays put once
+    it cannot cover the bet.
+    """
+    result = SimulationResult(np.array([1, -1, -1, 1, 1.5, -1, 0, 1], np.float32))
+    trajectory = result.bankroll(15, 10, sessions=2)
+    assert trajectory.tolist() == [
+        [15, 25, 15, 5, 5],
+        [15, 30, 20, 20, 30],
+    ]
+
+
+# ============================
+# Tests for the parallel runner
+# ============================
+
+
+def test_parallel_results_do_not_depend_on_the_workers():
+    """
+    Test that a seed gives the same hands on one worker or several, and that
+    every chunk gets its own random stream.
+    """
+    one = simulate_parallel(2_500, seed=5, workers=1, chunk_size=1_000)
+    three = simulate_parallel(2_500, seed=5, workers=3, chunk_size=1_000)
+
+    assert one.hands == 2_500
+    assert np.array_equal(one.payouts, three.payouts)
+    assert not np.array_equal(one.payouts[:1_000], one.payouts[1_000:2_000])
+    assert [size for size, _ in chunk_seeds(2_500, 5, 1_000)] == [1_000, 1_000, 500]
+
+
+def test_tallies_merge_into_the_tally_of_every_hand():
+    """
+    Test that the chunk tallies add up to the tally of all the payouts, with
+    the standard error of their mean.
+    """
+    result = simulate_parallel(3_000, seed=2, workers=2, chunk_size=1_000)
+    merged = tally_parallel(3_000, seed=2, workers=2, chunk_size=1_000)
+    expected = result.tally()
+
+    assert (merged.hands, merged.wins, merged.losses, merged.draws) == (
+        expected.hands,
+        expected.wins,
+        expected.losses,
+        expected.draws,
+    )
+    assert merged.expected_value == pytest.approx(expected.expected_value)
+    assert merged.standard_error == pytest.approx(
+        result.payouts.std(ddof=1) / np.sqrt(result.hands), rel=1e-4
+    )
+    assert tally_parallel(0) == Tally()
+
+
+def test_parallel_runs_play_the_game_unless_given_casino_rules():
+    """
+    Test that the workers play the game of main.py by default, and casino
+    blackjack when given CasinoRules, chunk for chunk like simulate().
+    """
+    game = tally_parallel(200_000, never_hit, seed=4, workers=2, chunk_size=50_000)
+    exact = ExactEV(player=never_hit).expected_value()
+    assert abs(game.expected_value - exact) < 4 * game.standard_error
+
+    seed = chunk_seeds(1_000, 4)[0][1]
+    casino = simulate_parallel(1_000, never_hit, CASINO_RULES, seed=4, workers=1)
+    assert np.array_equal(
+        casino.payouts, simulate(1_000, never_hit, CASINO_RULES, seed=seed).payouts
+    )
+
+
+# ========================
+# Tests for the shoe
+# ========================
+
+
+def test_shoe_deals_every_card_once_and_counts_back_to_zero():
+    """
+    Test that a shoe deals each card of its decks exactly once, and that the
+    Hi-Lo running count of a whole shoe is zero.
+    """
+    shoe = Shoe(decks=2, penetration=0.5, seed=1)
+    counts = []
+    dealt = []
+    while shoe.remaining:
+        dealt.append(shoe.deal())
+        counts.append(shoe.running_count)
+
+    assert sorted(dealt) == sorted(list(deck_of_cards) * 8)
+    assert counts[-1] == 0
+    assert counts[9] == sum(HI_LO[card] for card in dealt[:10])
+    assert shoe.needs_shuffle
+
+    shoe.shuffle()
+    assert (shoe.remaining, shoe.running_count, shoe.needs_shuffle) == (104, 0, False)
+
+
+def test_shoe_true_count_and_cut_card():
+    """
+    Test that the true count is the running count per deck left, and that the
+    cut card comes out at the penetration.
+    """
+    shoe = Shoe(decks=6, penetration=0.75, seed=2)
+    shoe.cards[:52] = [CARD_2, CARD_3, CARD_6] * 17 + [CARD_7]
+    for _ in range(52):
+        shoe.deal()
+    assert shoe.running_count == 51
+    assert shoe.true_count == 51 / 5
+
+    for _ in range(233 - 52):
+        shoe.deal()
+    assert not shoe.needs_shuffle
+    shoe.deal()
+    assert shoe.needs_shuffle
+
+    with pytest.raises(ValueError):
+        Shoe(decks=1, penetration=0.75)
+    with pytest.raises(ValueError):
+        Shoe(decks=0)
+
+
+def test_deal_card_deals_from_the_shoe():
+    """
+    Test that deal_card takes the next card of a shoe when given one.
+    """
+    shoe = Shoe(decks=1, penetration=0.5, seed=3)
+    player = Player(100)
+    first, second = shoe.cards[:2]
+
+    deal_card(player, "Player", shoe)
+    deal_card(player, "Player", shoe)
+    assert player.hand.cards == [first, second]
+    assert shoe.remaining == 50
+
+
+@patch("main.GAME_RUNNING", True)
+@patch("builtins.input", side_effect=AssertionError("auto-play asked for input"))
+def test_game_reshuffles_the_shoe_between_rounds(mock_input: patch):
+    """
+    Test that a game dealt from a shoe plays through several shoes, the shoe
+    being reshuffled between rounds once the cut card has come out.
+    """
+    shoe = Shoe(decks=1, penetration=0.5, seed=5)
+    player = Player(10_000)
+    computer = Computer()
+    with patch.object(shoe, "shuffle", wraps=shoe.shuffle) as shuffle:
+        deal_card(player, "Player", shoe)
+        deal_card(computer, "Computer", shoe)
+        assert game(player, computer, 10, auto_rounds=60, shoe=shoe) == "GAME OVER"
+
+    # 60 rounds deal at least 120 cards: one deck is cut at 26.
+    assert shuffle.call_count >= 4
+
+
+def test_shoes_deal_and_reshuffle_independently():
+    """
+    Test that a rack of shoes deals only from the shoes asked, counts each
+    one, and reshuffles only those past their cut card.
+    """
+    shoes = Shoes(3, decks=1, penetration=0.5, rng=np.random.default_rng(4))
+    assert all(sorted(row) == sorted(shoes.cards[0]) for row in shoes.cards.tolist())
+
+    top = shoes.cards[[0, 2], :3].T
+    cards = shoes.deal(np.array([0, 2]), 3)
+    assert np.array_equal(cards, top)
+    assert shoes.cursor.tolist() == [3, 0, 3]
+    tags = {1: -1, 10: -1, 7: 0, 8: 0, 9: 0}
+    assert shoes.running_count[0] == sum(tags.get(card, 1) for card in top[:, 0])
+
+    shoes.deal(np.array([2]), 23)
+    shoes.shuffle_finished()
+    assert shoes.cursor.tolist() == [3, 0, 0]
+    assert shoes.running_count[2] == 0
+    assert shoes.true_count[1] == 0
+
+
+def test_counting_finds_the_edge_in_high_counts():
+    """
+    Test that hands dealt at a high true count play better than at a low one,
+    under the game's rules (the default) and casino rules, and that a bet
+    spread bets more when they do.
+    """
+    for rules, favours_player in ((GAME_RULES, True), (CASINO_RULES, False)):
+        result = simulate_counting(5_000, 200, rules=rules, bets=bet_spread(8), seed=1)
+        high = result.true_counts >= 3
+        low = result.true_counts < -2
+
+        assert result.hands == 1_000_000
+        assert (result.expected_value > 0) == favours_player
+        assert result.payouts[high].mean() > result.payouts[low].mean() + 0.01
+        assert result.bets[high].min() == 3
+        assert result.bets[low].max() == 1
+        assert sum(hands for hands, _ in result.by_true_count().values()) == 1_000_000
+    assert np.array_equal(
+        simulate_counting(100, 10, seed=5).payouts,
+        simulate_counting(100, 10, seed=5).payouts,
+    )
+
+
 # Name                                   Stmts   Miss  Cover
 # ----------------------------------------------------------
 # projects/blackjack/computer.py             4      0   100%
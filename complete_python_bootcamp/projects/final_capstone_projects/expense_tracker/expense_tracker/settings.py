@@ -41,6 +41,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its latency covers every other middleware.
+    "tracker.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -54,7 +56,9 @@ ROOT_URLCONF = "expense_tracker.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # The Django backend, with templates that report their render time to
+        # tracker.metrics.MetricsMiddleware.
+        "BACKEND": "tracker.metrics.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -74,14 +78,70 @@ WSGI_APPLICATION = "expense_tracker.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Pragmas run on every new SQLite connection. WAL lets the dashboard keep
+# reading while expenses are written; with WAL, synchronous=NORMAL only syncs
+# at checkpoints, so a power cut can lose the last commits but never corrupts
+# the database.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # Negative means KiB: 64 MiB.
+    "temp_store": "memory",
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Reuse connections across requests instead of reconnecting (and
+        # re-running the pragmas) every time.
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Busy timeout, in seconds: how long a writer waits for another.
+            "timeout": 20,
+            # Take the write lock when a transaction starts, so two writers
+            # queue on the busy timeout instead of failing to upgrade a lock.
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Cached pages and statistics live in local memory, one cache per process. The
+# ledger version their keys embed lives in the "ledger" cache, which every
+# worker process must share so that a write in one invalidates the pages cached
+# by all of them: a directory on disk by default, or Redis or Memcached when
+# the workers run on several machines.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "expense-tracker",
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+    "ledger": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "ledger",
+    },
+}
+
+
+# Metrics
+# MetricsMiddleware adds a Server-Timing header (SQL queries and time, template
+# time, total latency) to every response and serves per-view histograms at
+# /metrics in the Prometheus text format. Set to False to switch it off; the
+# middleware then removes itself at startup.
+
+TRACKER_METRICS = True
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
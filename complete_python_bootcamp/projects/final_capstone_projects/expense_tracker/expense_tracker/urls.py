@@ -15,15 +15,32 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from tracker import views
+from tracker import api, views
 from django.contrib import admin
 from django.urls import path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", views.home, name="home"),
+    path("async/", views.home_async, name="home_async"),
     path("add/", views.add_expense, name="add_expense"),
+    path("expenses/", views.expenses_list, name="expenses_list"),
     path("delete_income/<int:income_id>", views.delete_income, name="delete_income"),
     path("add_income/", views.add_income, name="add_income"),
     path("delete/<int:expense_id>/", views.delete_expense, name="delete_expense"),
+    path("import/", views.import_ledger, name="import_ledger"),
+    path(
+        "export/<str:kind>.<str:file_format>",
+        views.export_ledger,
+        name="export_ledger",
+    ),
+    path("cache-stats/", views.cache_stats, name="cache_stats"),
+    path("metrics", views.metrics_view, name="metrics"),
+    path("api/summary/", api.summary, name="api_summary"),
+    path("api/categories/", api.categories, name="api_categories"),
+    path("api/budgets/", api.budget_status, name="api_budgets"),
+    path("api/analytics/", api.spending_trends, name="api_analytics"),
+    path("api/search/", api.search_ledger, name="api_search"),
+    path("api/expenses/", api.ledger_list, {"kind": "expense"}, name="api_expenses"),
+    path("api/income/", api.ledger_list, {"kind": "income"}, name="api_income"),
 ]
@@ -1,19 +1,163 @@
 from django.contrib import admin
-from .models import Expenses, Income
+from django.contrib.admin.views.main import SEARCH_VAR
+from django.core.paginator import Paginator
+from django.db.models import QuerySet, Sum
+from django.db.models.functions import Collate
+from django.utils.functional import cached_property
+
+from .models import Budget, Expenses, Income, MonthlyRollup, RecurringRule, Rollup
+
+
+class RollupCountPaginator(Paginator):
+    """
+    Paginator that reads the size of an unfiltered ledger table from the
+    monthly rollups, a few hundred rows, instead of running COUNT(*) over
+    every ledger row on each changelist page. Filtered and searched
+    changelists are still counted exactly.
+    """
+
+    def __init__(self, *args, kind: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.kind = kind
+
+    @cached_property
+    def count(self) -> int:
+        if self.object_list.query.where:
+            return super().count
+        result: dict = MonthlyRollup.objects.filter(kind=self.kind).aggregate(
+            count=Sum("count")
+        )
+        return result["count"] or 0
+
+
+class AmountRangeFilter(admin.SimpleListFilter):
+    """
+    Filters an amount column by fixed ranges, which the amount indexes
+    answer, instead of listing every distinct amount in the table.
+    """
+
+    title = "amount"
+    parameter_name = "amount_range"
+    field: str = ""
+    # (value, label, lower bound, upper bound) in cents; None is unbounded.
+    ranges = [
+        ("0-10", "Under $10", None, 1_000),
+        ("10-100", "$10 to $100", 1_000, 10_000),
+        ("100-1000", "$100 to $1,000", 10_000, 100_000),
+        ("1000-", "$1,000 and over", 100_000, None),
+    ]
+
+    def lookups(self, request, model_admin) -> list:
+        return [(value, label) for value, label, _, _ in self.ranges]
+
+    def queryset(self, request, queryset: QuerySet) -> QuerySet:
+        for value, _, lower, upper in self.ranges:
+            if self.value() == value:
+                if lower is not None:
+                    queryset = queryset.filter(**{f"{self.field}__gte": lower})
+                if upper is not None:
+                    queryset = queryset.filter(**{f"{self.field}__lt": upper})
+        return queryset
+
+
+class ExpenseAmountFilter(AmountRangeFilter):
+    field = "expense"
+
+
+class IncomeAmountFilter(AmountRangeFilter):
+    field = "amount"
+
+
+class IncomeSourceFilter(admin.SimpleListFilter):
+    """
+    Lists the income sources from the monthly rollups rather than with a
+    DISTINCT over every income.
+    """
+
+    title = "source"
+    parameter_name = "source"
+
+    def lookups(self, request, model_admin) -> list:
+        sources = (
+            MonthlyRollup.objects.filter(kind=Rollup.INCOME, count__gt=0)
+            .values_list("category", flat=True)
+            .distinct()
+            .order_by("category")
+        )
+        return [(source, source) for source in sources]
+
+    def queryset(self, request, queryset: QuerySet) -> QuerySet:
+        if self.value():
+            return queryset.filter(source=self.value())
+        return queryset
+
+
+class LedgerAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for the ledger tables, which can hold millions of
+    rows: counts come from the rollups, the total before filtering is not
+    counted separately, filters are fixed ranges or come from the rollups,
+    and searches are prefix searches on a case-insensitive index.
+    """
+
+    rollup_kind: str = ""
+    show_full_result_count = False
+    paginator = RollupCountPaginator
+    raw_id_fields = ["recurring_rule"]
+    # The ordering of search results: the searched field's case-insensitive
+    # index returns its prefix matches in this order, so a page of them is
+    # read without sorting every match.
+    search_ordering: list = []
+
+    def get_ordering(self, request) -> list:
+        if request.GET.get(SEARCH_VAR) and self.search_ordering:
+            return self.search_ordering
+        return super().get_ordering(request)
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ) -> RollupCountPaginator:
+        return self.paginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            kind=self.rollup_kind,
+        )
 
 
 # Register your models here.
 @admin.register(Expenses)
-class ExpensesAdmin(admin.ModelAdmin):
+class ExpensesAdmin(LedgerAdmin):
+    rollup_kind = Rollup.EXPENSE
     list_display = ["expense_id", "name", "category", "date", "expense"]
-    search_fields = ["name", "category"]
-    list_filter = ["category", "expense", "date"]
+    search_fields = ["^name"]
+    search_ordering = [Collate("name", "NOCASE").asc(), "expense_id"]
+    list_filter = ["category", ExpenseAmountFilter, "date"]
     ordering = ["expense"]
 
 
 @admin.register(Income)
-class IncomeAdmin(admin.ModelAdmin):
+class IncomeAdmin(LedgerAdmin):
+    rollup_kind = Rollup.INCOME
     list_display = ["income_id", "source", "amount", "date"]
-    search_fields = ["income_id", "source", "amount", "date"]
-    list_filter = ["income_id", "source", "amount", "date"]
-    ordering = ["amount", "date"]
+    search_fields = ["^source"]
+    search_ordering = [Collate("source", "NOCASE").asc(), "income_id"]
+    list_filter = [IncomeSourceFilter, IncomeAmountFilter, "date"]
+    # Ending on the primary key keeps Django from adding a descending one,
+    # which the (amount, date) indexes could not return in order.
+    ordering = ["amount", "date", "income_id"]
+
+
+@admin.register(RecurringRule)
+class RecurringRuleAdmin(admin.ModelAdmin):
+    list_display = ["name", "kind", "amount", "frequency", "next_date", "active"]
+    search_fields = ["name"]
+    list_filter = ["kind", "frequency", "active"]
+    readonly_fields = ["materialized", "next_date"]
+
+
+@admin.register(Budget)
+class BudgetAdmin(admin.ModelAdmin):
+    list_display = ["category", "amount"]
+    ordering = ["category"]
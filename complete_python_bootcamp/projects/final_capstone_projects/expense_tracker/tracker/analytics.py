@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from . import rollups
+from .fields import Money
+from .models import MonthlyRollup, Rollup
+
+HISTORY_MONTHS = 12
+FORECAST_MONTHS = 3
+# Rolling averages, in months.
+WINDOWS = (3, 12)
+# Months the forecast's trend line is fitted to: the most recent ones.
+FIT_MONTHS = 12
+
+
+def month_index(day: date) -> int:
+    """Months since year 0, so consecutive months are consecutive integers."""
+    return day.year * 12 + day.month - 1
+
+
+def month_from_index(index: int) -> date:
+    year, month = divmod(index, 12)
+    return date(year, month + 1, 1)
+
+
+@dataclass
+class SpendingTrends:
+    """
+    Monthly spending per expense category over the last complete months, with
+    rolling averages and a linear forecast of the coming months.
+
+    Loaded in one query over the monthly rollups, a row per category and
+    month, and computed with NumPy on a (category, month) matrix of cents: the
+    rolling averages from cumulative sums, the forecast by fitting a trend
+    line to every category at once. Amounts are in cents, like Money.
+    """
+
+    months: list
+    categories: list
+    # (categories + 1, months) arrays; the last row is the total of all
+    # categories.
+    spend: np.ndarray
+    averages: dict
+    forecast_months: list
+    forecast: np.ndarray
+
+    @classmethod
+    def load(
+        cls,
+        month: date | None = None,
+        history: int = HISTORY_MONTHS,
+        horizon: int = FORECAST_MONTHS,
+    ) -> "SpendingTrends":
+        """
+        Returns the trends of the ``history`` complete months before the month
+        containing ``month`` (the current month by default), and the forecast
+        of the ``horizon`` months starting with that month.
+        """
+        current: int = month_index(month or timezone.localdate())
+        rows: list = list(
+            MonthlyRollup.objects.filter(
+                kind=Rollup.EXPENSE,
+                count__gt=0,
+                period__lt=rollups.month_start(month_from_index(current)),
+            ).values_list(
+                "category",
+                ExtractYear("period") * 12 + ExtractMonth("period") - 1,
+                "total",
+            )
+        )
+        categories, indexes, totals = zip(*rows) if rows else ((), (), ())
+        categories, category_rows = np.unique(
+            np.array(categories, dtype=str), return_inverse=True
+        )
+        indexes = np.array(indexes, dtype=np.int64)
+
+        # Every month from the first with spending (or the first shown, if
+        # later ones are empty) to the last complete one, so the rolling
+        # averages of the first months shown can look back.
+        start: int = current - history
+        first: int = int(indexes.min()) if rows else start
+        origin: int = min(first, start)
+        matrix = np.zeros((len(categories) + 1, current - origin))
+        np.add.at(matrix, (category_rows, indexes - origin), totals)
+        matrix[-1] = matrix[:-1].sum(axis=0)
+
+        # Months since the ledger started, per column: months before the first
+        # expense do not count towards an average.
+        elapsed = np.arange(current - origin) - (first - origin) + 1
+        sums = np.cumsum(matrix, axis=1)
+        averages: dict = {}
+        for window in WINDOWS:
+            rolling = sums.copy()
+            rolling[:, window:] -= sums[:, :-window]
+            averages[window] = np.divide(
+                rolling,
+                np.clip(elapsed, 0, window),
+                out=np.zeros_like(rolling),
+                where=elapsed > 0,
+            )[:, start - origin :]
+
+        spend = matrix[:, start - origin :]
+        return cls(
+            months=[month_from_index(index) for index in range(start, current)],
+            categories=categories.tolist(),
+            spend=spend,
+            averages=averages,
+            forecast_months=[
+                month_from_index(index) for index in range(current, current + horizon)
+            ],
+            forecast=linear_forecast(
+                matrix[:, -min(FIT_MONTHS, current - first) :], horizon
+            ),
+        )
+
+    def as_dict(self) -> dict:
+        """The trends as JSON-serializable data, for the API."""
+        series: list = [
+            {
+                "spend": cents(self.spend[row]),
+                **{
+                    f"average_{window}": cents(averages[row])
+                    for window, averages in self.averages.items()
+                },
+                "forecast": cents(self.forecast[row]),
+            }
+            for row in range(len(self.spend))
+        ]
+        return {
+            "months": self.months,
+            "forecast_months": self.forecast_months,
+            "categories": [
+                {"category": category, **row}
+                for category, row in zip(self.categories, series)
+            ],
+            "total": series[-1],
+        }
+
+
+def linear_forecast(spend: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Extends the least-squares trend line of every row of ``spend`` (one value
+    per month) over the next ``horizon`` months, never below zero. A single
+    month of history forecasts that month's amount.
+    """
+    months: int = spend.shape[1]
+    x = np.arange(months) - (months - 1) / 2
+    means = spend.mean(axis=1, keepdims=True)
+    spread: float = float(x @ x)
+    slopes = (spend - means) @ x / spread if spread else np.zeros(len(spend))
+    ahead = np.arange(months, months + horizon) - (months - 1) / 2
+    return np.clip(means + slopes[:, None] * ahead, 0, None)
+
+
+def cents(values: np.ndarray) -> list:
+    """Amounts rounded to whole cents, as Money."""
+    return [Money(value) for value in np.rint(values).astype(np.int64).tolist()]
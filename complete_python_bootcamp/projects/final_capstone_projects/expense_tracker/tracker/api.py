@@ -0,0 +1,190 @@
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET
+
+from . import analytics, budgets, caching, rollups, search
+from .fields import MoneyJSONEncoder
+from .forms import (
+    AnalyticsForm,
+    DashboardFilterForm,
+    LedgerFilterForm,
+    LedgerPageForm,
+    SearchForm,
+)
+from .ledger import KINDS, LedgerFilter, filter_ledger
+from .models import Rollup
+from .pagination import PAGE_SIZE, KeysetPage, apaginate
+from .stats import DashboardStats
+
+
+def ledger_etag(request: ASGIRequest, *args, **kwargs) -> str:
+    """
+    ETag of every API response: the ledger version, which changes on every
+    write. Polling clients sending it back in If-None-Match get a 304 without
+    any database query.
+    """
+    return f'"ledger-{caching.ledger_version()}"'
+
+
+@require_GET
+@condition(etag_func=ledger_etag)
+async def summary(request: ASGIRequest) -> JsonResponse:
+    """
+    Return the dashboard statistics as JSON: totals, net worth, savings rate,
+    expense breakdown by category and top expenses.
+
+    Accepts the dashboard filters: ``start``, ``end``, ``category`` (of the
+    expenses) and ``source`` (of the incomes).
+    """
+    form = DashboardFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    filters: LedgerFilter = form.ledger_filter()
+    stats: DashboardStats = await caching.acached(
+        "stats", lambda: DashboardStats.aload(filters), *filters.key_parts()
+    )
+    return JsonResponse(stats.as_dict(), encoder=MoneyJSONEncoder)
+
+
+@require_GET
+@condition(etag_func=ledger_etag)
+async def ledger_list(request: ASGIRequest, kind: str) -> JsonResponse:
+    """
+    List expenses or incomes in date order, one keyset-paginated page at a time.
+
+    Accepts ``start``, ``end``, ``category`` (the source, for incomes) filters,
+    a page ``limit`` and the ``after``/``before`` cursors returned as ``next``
+    and ``previous``. Rows are read as ``values()`` dicts, never as model
+    instances.
+    """
+    form = LedgerPageForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    data: dict = form.cleaned_data
+    model, columns, _ = KINDS[kind]
+    page: KeysetPage = await apaginate(
+        filter_ledger(kind, data["start"], data["end"], data["category"]).values(
+            *columns
+        ),
+        ("date", model._meta.pk.name),
+        after=data["after"],
+        before=data["before"],
+        page_size=data["limit"] or PAGE_SIZE,
+    )
+    return JsonResponse(
+        {
+            "results": page.items,
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+        },
+        encoder=MoneyJSONEncoder,
+    )
+
+
+@require_GET
+@condition(etag_func=ledger_etag)
+async def categories(request: ASGIRequest) -> JsonResponse:
+    """
+    Return the expense total and count per category, and the income total and
+    count per source, optionally between ``start`` and ``end``. Served from the
+    rollups.
+    """
+    form = LedgerFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    start, end = form.cleaned_data["start"], form.cleaned_data["end"]
+    return JsonResponse(
+        {
+            "expenses": [
+                row async for row in rollups.category_totals(Rollup.EXPENSE, start, end)
+            ],
+            "income": [
+                row async for row in rollups.category_totals(Rollup.INCOME, start, end)
+            ],
+        },
+        encoder=MoneyJSONEncoder,
+    )
+
+
+def month_etag(request: ASGIRequest, *args, **kwargs) -> str:
+    """
+    ETag of the responses about the current month: the ledger version and the
+    month, so they change when the month rolls over as well.
+    """
+    return f'"ledger-{caching.ledger_version()}-{timezone.localdate():%Y-%m}"'
+
+
+@require_GET
+@condition(etag_func=month_etag)
+async def budget_status(request: ASGIRequest) -> JsonResponse:
+    """
+    Return every category budget with this month's spending and whether it is
+    over budget.
+    """
+    statuses: list = await caching.acached(
+        "budgets", budgets.amonth_status, timezone.localdate().isoformat()
+    )
+    return JsonResponse(
+        {"results": [status.as_dict() for status in statuses]},
+        encoder=MoneyJSONEncoder,
+    )
+
+
+@require_GET
+@condition(etag_func=month_etag)
+async def spending_trends(request: ASGIRequest) -> JsonResponse:
+    """
+    Return the monthly spending per category over the last ``months`` complete
+    months (12 by default), with its rolling 3- and 12-month averages, and a
+    linear forecast of the next ``horizon`` months (3 by default), the current
+    one included. Cached until the ledger changes.
+    """
+    form = AnalyticsForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    month: date = rollups.month_start(timezone.localdate())
+    history: int = form.cleaned_data["months"] or analytics.HISTORY_MONTHS
+    horizon: int = form.cleaned_data["horizon"] or analytics.FORECAST_MONTHS
+    trends: analytics.SpendingTrends = await caching.acached(
+        "analytics",
+        lambda: sync_to_async(analytics.SpendingTrends.load)(month, history, horizon),
+        month.isoformat(),
+        str(history),
+        str(horizon),
+    )
+    return JsonResponse(trends.as_dict(), encoder=MoneyJSONEncoder)
+
+
+@require_GET
+@condition(etag_func=ledger_etag)
+async def search_ledger(request: ASGIRequest) -> JsonResponse:
+    """
+    Full-text search of the expense names and income sources.
+
+    Returns the ``limit`` best matches of each kind for the words of ``q``,
+    best first; the last word may be unfinished (``q=gro`` finds "Groceries
+    run"). Served from the FTS5 indexes, so it does not scan the ledger.
+    Every match is ranked, or only the newest ``window`` of them if given.
+    """
+    form = SearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    text: str = form.cleaned_data["q"]
+    limit: int = form.cleaned_data["limit"] or search.RESULTS
+    window: int | None = form.cleaned_data["window"]
+    return JsonResponse(
+        {
+            "expenses": await search.asearch("expense", text, limit, window),
+            "income": await search.asearch("income", text, limit, window),
+        },
+        encoder=MoneyJSONEncoder,
+    )
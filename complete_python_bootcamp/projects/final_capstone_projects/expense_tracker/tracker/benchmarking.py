@@ -0,0 +1,337 @@
+import asyncio
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Iterator
+
+from django.db import OperationalError, connection, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from . import metrics
+from .ledger import insert_sql
+from .models import Expenses, Income, RecurringRule
+
+# Settings that turn off the dashboard cache, so every request hits the database.
+UNCACHED = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+SEED_START = date(2000, 1, 1)
+SEED_DAYS = 365 * 25
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """
+    Runs the enclosed block against a fresh, throwaway test database (and with
+    the test client environment set up), so benchmarks never touch the real one.
+    """
+    setup_test_environment()
+    old_name: str = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_ledger(
+    expenses: int, incomes: int = 0, batch_size: int = 10_000, seed: int = 0
+) -> None:
+    """
+    Appends ``expenses`` and ``incomes`` pseudo-random rows to the ledger.
+
+    Rows are built as plain tuples and written with one ``executemany`` INSERT
+    per batch, skipping model instances entirely, so seeding ten million rows
+    takes minutes rather than hours. This also bypasses the rollup signal
+    handlers; call ``rollups.rebuild()`` afterwards if the benchmark reads the
+    dashboard totals.
+    """
+    rng = random.Random(seed)
+    categories: list = [value for value, _ in Expenses.categories]
+    sources: list = ["Salary", "Bonus", "Freelance", "Dividends"]
+    # Dates as the database stores them, computed once rather than per row.
+    days: list = [
+        Expenses._meta.get_field("date").get_db_prep_save(
+            SEED_START + timedelta(days=offset), connection
+        )
+        for offset in range(SEED_DAYS)
+    ]
+
+    def expense() -> tuple:
+        return (
+            f"Expense {rng.randrange(1_000_000):06d}",
+            rng.randint(100, 200_000),
+            rng.choice(categories),
+            rng.choice(days),
+        )
+
+    def income() -> tuple:
+        return rng.choice(sources), rng.randint(100, 500_000), rng.choice(days)
+
+    for model, fields, total, build in (
+        (Expenses, ("name", "expense", "category", "date"), expenses, expense),
+        (Income, ("source", "amount", "date"), incomes, income),
+    ):
+        sql: str = insert_sql(model, fields)
+        for offset in range(0, total, batch_size):
+            rows: list = [build() for _ in range(min(batch_size, total - offset))]
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+
+
+def time_request(client: Client, url: str, repeat: int = 5) -> float:
+    """
+    Returns the median wall-clock time in milliseconds of GET ``url``.
+    """
+    timings: list = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+    return statistics.median(timings)
+
+
+@dataclass
+class LoadResult:
+    """Throughput and latency percentiles of a load run."""
+
+    requests: int
+    elapsed: float
+    latencies: list
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed
+
+    def percentile(self, percent: int) -> float:
+        """Latency in milliseconds below which ``percent`` % of requests finished."""
+        return statistics.quantiles(self.latencies, n=100)[percent - 1] * 1000
+
+
+def run_wsgi_load(url: str, requests: int, concurrency: int) -> LoadResult:
+    """
+    Sends ``requests`` GETs to ``url`` through the WSGI handler, from
+    ``concurrency`` threads (one test client each), the way a threaded WSGI
+    server would serve them.
+    """
+
+    def worker(count: int) -> list:
+        client = Client()
+        latencies: list = []
+        try:
+            for _ in range(count):
+                started: float = time.perf_counter()
+                client.get(url)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connections.close_all()
+        return latencies
+
+    shares: list = [requests // concurrency] * concurrency
+    for index in range(requests % concurrency):
+        shares[index] += 1
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies: list = [
+            latency for chunk in pool.map(worker, shares) for latency in chunk
+        ]
+    return LoadResult(requests, time.perf_counter() - started, latencies)
+
+
+def run_asgi_load(url: str, requests: int, concurrency: int) -> LoadResult:
+    """
+    Sends ``requests`` GETs to ``url`` through the ASGI handler, with at most
+    ``concurrency`` requests in flight on one event loop.
+    """
+
+    async def run() -> list:
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> float:
+            async with semaphore:
+                started: float = time.perf_counter()
+                await client.get(url)
+                return time.perf_counter() - started
+
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+    started: float = time.perf_counter()
+    latencies: list = asyncio.run(run())
+    return LoadResult(requests, time.perf_counter() - started, latencies)
+
+
+@dataclass
+class Endpoint:
+    """
+    One request of the benchmark suite. ``path`` is called before every
+    request, so endpoints that consume rows (deletes) can move to the next one.
+    """
+
+    name: str
+    path: Callable[[], str]
+    method: str = "get"
+    data: dict | None = None
+    status: int = 200
+
+
+def measure_endpoint(client: Client, endpoint: Endpoint, repeat: int) -> dict:
+    """
+    Sends ``endpoint`` ``repeat`` times and returns its latency (median and
+    95th percentile), throughput, and the query count, SQL time and template
+    time that MetricsMiddleware reported in the Server-Timing header.
+    """
+    latencies: list = []
+    queries: list = []
+    db: list = []
+    template: list = []
+    for _ in range(repeat):
+        path: str = endpoint.path()
+        started: float = time.perf_counter()
+        response = getattr(client, endpoint.method)(path, endpoint.data)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != endpoint.status:
+            raise RuntimeError(
+                f"{endpoint.method.upper()} {path} returned {response.status_code}"
+            )
+        timings: dict = metrics.parse_server_timing(response["Server-Timing"])
+        queries.append(int(timings["db"][1].split()[0]))
+        db.append(timings["db"][0])
+        template.append(timings["tpl"][0])
+
+    return {
+        "median_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(
+            (
+                statistics.quantiles(latencies, n=20)[-1]
+                if len(latencies) > 1
+                else latencies[0]
+            ),
+            2,
+        ),
+        "requests_per_second": round(len(latencies) / sum(latencies) * 1000, 1),
+        "queries": max(queries),
+        "db_ms": round(statistics.median(db), 2),
+        "template_ms": round(statistics.median(template), 2),
+    }
+
+
+def compare_reports(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns the regressions of ``report`` against ``baseline``: any endpoint
+    running more queries, or with a median latency or template time more than
+    ``tolerance`` (a fraction, e.g. 0.5 for 50%) above the baseline's, at a
+    ledger size both reports measured.
+    """
+    regressions: list = []
+    for rows, endpoints in report["results"].items():
+        for name, result in endpoints.items():
+            previous: dict | None = baseline["results"].get(rows, {}).get(name)
+            if previous is None:
+                continue
+            where: str = f"{name} at {int(rows):,} rows"
+            if result["queries"] > previous["queries"]:
+                regressions.append(
+                    f"{where}: {previous['queries']} -> {result['queries']} queries"
+                )
+            for key in ("median_ms", "template_ms"):
+                if result[key] > previous[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{where}: {key} {previous[key]} -> {result[key]}"
+                    )
+    return regressions
+
+
+def sqlite_connection(path: str, options: dict) -> BaseDatabaseWrapper:
+    """
+    A new connection to the SQLite database at ``path``, configured like the
+    default database but with ``options`` as its OPTIONS (init_command,
+    timeout, transaction_mode). Only usable from the thread that created it.
+    """
+    settings_dict: dict = {
+        **connection.settings_dict,
+        "NAME": path,
+        "OPTIONS": options,
+    }
+    return type(connections["default"])(settings_dict, alias=f"benchmark:{path}")
+
+
+def reads_during_writes(
+    path: str, options: dict, rows: int, batch_size: int = 10_000
+) -> tuple[LoadResult, int]:
+    """
+    Creates the expenses table in a new SQLite database at ``path``, then bulk
+    inserts ``rows`` expenses (one transaction per batch) while another thread
+    keeps reading the newest page of expenses, as the dashboard does.
+
+    Returns:
+        tuple[LoadResult, int]: The reads' latencies, and how many of them
+            failed with "database is locked".
+    """
+    setup: BaseDatabaseWrapper = sqlite_connection(path, options)
+    with setup.schema_editor(atomic=False) as editor:
+        editor.create_model(RecurringRule)
+        editor.create_model(Expenses)
+    setup.close()
+
+    sql: str = insert_sql(Expenses, ("name", "expense", "category", "date"))
+    writing = threading.Event()
+    done = threading.Event()
+
+    def write() -> None:
+        database: BaseDatabaseWrapper = sqlite_connection(path, options)
+        try:
+            with database.cursor() as cursor:
+                writing.set()
+                for offset in range(0, rows, batch_size):
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.executemany(
+                        sql,
+                        [
+                            (f"Expense {index}", 1250, "Groceries", "2024-06-01")
+                            for index in range(offset, min(offset + batch_size, rows))
+                        ],
+                    )
+                    cursor.execute("COMMIT")
+        finally:
+            done.set()
+            database.close()
+
+    def read() -> tuple[list, int]:
+        database: BaseDatabaseWrapper = sqlite_connection(path, options)
+        latencies: list = []
+        locked: int = 0
+        writing.wait()
+        try:
+            with database.cursor() as cursor:
+                while not done.is_set():
+                    started: float = time.perf_counter()
+                    try:
+                        cursor.execute(
+                            "SELECT * FROM tracker_expenses "
+                            "ORDER BY date DESC, expense_id DESC LIMIT 25"
+                        )
+                        cursor.fetchall()
+                    except OperationalError:
+                        locked += 1
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            database.close()
+        return latencies, locked
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(2) as pool:
+        reader = pool.submit(read)
+        pool.submit(write).result()
+        latencies, locked = reader.result()
+    return LoadResult(len(latencies), time.perf_counter() - started, latencies), locked
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from datetime import date
+
+from django.db.models import OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .fields import Money, MoneyField
+from .models import Budget, MonthlyRollup, Rollup
+from .rollups import month_start
+
+
+@dataclass(frozen=True)
+class BudgetStatus:
+    """How much of one category's monthly budget has been spent."""
+
+    category: str
+    amount: Money
+    spent: Money
+
+    @property
+    def remaining(self) -> Money:
+        return self.amount - self.spent
+
+    @property
+    def over(self) -> bool:
+        return self.spent > self.amount
+
+    @property
+    def percent(self) -> float:
+        return self.spent / self.amount * 100
+
+    def as_dict(self) -> dict:
+        """The status as JSON-serializable data, for the API."""
+        return {
+            "category": self.category,
+            "amount": self.amount,
+            "spent": self.spent,
+            "remaining": self.remaining,
+            "over": self.over,
+        }
+
+
+def budgets_with_spending(month: date) -> QuerySet:
+    """
+    Every budget annotated with ``spent``, the category's running total for
+    ``month`` read from its MonthlyRollup row (0 if nothing was spent).
+
+    One query however many expenses the month holds: each budget costs a
+    lookup on the rollups' unique (kind, category, period) index.
+    """
+    spent = MonthlyRollup.objects.filter(
+        kind=Rollup.EXPENSE, category=OuterRef("category"), period=month_start(month)
+    ).values("total")[:1]
+    return Budget.objects.annotate(
+        spent=Coalesce(Subquery(spent), 0, output_field=MoneyField())
+    ).order_by("category")
+
+
+def month_status(month: date | None = None) -> list[BudgetStatus]:
+    """
+    Returns the status of every budget for the month containing ``month``
+    (the current month by default).
+    """
+    month = month or timezone.localdate()
+    return [
+        BudgetStatus(budget.category, budget.amount, budget.spent)
+        for budget in budgets_with_spending(month)
+    ]
+
+
+async def amonth_status(month: date | None = None) -> list[BudgetStatus]:
+    """Async version of ``month_status``."""
+    month = month or timezone.localdate()
+    return [
+        BudgetStatus(budget.category, budget.amount, budget.spent)
+        async for budget in budgets_with_spending(month)
+    ]
@@ -0,0 +1,111 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from django.core.cache import cache, caches
+
+VERSION_KEY = "tracker:ledger-version"
+# Shared by every process, unlike the default cache holding the cached values.
+versions = caches["ledger"]
+TIMEOUT = 60 * 60
+
+# In-process hit/miss counters per cached item, exposed by the cache_stats view.
+hits: Counter = Counter()
+misses: Counter = Counter()
+_counters_lock = threading.Lock()
+
+
+def ledger_version() -> int:
+    """
+    Returns the current ledger version, which every cache key embeds.
+
+    A missing version (first use, eviction, cache restart) is seeded with the
+    current time in nanoseconds rather than 1, so it can never collide with a
+    version that older cache entries were stored under.
+    """
+    version: int | None = versions.get(VERSION_KEY)
+    if version is None:
+        versions.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = versions.get(VERSION_KEY)
+    return version
+
+
+async def aledger_version() -> int:
+    """Async version of ``ledger_version``."""
+    version: int | None = await versions.aget(VERSION_KEY)
+    if version is None:
+        await versions.aadd(VERSION_KEY, time.time_ns(), timeout=None)
+        version = await versions.aget(VERSION_KEY)
+    return version
+
+
+def bump_ledger_version() -> None:
+    """
+    Invalidates everything cached for the ledger by moving to a new version.
+
+    Called whenever an expense or income is written, through
+    ``transaction.on_commit``: bumping before the write commits would let
+    another request cache the old data under the new version. The new version
+    comes from the clock rather than ``incr``, which the file cache runs as a
+    read then a write, so two processes bumping at once still both move past
+    every version cached so far.
+    """
+    version: int = max(time.time_ns(), (versions.get(VERSION_KEY) or 0) + 1)
+    versions.set(VERSION_KEY, version, timeout=None)
+
+
+def cached(name: str, build: Callable[[], Any], *parts: str) -> Any:
+    """
+    Returns the cached value of ``name`` for the current ledger version,
+    calling ``build`` to compute and store it on a miss.
+
+    Parameters:
+        name (str): What is cached, used for the key and the hit/miss counters.
+        build (Callable): Computes the value on a cache miss.
+        *parts (str): Further key parts, e.g. the query string.
+    """
+    key: str = cache_key(name, ledger_version(), parts)
+    value: Any = cache.get(key)
+    if count(name, value):
+        return value
+
+    value = build()
+    cache.set(key, value, timeout=TIMEOUT)
+    return value
+
+
+async def acached(name: str, build: Callable[[], Awaitable], *parts: str) -> Any:
+    """Async version of ``cached``, awaiting ``build`` on a miss."""
+    key: str = cache_key(name, await aledger_version(), parts)
+    value: Any = await cache.aget(key)
+    if count(name, value):
+        return value
+
+    value = await build()
+    await cache.aset(key, value, timeout=TIMEOUT)
+    return value
+
+
+def cache_key(name: str, version: int, parts: tuple) -> str:
+    digest: str = hashlib.sha256(":".join(parts).encode()).hexdigest()[:32]
+    return f"tracker:{name}:{version}:{digest}"
+
+
+def count(name: str, value: Any) -> bool:
+    """Counts a hit or a miss for ``name``; returns True for a hit."""
+    hit: bool = value is not None
+    with _counters_lock:
+        (hits if hit else misses)[name] += 1
+    return hit
+
+
+def stats() -> dict:
+    """Returns the hit/miss counters and the current ledger version."""
+    with _counters_lock:
+        return {
+            "ledger_version": ledger_version(),
+            "hits": dict(hits),
+            "misses": dict(misses),
+        }
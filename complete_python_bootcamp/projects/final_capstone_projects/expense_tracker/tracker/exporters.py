@@ -0,0 +1,71 @@
+import csv
+import json
+from datetime import date
+from typing import Iterator
+
+from django.db.models import QuerySet
+
+from .fields import MoneyJSONEncoder
+from .ledger import KINDS, filter_ledger
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def ledger_rows(
+    kind: str,
+    start: date | None = None,
+    end: date | None = None,
+    category: str | None = None,
+) -> Iterator[tuple]:
+    """
+    Yields the ledger rows of ``kind`` matching the filters (see
+    ``ledger.filter_ledger``) as tuples of their columns, in date order.
+
+    Rows are fetched with ``values_list`` (no model instances) and a server-side
+    ``iterator``, so memory use does not depend on the number of rows.
+    """
+    model, columns, _ = KINDS[kind]
+    queryset: QuerySet = filter_ledger(kind, start, end, category)
+    yield from (
+        queryset.order_by("date", model._meta.pk.name)
+        .values_list(*columns)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+class Echo:
+    """A file-like object whose ``write`` returns the line instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_lines(kind: str, rows: Iterator[tuple]) -> Iterator[str]:
+    """
+    Yields a CSV header line followed by one line per row, with amounts in
+    dollars as the importer expects them.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(KINDS[kind][1])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(kind: str, rows: Iterator[tuple]) -> Iterator[str]:
+    """Yields one JSON object per line and row, with amounts in dollars."""
+    columns: tuple = KINDS[kind][1]
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=MoneyJSONEncoder) + "\n"
+
+
+def export(kind: str, file_format: str, **filters) -> Iterator[str]:
+    """
+    Yields the export of ``kind`` rows in ``file_format`` ("csv" or "ndjson"),
+    line by line, as they are read from the database.
+    """
+    lines = csv_lines if file_format == "csv" else ndjson_lines
+    return lines(kind, ledger_rows(kind, **filters))
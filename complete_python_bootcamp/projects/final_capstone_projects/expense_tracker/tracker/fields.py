@@ -0,0 +1,158 @@
+from decimal import Decimal, InvalidOperation
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+CENT = Decimal("0.01")
+
+
+class Money(int):
+    """
+    An amount of money as an integer number of cents.
+
+    Arithmetic between amounts stays in integers (and keeps the Money type), and
+    ``str()`` renders the amount in dollars, e.g. ``str(Money(1250)) == "12.50"``.
+    Being an int, plain JSON encodes it as a number of cents: use
+    MoneyJSONEncoder to write dollars.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dollars(cls, value: Decimal | str | float) -> "Money":
+        """
+        Converts a dollar amount to Money.
+
+        Raises:
+            ValueError: If the value is not a number or has fractional cents.
+        """
+        try:
+            dollars = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"{value!r} is not an amount of money.") from None
+        if not dollars.is_finite() or dollars != dollars.quantize(CENT):
+            raise ValueError(f"{value!r} is not a whole number of cents.")
+        return cls(dollars * 100)
+
+    @property
+    def dollars(self) -> Decimal:
+        return Decimal(int(self)).scaleb(-2)
+
+    def __str__(self) -> str:
+        dollars, cents = divmod(abs(int(self)), 100)
+        return f"{'-' if self < 0 else ''}{dollars}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money({int(self)})"
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Money(int(other) - int(self))
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) * int(other))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money(-int(self))
+
+    def __abs__(self):
+        return Money(abs(int(self)))
+
+
+def in_dollars(data):
+    """
+    ``data`` with every Money in it, down through dicts, lists and tuples,
+    replaced by its dollar string.
+    """
+    if isinstance(data, Money):
+        return str(data)
+    if isinstance(data, dict):
+        return {key: in_dollars(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [in_dollars(value) for value in data]
+    return data
+
+
+class MoneyJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder writing Money in dollars, as a string like ``"12.50"``
+    (the way it writes Decimals), instead of the int of cents.
+    """
+
+    def iterencode(self, o, _one_shot=False):
+        return super().iterencode(in_dollars(o), _one_shot)
+
+
+class MoneyFormField(forms.DecimalField):
+    """Dollar input (two decimal places) for a MoneyField."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("decimal_places", 2)
+        super().__init__(**kwargs)
+
+    def prepare_value(self, value):
+        if isinstance(value, Money):
+            return value.dollars
+        return super().prepare_value(value)
+
+
+class MoneyField(models.BigIntegerField):
+    """
+    A money amount stored as integer cents, so sums are done on integers in SQL
+    and Python code gets Money values.
+
+    Assigned values are interpreted by type: ints (including Money) are cents,
+    while Decimals, floats and strings - what forms and imported files
+    provide - are dollars.
+    """
+
+    description = "Amount of money in integer cents"
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else Money(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Money):
+            return value
+        if isinstance(value, bool):
+            raise ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value}
+            )
+        if isinstance(value, int):
+            return Money(value)
+        try:
+            return Money.from_dollars(value)
+        except ValueError:
+            raise ValidationError(
+                "“%(value)s” is not a valid amount of money.",
+                code="invalid",
+                params={"value": value},
+            )
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or hasattr(value, "resolve_expression"):
+            return value
+        return int(self.to_python(value))
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"form_class": MoneyFormField, **kwargs})
@@ -1,5 +1,7 @@
 from .models import Expenses
 from django import forms
+from . import search
+from .ledger import LedgerFilter
 from .models import Income
 
 
@@ -13,3 +15,65 @@ class IncomeForm(forms.ModelForm):
     class Meta:
         model = Income
         fields = ["source", "amount", "date"]
+
+
+class LedgerImportForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=[("csv", "CSV"), ("ofx", "OFX")])
+    kind = forms.ChoiceField(
+        choices=[("", "From the file"), ("expense", "Expenses"), ("income", "Income")],
+        required=False,
+    )
+
+
+class LedgerFilterForm(forms.Form):
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    category = forms.CharField(max_length=100, required=False)
+
+
+class DashboardFilterForm(LedgerFilterForm):
+    start = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    end = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    category = forms.ChoiceField(
+        choices=[("", "All categories"), *Expenses.categories], required=False
+    )
+    source = forms.CharField(
+        max_length=100,
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "Income source"}),
+    )
+
+    def ledger_filter(self) -> LedgerFilter:
+        """The filters from the bound data, leaving out any invalid field."""
+        self.is_valid()
+        data: dict = self.cleaned_data
+        return LedgerFilter(
+            start=data.get("start"),
+            end=data.get("end"),
+            category=data.get("category") or None,
+            source=data.get("source") or None,
+        )
+
+
+class LedgerPageForm(LedgerFilterForm):
+    after = forms.CharField(required=False)
+    before = forms.CharField(required=False)
+    limit = forms.IntegerField(min_value=1, max_value=100, required=False)
+
+
+class SearchForm(forms.Form):
+    q = forms.CharField(max_length=200)
+    limit = forms.IntegerField(min_value=1, max_value=100, required=False)
+    window = forms.IntegerField(
+        min_value=1, max_value=search.MAX_WINDOW, required=False
+    )
+
+
+class AnalyticsForm(forms.Form):
+    months = forms.IntegerField(min_value=1, max_value=120, required=False)
+    horizon = forms.IntegerField(min_value=1, max_value=24, required=False)
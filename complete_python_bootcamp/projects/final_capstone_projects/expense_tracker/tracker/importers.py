@@ -0,0 +1,281 @@
+import codecs
+import csv
+import io
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Iterable, Iterator, TextIO
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+
+from . import caching, rollups
+from .forms import ExpensesForm, IncomeForm
+from .models import Expenses, Income
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+# The model and the columns accepted for each kind of ledger row; the same
+# fields a user fills in through ExpensesForm / IncomeForm.
+KINDS = {
+    "expense": (Expenses, ExpensesForm.Meta.fields),
+    "income": (Income, IncomeForm.Meta.fields),
+}
+FORMATS = ("csv", "ofx")
+
+# A parsed row: (row number in the file, kind or None, raw column values).
+Row = tuple[int, str | None, dict]
+
+
+class MalformedFile(ValueError):
+    """A file that cannot be read from ``row`` on: not UTF-8, or not CSV."""
+
+    def __init__(self, row: int, error: Exception):
+        super().__init__(f"Cannot read the file from row {row} on: {error}")
+        self.row = row
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import: how many rows were written or rejected, and how fast."""
+
+    created: int = 0
+    rejected: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+    # The row the file could not be read from, if it stopped the import.
+    failure: dict | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        total: int = self.created + self.rejected
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, row: int, message) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "failure": self.failure,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def decode(file: BinaryIO, file_format: str) -> TextIO | Iterator[str]:
+    """
+    Decodes a binary file as UTF-8 for ``import_file``. CSV files are decoded
+    a line at a time, so a byte that is not UTF-8 is reported on its own line
+    rather than at the start of the block it was read in.
+    """
+    if file_format == "csv":
+        return codecs.iterdecode(File(file), "utf-8-sig")
+    return io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+
+def read_csv(stream: Iterable[str]) -> Iterator[Row]:
+    """
+    Yields the rows of a CSV file with a header line.
+
+    The columns are the form field names of the row's kind (e.g.
+    ``name,expense,category,date``). An optional ``kind`` column allows
+    expenses and incomes to be mixed in one file.
+
+    Raises:
+        MalformedFile: At the first line that is not UTF-8 or not valid CSV.
+    """
+    lines_read: int = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal lines_read
+        for lines_read, line in enumerate(stream, 1):
+            yield line
+
+    reader = csv.DictReader(lines())
+    try:
+        for values in reader:
+            kind: str | None = values.pop("kind", None) or None
+            yield reader.line_num, kind, values
+    except UnicodeDecodeError as error:
+        # Raised while reading the next line, before it is counted.
+        raise MalformedFile(lines_read + 1, error) from error
+    except csv.Error as error:
+        raise MalformedFile(lines_read, error) from error
+
+
+def ofx_elements(stream: TextIO, chunk_size: int = 64 * 1024) -> Iterator[tuple]:
+    """
+    Yields the (tag, text) elements of an OFX document, reading it in chunks.
+
+    Works for both SGML (OFX 1.x, unclosed tags) and XML (OFX 2.x) files,
+    including files with no line breaks at all.
+    """
+    buffer: str = ""
+    while chunk := stream.read(chunk_size):
+        buffer += chunk
+        *parts, buffer = buffer.split("<")
+        for part in parts:
+            tag, _, text = part.partition(">")
+            yield tag.strip().upper(), text.strip()
+    tag, _, text = buffer.partition(">")
+    yield tag.strip().upper(), text.strip()
+
+
+def read_ofx(stream: TextIO) -> Iterator[Row]:
+    """
+    Yields one row per OFX ``<STMTTRN>`` transaction.
+
+    Debits become expenses (category "Other") and credits become incomes.
+
+    Raises:
+        MalformedFile: At the first transaction that is not UTF-8.
+    """
+    number: int = 0
+    transaction_fields: dict | None = None
+    try:
+        for tag, text in ofx_elements(stream):
+            if tag == "STMTTRN":
+                transaction_fields = {}
+            elif tag == "/STMTTRN" and transaction_fields is not None:
+                number += 1
+                yield number, *ofx_row(transaction_fields)
+                transaction_fields = None
+            elif transaction_fields is not None and not tag.startswith("/"):
+                transaction_fields[tag] = text
+    except UnicodeDecodeError as error:
+        raise MalformedFile(number + 1, error) from error
+
+
+def ofx_row(transaction_fields: dict) -> tuple[str, dict]:
+    name: str = transaction_fields.get("NAME") or transaction_fields.get("MEMO", "")
+    posted: str = transaction_fields.get("DTPOSTED", "")
+    day: str = f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if posted else ""
+    raw_amount: str = transaction_fields.get("TRNAMT", "")
+    try:
+        amount = Decimal(raw_amount)
+    except InvalidOperation:
+        # Let the model validation report the bad amount.
+        return "expense", {"name": name, "expense": raw_amount, "date": day}
+
+    if amount < 0:
+        return "expense", {
+            "name": name,
+            "expense": str(-amount),
+            "category": "Other",
+            "date": day,
+        }
+    return "income", {"source": name, "amount": str(amount), "date": day}
+
+
+def build(kind: str | None, values: dict) -> Expenses | Income:
+    """
+    Builds and validates a ledger instance from raw column values.
+
+    Raises:
+        ValidationError: If the kind is unknown or a value breaks the model's
+            field validators (the same rules the forms apply).
+    """
+    if kind not in KINDS:
+        raise ValidationError(f"Unknown kind {kind!r}, expected one of {list(KINDS)}.")
+    model, fields = KINDS[kind]
+    instance = model(
+        **{name: values[name] for name in fields if values.get(name) not in (None, "")}
+    )
+    instance.full_clean(validate_unique=False, validate_constraints=False)
+    return instance
+
+
+def batches(rows: Iterable[Row], size: int, report: ImportReport) -> Iterator[list]:
+    """
+    Yields ``rows`` in lists of ``size``. If the file cannot be read to the
+    end, the rows read before the failing one are yielded, and the failure
+    is recorded in ``report``.
+    """
+    batch: list = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    except MalformedFile as error:
+        report.failure = {"row": error.row, "error": str(error)}
+    if batch:
+        yield batch
+
+
+def import_rows(
+    rows: Iterable[Row], kind: str | None = None, batch_size: int = BATCH_SIZE
+) -> ImportReport:
+    """
+    Validates rows and writes the valid ones with ``bulk_create``, one
+    transaction per batch, keeping the rollups up to date.
+
+    Only one batch is held in memory at a time. Rows without a kind of their
+    own use ``kind``. A file that cannot be read to the end is imported up to
+    the failing row, which the report's ``failure`` gives.
+    """
+    report = ImportReport()
+    started: float = time.perf_counter()
+
+    for batch in batches(rows, batch_size, report):
+        valid: dict = {model: [] for model, _ in KINDS.values()}
+        for number, row_kind, values in batch:
+            try:
+                instance = build(row_kind or kind, values)
+            except ValidationError as error:
+                report.reject(
+                    number,
+                    (
+                        error.message_dict
+                        if hasattr(error, "error_dict")
+                        else error.messages
+                    ),
+                )
+                continue
+            valid[type(instance)].append(instance)
+
+        with transaction.atomic():
+            for model, instances in valid.items():
+                if instances:
+                    model.objects.bulk_create(instances)
+                    report.created += len(instances)
+            rollups.apply(
+                added=[
+                    rollups.entry_for(instance)
+                    for instances in valid.values()
+                    for instance in instances
+                ]
+            )
+
+    if report.created:
+        transaction.on_commit(caching.bump_ledger_version)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def import_file(
+    stream: TextIO | Iterable[str],
+    file_format: str,
+    kind: str | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> ImportReport:
+    """
+    Imports a CSV or OFX file, streamed from ``stream``.
+
+    Parameters:
+        stream (TextIO | Iterable[str]): The file, opened in text mode or
+            decoded by ``decode``.
+        file_format (str): "csv" or "ofx".
+        kind (str | None): "expense" or "income" for CSV rows without a kind column.
+        batch_size (int): Rows validated and written per transaction.
+    """
+    reader = read_ofx if file_format == "ofx" else read_csv
+    return import_rows(reader(stream), kind=kind, batch_size=batch_size)
@@ -0,0 +1,81 @@
+from dataclasses import astuple, dataclass
+from datetime import date
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from .models import Expenses, Income
+
+# For each kind of ledger row: the model, its public columns (used by the
+# exports and the API, and matching the form field names) and the column the
+# category filter applies to.
+KINDS = {
+    "expense": (
+        Expenses,
+        ("expense_id", "name", "expense", "category", "date"),
+        "category",
+    ),
+    "income": (Income, ("income_id", "source", "amount", "date"), "source"),
+}
+
+
+def filter_ledger(
+    kind: str,
+    start: date | None = None,
+    end: date | None = None,
+    category: str | None = None,
+) -> QuerySet:
+    """
+    Returns the expenses or incomes matching the optional filters.
+
+    Parameters:
+        kind (str): "expense" or "income".
+        start (date | None): Only rows on or after this date.
+        end (date | None): Only rows on or before this date.
+        category (str | None): Only expenses of this category, or incomes from
+            this source.
+    """
+    model, _, category_field = KINDS[kind]
+    queryset: QuerySet = model.objects.all()
+    if start:
+        queryset = queryset.filter(date__gte=start)
+    if end:
+        queryset = queryset.filter(date__lte=end)
+    if category:
+        queryset = queryset.filter(**{category_field: category})
+    return queryset
+
+
+@dataclass(frozen=True)
+class LedgerFilter:
+    """
+    The dashboard filters: a date range (inclusive), an expense category and an
+    income source. Empty fields do not filter.
+    """
+
+    start: date | None = None
+    end: date | None = None
+    category: str | None = None
+    source: str | None = None
+
+    def expenses(self) -> QuerySet:
+        return filter_ledger("expense", self.start, self.end, self.category)
+
+    def incomes(self) -> QuerySet:
+        return filter_ledger("income", self.start, self.end, self.source)
+
+    def key_parts(self) -> tuple[str, ...]:
+        """The filters as cache key parts."""
+        return tuple(str(value or "") for value in astuple(self))
+
+
+def insert_sql(model, fields: tuple) -> str:
+    """An INSERT statement for ``fields`` of ``model``, one row per parameter set."""
+    quote = connection.ops.quote_name
+    columns: str = ", ".join(
+        quote(model._meta.get_field(name).column) for name in fields
+    )
+    placeholders: str = ", ".join(["%s"] * len(fields))
+    return (
+        f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+    )
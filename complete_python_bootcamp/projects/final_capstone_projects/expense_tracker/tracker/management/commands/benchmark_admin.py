@@ -0,0 +1,115 @@
+import statistics
+import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from tracker import rollups
+from tracker.benchmarking import benchmark_database, seed_ledger
+from tracker.models import Expenses, Income
+
+
+class LegacyExpensesAdmin(admin.ModelAdmin):
+    """ExpensesAdmin as it was before the large-table settings, for comparison."""
+
+    list_display = ["expense_id", "name", "category", "date", "expense"]
+    search_fields = ["name", "category"]
+    list_filter = ["category", "expense", "date"]
+    ordering = ["expense"]
+
+
+class LegacyIncomeAdmin(admin.ModelAdmin):
+    """IncomeAdmin as it was before the large-table settings, for comparison."""
+
+    list_display = ["income_id", "source", "amount", "date"]
+    search_fields = ["income_id", "source", "amount", "date"]
+    list_filter = ["source", "amount", "date"]
+    ordering = ["amount", "date"]
+
+
+# (model, label, query string for the legacy admin, query string for the
+# current one, if it differs). Both select the same rows, except that searches
+# now match name prefixes rather than substrings.
+SCENARIOS = [
+    (Expenses, "expenses", "", ""),
+    (Expenses, "expenses by category", "category__exact=Groceries", None),
+    (
+        Expenses,
+        "expenses $100-$1,000",
+        "expense__gte=10000&expense__lt=100000",
+        "amount_range=100-1000",
+    ),
+    (Expenses, "expenses this year", "date__gte=2024-01-01&date__lt=2025-01-01", None),
+    (Expenses, "expenses search", "q=%22Expense 01234%22", None),
+    (Income, "income", "", ""),
+    (Income, "income by source", "source=Bonus", None),
+    (Income, "income search", "q=Free", None),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the admin changelists of the ledger tables with the former "
+        "settings (distinct-value filters, substring search, full counts) and the "
+        "current large-table settings. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Requests per measurement."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['rows']:,} expenses...")
+            seed_ledger(options["rows"], options["rows"] // 10)
+            rollups.rebuild()
+            self.run(options["repeat"])
+
+    def run(self, repeat: int) -> None:
+        user = User.objects.create_superuser("benchmark")
+        legacy_site = admin.AdminSite(name="legacy")
+        legacy = {
+            Expenses: LegacyExpensesAdmin(Expenses, legacy_site),
+            Income: LegacyIncomeAdmin(Income, legacy_site),
+        }
+
+        self.stdout.write(
+            f"{'changelist':<24} {'before':>10} {'queries':>7} "
+            f"{'after':>10} {'queries':>7} {'speedup':>8}"
+        )
+        for model, label, legacy_query, query in SCENARIOS:
+            before = self.measure(legacy[model], legacy_query, user, repeat)
+            after = self.measure(
+                admin.site._registry[model],
+                legacy_query if query is None else query,
+                user,
+                repeat,
+            )
+            self.stdout.write(
+                f"{label:<24} {before[0]:>8.1f}ms {before[1]:>7} "
+                f"{after[0]:>8.1f}ms {after[1]:>7} {before[0] / after[0]:>7.1f}x"
+            )
+
+    @staticmethod
+    def measure(
+        model_admin: admin.ModelAdmin, query: str, user: User, repeat: int
+    ) -> tuple[float, int]:
+        """
+        The median time in milliseconds to build and render the changelist
+        of ``model_admin`` for ``query``, and the queries it ran.
+        """
+        timings: list = []
+        for _ in range(repeat):
+            request = RequestFactory().get(f"/?{query}")
+            request.user = user
+            with CaptureQueriesContext(connection) as context:
+                started: float = time.perf_counter()
+                model_admin.changelist_view(request).render()
+                timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), len(context.captured_queries)
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from tracker import rollups
+from tracker.benchmarking import (
+    UNCACHED,
+    LoadResult,
+    benchmark_database,
+    run_asgi_load,
+    run_wsgi_load,
+    seed_ledger,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput and latency of the dashboard and summary API served "
+        "through the WSGI handler (sync views, threads) and the ASGI handler "
+        "(async views, one event loop). Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="Keep the dashboard cache enabled (by default every request "
+            "hits the database).",
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seed_ledger(options["rows"], options["rows"] // 10)
+            rollups.rebuild()
+            if options["cached"]:
+                self.run(options["requests"], options["concurrency"])
+            else:
+                with override_settings(CACHES=UNCACHED):
+                    self.run(options["requests"], options["concurrency"])
+
+    def run(self, requests: int, concurrency: int) -> None:
+        self.stdout.write(f"{'path':<28} {'req/s':>8} {'p50':>9} {'p99':>9}")
+        for label, url, load in (
+            ("dashboard, WSGI (sync)", reverse("home"), run_wsgi_load),
+            ("dashboard, ASGI (async)", reverse("home_async"), run_asgi_load),
+            ("summary API, WSGI", reverse("api_summary"), run_wsgi_load),
+            ("summary API, ASGI", reverse("api_summary"), run_asgi_load),
+        ):
+            result: LoadResult = load(url, requests, concurrency)
+            self.stdout.write(
+                f"{label:<28} {result.throughput:>8.1f} "
+                f"{result.percentile(50):>7.1f}ms {result.percentile(99):>7.1f}ms"
+            )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from tracker import rollups
+from tracker.benchmarking import benchmark_database, seed_ledger, time_request
+from tracker.models import Expenses, Income
+from tracker.pagination import PAGE_SIZE, encode_cursor
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the render time of the paginated listings as the ledger grows. "
+        "Runs against a throwaway test database, never the real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1_000, 10_000, 100_000],
+            help="Ledger sizes to measure, e.g. --rows 1000 1000000 10000000.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Requests per measurement."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.run(sorted(options["rows"]), options["repeat"])
+
+    def run(self, sizes: list, repeat: int) -> None:
+        client = Client()
+        self.stdout.write(
+            f"{'rows':>12} {'home':>10} {'home (deep)':>12} {'by name':>10}"
+        )
+        seeded: int = 0
+        for size in sizes:
+            seed_ledger(size - seeded, (size - seeded) // 10, seed=size)
+            seeded = size
+            rollups.rebuild()
+
+            # A cursor pointing near the end of the listing, to show that deep
+            # pages cost the same as the first one.
+            deep_row = Expenses.objects.order_by("-date", "-expense_id").values_list(
+                "date", "expense_id"
+            )[PAGE_SIZE * 2]
+            deep_income = Income.objects.order_by("-date", "-income_id").values_list(
+                "date", "income_id"
+            )[min(PAGE_SIZE * 2, Income.objects.count() - 1)]
+            deep_url: str = (
+                f"{reverse('home')}?expenses_after={encode_cursor(deep_row)}"
+                f"&incomes_after={encode_cursor(deep_income)}"
+            )
+
+            timings = (
+                time_request(client, reverse("home"), repeat),
+                time_request(client, deep_url, repeat),
+                time_request(client, reverse("expenses_list"), repeat),
+            )
+            self.stdout.write(
+                f"{size:>12,} {timings[0]:>8.1f}ms {timings[1]:>10.1f}ms "
+                f"{timings[2]:>8.1f}ms"
+            )
@@ -0,0 +1,85 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tracker.benchmarking import benchmark_database, seed_ledger
+from tracker.fields import Money
+
+CENT = Decimal("0.01")
+
+
+def median_ms(run, repeat: int) -> float:
+    timings: list = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares aggregating amounts stored as integer cents with the previous "
+        "DECIMAL(10, 2) columns, in SQL and in Python. Runs against a throwaway "
+        "test database, never the real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=200_000, help="Income rows to aggregate."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per measurement."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.run(options["rows"], options["repeat"])
+
+    def run(self, rows: int, repeat: int) -> None:
+        seed_ledger(0, rows)
+        with connection.cursor() as cursor:
+            # The amounts as they were stored before the switch to cents.
+            cursor.execute(
+                "CREATE TEMPORARY TABLE legacy_income AS "
+                "SELECT CAST(amount AS REAL) / 100 AS amount FROM tracker_income"
+            )
+
+        def legacy_sql_sum() -> Decimal:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT SUM(amount) FROM legacy_income")
+                return Decimal(str(cursor.fetchone()[0])).quantize(CENT)
+
+        def legacy_python_sum() -> Decimal:
+            # What a DecimalField does to every row it reads.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT amount FROM legacy_income")
+                return sum(Decimal(repr(amount)).quantize(CENT) for (amount,) in cursor)
+
+        def cents_sql_sum() -> Money:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT SUM(amount) FROM tracker_income")
+                return Money(cursor.fetchone()[0])
+
+        def cents_python_sum() -> Money:
+            # What a MoneyField does to every row it reads.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT amount FROM tracker_income")
+                return sum(Money(amount) for (amount,) in cursor)
+
+        self.stdout.write(f"{rows:,} rows, median of {repeat} runs")
+        self.stdout.write(f"{'':>12} {'decimal':>12} {'cents':>12}")
+        for label, before, after in (
+            ("SQL SUM", legacy_sql_sum, cents_sql_sum),
+            ("Python sum", legacy_python_sum, cents_python_sum),
+        ):
+            self.stdout.write(
+                f"{label:>12} {median_ms(before, repeat):>10.1f}ms "
+                f"{median_ms(after, repeat):>10.1f}ms"
+            )
+        self.stdout.write(
+            f"Totals: {legacy_sql_sum()} (decimal) vs {cents_sql_sum()} (cents)"
+        )
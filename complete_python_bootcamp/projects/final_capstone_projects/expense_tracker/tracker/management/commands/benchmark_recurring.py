@@ -0,0 +1,53 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from tracker import recurring
+from tracker.benchmarking import benchmark_database
+from tracker.models import Expenses, RecurringRule
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures back-filling years of occurrences for many recurring rules, and "
+        "the cost of a repeated (idempotent) run. Runs against a throwaway test "
+        "database, never the real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rules", type=int, default=1_000)
+        parser.add_argument("--years", type=int, default=10)
+        parser.add_argument("--batch-size", type=int, default=recurring.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.run(options["rules"], options["years"], options["batch_size"])
+
+    def run(self, rules: int, years: int, batch_size: int) -> None:
+        rng = random.Random(0)
+        until: date = date.today()
+        start: date = until - timedelta(days=365 * years)
+        categories: list = [value for value, _ in Expenses.categories]
+        RecurringRule.objects.bulk_create(
+            RecurringRule(
+                kind=rng.choice([RecurringRule.EXPENSE, RecurringRule.INCOME]),
+                # Incomes are rolled up per source, so use a realistic number
+                # of distinct names rather than one per rule.
+                name=f"Recurring {index % 50}",
+                amount=rng.randint(100, 500_000),
+                category=rng.choice(categories),
+                frequency=rng.choice(
+                    [RecurringRule.WEEKLY, RecurringRule.MONTHLY, RecurringRule.YEARLY]
+                ),
+                start_date=start + timedelta(days=rng.randrange(28)),
+            )
+            for index in range(rules)
+        )
+
+        for label in ("back-fill", "repeat run"):
+            report = recurring.materialize(until, batch_size=batch_size)
+            self.stdout.write(
+                f"{label:<12} {report.created:>10,} rows from {report.rules:,} rules "
+                f"in {report.elapsed:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+            )
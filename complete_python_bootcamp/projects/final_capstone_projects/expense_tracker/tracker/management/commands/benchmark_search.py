@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from tracker import search
+from tracker.benchmarking import benchmark_database, seed_ledger
+from tracker.ledger import KINDS
+
+# (kind, text): a word found in every expense, the same with a rare prefix, an
+# exact word, a prefix matching 1% of the expenses, and words matching every
+# income from a source.
+QUERIES = [
+    ("expense", "Expense"),
+    ("expense", "Expense 01234"),
+    ("expense", "012345"),
+    ("expense", "99"),
+    ("income", "Bonus"),
+    ("income", "free"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the former substring search (icontains, a LIKE '%...%' scan) "
+        "with the FTS5 search, ranked among all the matches or the newest ones, "
+        "and measures what keeping the full-text indexes in sync adds to "
+        "inserts. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Searches per measurement."
+        )
+
+    def handle(self, *args, **options):
+        rows: int = options["rows"]
+        with benchmark_database():
+            self.stdout.write(f"Seeding {rows:,} expenses...")
+            # First without the full-text triggers, rolled back afterwards
+            # (SQLite rolls back the DROP TRIGGERs too).
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("DROP TRIGGER tracker_expenses_fts_insert")
+                    cursor.execute("DROP TRIGGER tracker_income_fts_insert")
+                plain: float = self.seed(rows)
+                transaction.set_rollback(True)
+            indexed: float = self.seed(rows)
+            self.stdout.write(
+                f"  without the full-text triggers: {plain:>6.1f}s\n"
+                f"  with them:                      {indexed:>6.1f}s"
+            )
+            self.run(options["repeat"])
+
+    @staticmethod
+    def seed(rows: int) -> float:
+        """Seeds ``rows`` expenses and a tenth as many incomes, in seconds."""
+        started: float = time.perf_counter()
+        seed_ledger(rows, rows // 10)
+        return time.perf_counter() - started
+
+    def run(self, repeat: int) -> None:
+        self.stdout.write(
+            f"{'search':<24} {'matches':>8} {'icontains':>10} {'fts5':>10} "
+            f"{'speedup':>8} {'window':>10}"
+        )
+        for kind, text in QUERIES:
+            model, columns, _ = KINDS[kind]
+            column: str = search.SEARCH_COLUMNS[kind]
+            # Every word as a substring, as the admin's search did.
+            legacy = model.objects.filter(
+                *[Q(**{f"{column}__icontains": word}) for word in text.split()]
+            ).values(*columns)
+            before: float = self.median(lambda: list(legacy[: search.RESULTS]), repeat)
+            after: float = self.median(lambda: search.search(kind, text), repeat)
+            # Ranking the newest MATCH_WINDOW matches rather than every one.
+            windowed: float = self.median(
+                lambda: search.search(kind, text, window=search.MATCH_WINDOW), repeat
+            )
+            matches: int = len(search.matching_ids(kind, text, limit=10**9))
+            self.stdout.write(
+                f"{kind + ' ' + repr(text):<24} {matches:>8,} {before:>8.1f}ms "
+                f"{after:>8.1f}ms {before / after:>7.1f}x {windowed:>8.1f}ms"
+            )
+
+    @staticmethod
+    def median(run, repeat: int) -> float:
+        """The median time in milliseconds of ``repeat`` calls of ``run``."""
+        timings: list = []
+        for _ in range(repeat):
+            started: float = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.benchmarking import LoadResult, reads_during_writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how long dashboard reads stall while expenses are bulk "
+        "inserted, with SQLite's default settings and with the tuned profile "
+        "from settings.DATABASES. Runs against throwaway database files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500_000)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Rows inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'profile':<10} {'reads':>8} {'p50':>9} {'p99':>9} {'max':>9} "
+            f"{'locked':>7} {'elapsed':>8}"
+        )
+        for name, profile in (
+            ("default", {}),
+            ("tuned", settings.DATABASES["default"].get("OPTIONS", {})),
+        ):
+            with tempfile.TemporaryDirectory() as directory:
+                result, locked = reads_during_writes(
+                    os.path.join(directory, "benchmark.sqlite3"),
+                    profile,
+                    options["rows"],
+                    options["batch_size"],
+                )
+            self.write_result(name, result, locked)
+
+    def write_result(self, name: str, result: LoadResult, locked: int) -> None:
+        self.stdout.write(
+            f"{name:<10} {result.requests:>8} {result.percentile(50):>7.2f}ms "
+            f"{result.percentile(99):>7.2f}ms {max(result.latencies) * 1000:>7.1f}ms "
+            f"{locked:>7} {result.elapsed:>7.2f}s"
+        )
@@ -0,0 +1,122 @@
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.middleware.csrf import get_token
+from django.template import Engine, engines
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker.models import Expenses
+from tracker.views import listing_context
+
+# expense_rows.html as it was before rows shared one delete form, for comparison.
+LEGACY_EXPENSE_ROWS = """
+{% for expense in expenses %}
+  <tr>
+    <td>{{ expense.name }}</td>
+    <td>{{ expense.expense }}</td>
+    <td>{{ expense.category }}</td>
+    <td>{{ expense.date }}</td>
+    <td>
+      <form method="post" action="{% url 'delete_expense' expense.pk %}" style="display:inline;">
+        {% csrf_token %}
+        <button type="submit" class="btn btn-danger btn-sm"
+                onclick="return confirm('Are you sure you want to delete this expense?');">
+          Delete
+        </button>
+      </form>
+    </td>
+  </tr>
+{% endfor %}
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-row cost of rendering the expense listing, with the "
+        "former per-row form, CSRF token and URL reversal against the current "
+        "shared delete form, and the cost of loading a template with and "
+        "without the cached template loader. Needs no database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Renders per measurement."
+        )
+
+    def handle(self, *args, **options):
+        # The test environment allows the "testserver" host of RequestFactory.
+        setup_test_environment()
+        try:
+            self.run(options["rows"], options["repeat"])
+        finally:
+            teardown_test_environment()
+
+    def run(self, rows: int, repeat: int) -> None:
+        request = RequestFactory().get("/")
+        get_token(request)
+        expenses: list = [
+            Expenses(
+                expense_id=index,
+                name=f"Expense {index}",
+                expense=1250,
+                category="Groceries",
+                date=date(2024, 6, 1),
+            )
+            for index in range(1, rows + 1)
+        ]
+        context: dict = listing_context(Page(expenses), "expenses")
+
+        backend = engines.all()[0]
+        legacy = backend.from_string(LEGACY_EXPENSE_ROWS)
+        current = backend.get_template("expense_rows.html")
+        legacy_time: float = self.best(lambda: legacy.render(context, request), repeat)
+        current_time: float = self.best(
+            lambda: current.render(context, request), repeat
+        )
+        self.stdout.write(
+            f"Rendering {rows:,} rows\n"
+            f"  per-row form:       {legacy_time * 1000:>8.1f}ms "
+            f"({legacy_time / rows * 1e6:.1f}us per row)\n"
+            f"  shared delete form: {current_time * 1000:>8.1f}ms "
+            f"({current_time / rows * 1e6:.1f}us per row), "
+            f"{legacy_time / current_time:.1f}x faster"
+        )
+
+        # Loading the dashboard template once per request: parsed from disk
+        # every time, or parsed once and kept by the cached loader.
+        uncached = Engine(
+            dirs=settings.TEMPLATES[0]["DIRS"],
+            loaders=[
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        )
+        cached = backend.engine
+        self.stdout.write("Loading home.html")
+        for label, engine in (("uncached", uncached), ("cached", cached)):
+            elapsed: float = self.best(
+                lambda: [engine.get_template("home.html") for _ in range(100)], repeat
+            )
+            self.stdout.write(f"  {label + ' loader:':<20} {elapsed * 10:>8.3f}ms")
+
+    @staticmethod
+    def best(render, repeat: int) -> float:
+        """The fastest of ``repeat`` runs of ``render``, in seconds."""
+        timings: list = []
+        for _ in range(repeat):
+            started: float = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+
+class Page:
+    """A single page holding every row, with no links to other pages."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.previous_url = self.next_url = None
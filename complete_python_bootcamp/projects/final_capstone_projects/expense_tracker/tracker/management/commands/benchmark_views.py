@@ -0,0 +1,174 @@
+import json
+import platform
+from typing import Callable
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker import rollups
+from tracker.benchmarking import (
+    UNCACHED,
+    Endpoint,
+    benchmark_database,
+    compare_reports,
+    measure_endpoint,
+    seed_ledger,
+)
+from tracker.models import Budget, Expenses
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures latency, throughput, query count and render time of every "
+        "view, admin changelist and API endpoint as the ledger grows, and writes "
+        "a JSON report. With --baseline, fails on query count or time "
+        "regressions. Runs against a throwaway test database, never the real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Numbers of expenses to measure at, e.g. --rows 10000 10000000. "
+            "One income is seeded per ten expenses.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=10, help="Requests per endpoint."
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark-report.json",
+            help="Where to write the JSON report.",
+        )
+        parser.add_argument(
+            "--baseline", help="A previous report to check for regressions."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed slowdown against the baseline, as a fraction "
+            "(default 0.5, i.e. 50%%). Query counts must not grow at all.",
+        )
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="Keep the dashboard cache enabled (by default every request "
+            "hits the database).",
+        )
+
+    def handle(self, *args, **options):
+        baseline: dict | None = None
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+
+        caches: dict = {} if options["cached"] else {"CACHES": UNCACHED}
+        with benchmark_database(), override_settings(TRACKER_METRICS=True, **caches):
+            results: dict = self.run(sorted(options["rows"]), options["repeat"])
+
+        report: dict = {
+            "created": timezone.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": options["repeat"],
+            "cached": options["cached"],
+            "results": results,
+        }
+        with open(options["output"], "w") as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(f"Report written to {options['output']}")
+
+        if baseline is not None:
+            regressions: list = compare_reports(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write("No regressions against the baseline.")
+
+    def run(self, sizes: list, repeat: int) -> dict:
+        # The client is created with metrics on, so every response carries the
+        # Server-Timing header the measurements are read from.
+        client = Client()
+        client.force_login(User.objects.create_superuser("benchmark"))
+        for category, _ in Expenses.categories:
+            Budget.objects.create(category=category, amount=100_000)
+
+        results: dict = {}
+        seeded: int = 0
+        for size in sizes:
+            seed_ledger(size - seeded, (size - seeded) // 10, seed=size)
+            seeded = size
+            rollups.rebuild()
+
+            self.stdout.write(
+                f"\n{size:,} expenses\n"
+                f"{'endpoint':<28} {'median':>9} {'p95':>9} {'req/s':>8} "
+                f"{'queries':>7} {'sql':>9} {'template':>9}"
+            )
+            results[str(size)] = {}
+            for endpoint in self.endpoints(repeat):
+                result: dict = measure_endpoint(client, endpoint, repeat)
+                results[str(size)][endpoint.name] = result
+                self.stdout.write(
+                    f"{endpoint.name:<28} {result['median_ms']:>7.1f}ms "
+                    f"{result['p95_ms']:>7.1f}ms {result['requests_per_second']:>8.1f} "
+                    f"{result['queries']:>7} {result['db_ms']:>7.1f}ms "
+                    f"{result['template_ms']:>7.1f}ms"
+                )
+        return results
+
+    @staticmethod
+    def endpoints(repeat: int) -> list:
+        """The requests to measure; deletes remove a different expense each time."""
+        doomed = iter(
+            Expenses.objects.order_by("pk").values_list("pk", flat=True)[:repeat]
+        )
+
+        def static(name: str, *args) -> Callable[[], str]:
+            url: str = reverse(name, args=args)
+            return lambda: url
+
+        return [
+            Endpoint("home", static("home")),
+            Endpoint("home_async", static("home_async")),
+            Endpoint("expenses_list", static("expenses_list")),
+            Endpoint(
+                "add_expense",
+                static("add_expense"),
+                "post",
+                {
+                    "name": "Benchmark",
+                    "expense": "12.50",
+                    "category": "Groceries",
+                    "date": "2024-06-01",
+                },
+                302,
+            ),
+            Endpoint(
+                "delete_expense",
+                lambda: reverse("delete_expense", args=[next(doomed)]),
+                "post",
+                status=302,
+            ),
+            Endpoint("admin expenses", static("admin:tracker_expenses_changelist")),
+            Endpoint("admin income", static("admin:tracker_income_changelist")),
+            Endpoint(
+                "admin recurring rules",
+                static("admin:tracker_recurringrule_changelist"),
+            ),
+            Endpoint("admin budgets", static("admin:tracker_budget_changelist")),
+            Endpoint("api summary", static("api_summary")),
+            Endpoint("api categories", static("api_categories")),
+            Endpoint("api budgets", static("api_budgets")),
+            Endpoint("api expenses", static("api_expenses")),
+            Endpoint("api income", static("api_income")),
+        ]
@@ -0,0 +1,36 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from tracker import exporters
+
+
+class Command(BaseCommand):
+    help = "Exports the expenses or incomes as CSV or NDJSON, streaming the rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(exporters.KINDS))
+        parser.add_argument("--format", choices=list(exporters.FORMATS), default="csv")
+        parser.add_argument(
+            "--output", help="File to write to; standard output when omitted."
+        )
+        parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument(
+            "--category", help="Only this expense category (or income source)."
+        )
+
+    def handle(self, *args, **options):
+        lines = exporters.export(
+            options["kind"],
+            options["format"],
+            start=options["start"],
+            end=options["end"],
+            category=options["category"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
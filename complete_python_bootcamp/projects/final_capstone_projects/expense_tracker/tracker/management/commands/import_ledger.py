@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import importers
+
+
+class Command(BaseCommand):
+    help = "Bulk imports expenses and incomes from a CSV or OFX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="The CSV or OFX file to import.")
+        parser.add_argument(
+            "--format",
+            choices=importers.FORMATS,
+            help="File format; guessed from the file extension when omitted.",
+        )
+        parser.add_argument(
+            "--kind",
+            choices=list(importers.KINDS),
+            help="Kind of the CSV rows, for files without a 'kind' column.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importers.BATCH_SIZE,
+            help="Rows written per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        path: Path = options["path"]
+        file_format: str = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in importers.FORMATS:
+            raise CommandError(
+                f"Cannot guess the format of {path}, pass --format csv or --format ofx."
+            )
+
+        try:
+            with path.open("rb") as file:
+                report = importers.import_file(
+                    importers.decode(file, file_format),
+                    file_format,
+                    kind=options["kind"],
+                    batch_size=options["batch_size"],
+                )
+        except OSError as exc:
+            raise CommandError(exc) from exc
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {error['error']}")
+        if report.rejected > len(report.errors):
+            self.stderr.write(
+                f"... and {report.rejected - len(report.errors)} more rejected rows."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} rows, rejected {report.rejected} "
+                f"in {report.elapsed:.2f}s ({report.rows_per_second:,.0f} rows/s)."
+            )
+        )
+        if report.failure:
+            raise CommandError(report.failure["error"])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from tracker import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily and monthly rollup tables from the raw ledger."
+
+    def handle(self, *args, **options):
+        daily, monthly = rollups.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {daily} daily and {monthly} monthly rollup rows."
+            )
+        )
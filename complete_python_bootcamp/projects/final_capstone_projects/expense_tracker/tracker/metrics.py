@@ -0,0 +1,246 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestTimings:
+    """What one request spent, filled in while it is handled."""
+
+    queries: int = 0
+    db: float = 0.0
+    template: float = 0.0
+    # Set while a template renders, so templates rendered inside it (e.g. by
+    # the admin's tags) are not counted twice.
+    rendering: bool = False
+
+    def server_timing(self, total: float) -> str:
+        """The timings as a Server-Timing header value, in milliseconds."""
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries", '
+            f"tpl;dur={self.template * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+
+def parse_server_timing(header: str) -> dict[str, tuple[float, str]]:
+    """
+    Parses a Server-Timing header into ``{metric: (milliseconds, description)}``.
+    """
+    timings: dict = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        values: dict = dict(param.split("=", 1) for param in params)
+        timings[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return timings
+
+
+# The timings of the request being handled. Context variables follow the
+# request into sync_to_async threads, so async views are measured too.
+current: ContextVar[RequestTimings | None] = ContextVar("tracker_metrics", default=None)
+
+
+class Histogram:
+    """Request latency per view, with cumulative Prometheus-style buckets."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views: dict[str, dict] = {}
+
+    def observe(self, view: str, latency: float, timings: RequestTimings) -> None:
+        with self.lock:
+            series: dict = self.views.setdefault(
+                view,
+                {
+                    "buckets": [0] * (len(BUCKETS) + 1),
+                    "count": 0,
+                    "latency": 0.0,
+                    "queries": 0,
+                    "db": 0.0,
+                    "template": 0.0,
+                },
+            )
+            series["buckets"][bisect_left(BUCKETS, latency)] += 1
+            series["count"] += 1
+            series["latency"] += latency
+            series["queries"] += timings.queries
+            series["db"] += timings.db
+            series["template"] += timings.template
+
+    def clear(self) -> None:
+        with self.lock:
+            self.views.clear()
+
+    def exposition(self) -> str:
+        """The collected metrics in the Prometheus text exposition format."""
+        with self.lock:
+            views: dict = {view: dict(series) for view, series in self.views.items()}
+
+        lines: list[str] = [
+            "# HELP tracker_request_duration_seconds Request latency per view.",
+            "# TYPE tracker_request_duration_seconds histogram",
+        ]
+        for view, series in sorted(views.items()):
+            cumulative: int = 0
+            for bound, observed in zip(BUCKETS + ("+Inf",), series["buckets"]):
+                cumulative += observed
+                lines.append(
+                    f'tracker_request_duration_seconds_bucket{{view="{view}",'
+                    f'le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'tracker_request_duration_seconds_sum{{view="{view}"}} '
+                f'{series["latency"]:.6f}'
+            )
+            lines.append(
+                f'tracker_request_duration_seconds_count{{view="{view}"}} '
+                f'{series["count"]}'
+            )
+
+        for name, key, help_text in (
+            ("tracker_db_queries_total", "queries", "SQL queries run per view."),
+            ("tracker_db_duration_seconds_total", "db", "Time spent in SQL per view."),
+            (
+                "tracker_template_duration_seconds_total",
+                "template",
+                "Time spent rendering templates per view.",
+            ),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for view, series in sorted(views.items()):
+                value = series[key]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{name}{{view="{view}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+histogram = Histogram()
+
+
+def record_query(execute: Callable, sql: str, params, many: bool, context: dict):
+    """Database execute wrapper adding each query's time to the request's."""
+    timings: RequestTimings | None = current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started: float = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - started
+        timings.queries += 1
+
+
+def instrument(connection, **kwargs) -> None:
+    """Installs ``record_query`` on a database connection, once."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class MetricsMiddleware:
+    """
+    Records the query count, SQL time, template time and total latency of
+    every request. Adds them to the response as a Server-Timing header and to
+    the per-view histogram served by the ``metrics`` view.
+
+    Enabled with ``TRACKER_METRICS = True``. When it is off, Django drops the
+    middleware at startup and nothing is instrumented, so it costs nothing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        if not getattr(settings, "TRACKER_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        # Connections are per thread: instrument the ones already open here
+        # and every connection opened from now on.
+        for connection in connections.all(initialized_only=True):
+            instrument(connection)
+        connection_created.connect(instrument, dispatch_uid="tracker_metrics")
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current.set(timings)
+        started: float = time.perf_counter()
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, timings, started)
+
+    async def __acall__(self, request: HttpRequest):
+        timings = RequestTimings()
+        token = current.set(timings)
+        started: float = time.perf_counter()
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, timings, started)
+
+    @staticmethod
+    def finish(
+        request: HttpRequest,
+        response: HttpResponse,
+        timings: RequestTimings,
+        started: float,
+    ) -> HttpResponse:
+        latency: float = time.perf_counter() - started
+        match = request.resolver_match
+        histogram.observe(match.view_name if match else "unresolved", latency, timings)
+        response["Server-Timing"] = timings.server_timing(latency)
+        return response
+
+
+class Template(django_backend.Template):
+    """A Django template that adds its render time to the request's timings."""
+
+    def render(self, context=None, request=None) -> str:
+        timings: RequestTimings | None = current.get()
+        if timings is None or timings.rendering:
+            return super().render(context, request)
+        timings.rendering = True
+        started: float = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template += time.perf_counter() - started
+            timings.rendering = False
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """
+    The Django template backend, returning templates that report their render
+    time to MetricsMiddleware.
+    """
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
@@ -0,0 +1,117 @@
+# Generated by Django 5.2 on 2026-10-18 10:39
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_rollups(apps, schema_editor):
+    Expenses = apps.get_model("tracker", "Expenses")
+    Income = apps.get_model("tracker", "Income")
+    DailyRollup = apps.get_model("tracker", "DailyRollup")
+    MonthlyRollup = apps.get_model("tracker", "MonthlyRollup")
+
+    daily = defaultdict(lambda: [Decimal(0), 0])
+    monthly = defaultdict(lambda: [Decimal(0), 0])
+    sources = (
+        ("expense", Expenses.objects.values_list("category", "date"), "expense"),
+        ("income", Income.objects.values_list("source", "date"), "amount"),
+    )
+    for kind, queryset, amount_field in sources:
+        rows = queryset.order_by().annotate(total=Sum(amount_field), count=Count("pk"))
+        for category, day, total, count in rows:
+            for buckets, period in ((daily, day), (monthly, day.replace(day=1))):
+                bucket = buckets[(kind, category, period)]
+                bucket[0] += Decimal(total)
+                bucket[1] += count
+
+    for model, buckets in ((DailyRollup, daily), (MonthlyRollup, monthly)):
+        model.objects.bulk_create(
+            model(kind=kind, category=category, period=period, total=total, count=count)
+            for (kind, category, period), (total, count) in buckets.items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0004_income_alter_expenses_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("expense", "Expense"), ("income", "Income")],
+                        max_length=10,
+                    ),
+                ),
+                ("category", models.CharField(max_length=100)),
+                ("period", models.DateField()),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "category", "period"),
+                        name="unique_daily_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("expense", "Expense"), ("income", "Income")],
+                        max_length=10,
+                    ),
+                ),
+                ("category", models.CharField(max_length=100)),
+                ("period", models.DateField()),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "category", "period"),
+                        name="unique_monthly_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0005_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["date", "expense_id"], name="expenses_date_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["name", "expense_id"], name="expenses_name_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["category", "date"], name="expenses_category_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(fields=["-expense"], name="expenses_expense_desc_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["category", "-expense"], name="expenses_category_expense_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(fields=["date", "income_id"], name="income_date_pk_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                fields=["source", "date"], name="income_source_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                fields=["amount", "date"], name="income_amount_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                fields=["source", "amount", "date"], name="income_source_amount_idx"
+            ),
+        ),
+    ]
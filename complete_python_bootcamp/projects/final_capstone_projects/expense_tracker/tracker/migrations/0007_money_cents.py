@@ -0,0 +1,201 @@
+# Generated by Django 5.2 on 2026-10-18 13:05
+
+from collections import defaultdict
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Cast, Round
+
+import tracker.fields
+
+# Rows converted per UPDATE, so no single statement rewrites the whole table.
+BATCH_SIZE = 10_000
+
+
+def batched_update(model, **values):
+    bounds = model.objects.aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return
+    for start in range(bounds["low"], bounds["high"] + 1, BATCH_SIZE):
+        model.objects.filter(pk__gte=start, pk__lt=start + BATCH_SIZE).update(**values)
+
+
+def to_cents(apps, schema_editor):
+    batched_update(
+        apps.get_model("tracker", "Expenses"), expense_cents=F("expense") * 100
+    )
+    batched_update(
+        apps.get_model("tracker", "Income"),
+        amount_cents=Cast(Round(F("amount") * 100), models.BigIntegerField()),
+    )
+
+
+def to_dollars(apps, schema_editor):
+    batched_update(
+        apps.get_model("tracker", "Expenses"), expense=F("expense_cents") / 100
+    )
+    batched_update(
+        apps.get_model("tracker", "Income"),
+        amount=Cast(F("amount_cents"), models.FloatField()) / 100,
+    )
+
+
+def repopulate_rollups(apps, schema_editor):
+    """Recomputes the rollup totals in cents from the converted ledger."""
+    Expenses = apps.get_model("tracker", "Expenses")
+    Income = apps.get_model("tracker", "Income")
+    DailyRollup = apps.get_model("tracker", "DailyRollup")
+    MonthlyRollup = apps.get_model("tracker", "MonthlyRollup")
+
+    daily = defaultdict(lambda: [0, 0])
+    monthly = defaultdict(lambda: [0, 0])
+    sources = (
+        ("expense", Expenses.objects.values_list("category", "date"), "expense"),
+        ("income", Income.objects.values_list("source", "date"), "amount"),
+    )
+    for kind, queryset, amount_field in sources:
+        rows = queryset.order_by().annotate(total=Sum(amount_field), count=Count("pk"))
+        for category, day, total, count in rows:
+            for buckets, period in ((daily, day), (monthly, day.replace(day=1))):
+                bucket = buckets[(kind, category, period)]
+                bucket[0] += total
+                bucket[1] += count
+
+    for model, buckets in ((DailyRollup, daily), (MonthlyRollup, monthly)):
+        model.objects.all().delete()
+        model.objects.bulk_create(
+            (
+                model(
+                    kind=kind,
+                    category=category,
+                    period=period,
+                    total=total,
+                    count=count,
+                )
+                for (kind, category, period), (total, count) in buckets.items()
+            ),
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0006_ledger_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expenses_expense_desc_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expenses_category_expense_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="income",
+            name="income_amount_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="income",
+            name="income_source_amount_idx",
+        ),
+        migrations.AddField(
+            model_name="expenses",
+            name="expense_cents",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="income",
+            name="amount_cents",
+            field=models.BigIntegerField(null=True),
+        ),
+        # Nullable, so that migrating back can re-add the columns before
+        # to_dollars fills them in.
+        migrations.AlterField(
+            model_name="expenses",
+            name="expense",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="income",
+            name="amount",
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(to_cents, to_dollars),
+        migrations.RemoveField(
+            model_name="expenses",
+            name="expense",
+        ),
+        migrations.RemoveField(
+            model_name="income",
+            name="amount",
+        ),
+        migrations.RenameField(
+            model_name="expenses",
+            old_name="expense_cents",
+            new_name="expense",
+        ),
+        migrations.RenameField(
+            model_name="income",
+            old_name="amount_cents",
+            new_name="amount",
+        ),
+        migrations.AlterField(
+            model_name="expenses",
+            name="expense",
+            field=tracker.fields.MoneyField(
+                validators=[
+                    django.core.validators.MinValueValidator(1, "Invalid value")
+                ]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="income",
+            name="amount",
+            field=tracker.fields.MoneyField(
+                validators=[
+                    django.core.validators.MinValueValidator(
+                        1, "Ensure this value is greater than or equal to 0.01."
+                    )
+                ]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(fields=["-expense"], name="expenses_expense_desc_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["category", "-expense"], name="expenses_category_expense_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                fields=["amount", "date"], name="income_amount_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                fields=["source", "amount", "date"], name="income_source_amount_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailyrollup",
+            name="total",
+            field=tracker.fields.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="monthlyrollup",
+            name="total",
+            field=tracker.fields.MoneyField(default=0),
+        ),
+        # Rollups are derived data: recompute them rather than converting.
+        # Migrating back needs a ``manage.py rebuild_rollups`` afterwards.
+        migrations.RunPython(repopulate_rollups, migrations.RunPython.noop),
+    ]
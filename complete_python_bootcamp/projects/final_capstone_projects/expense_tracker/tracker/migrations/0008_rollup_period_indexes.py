@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0007_money_cents"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dailyrollup",
+            index=models.Index(
+                fields=["period", "kind"], name="dailyrollup_period_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="monthlyrollup",
+            index=models.Index(
+                fields=["period", "kind"], name="monthlyrollup_period_idx"
+            ),
+        ),
+    ]
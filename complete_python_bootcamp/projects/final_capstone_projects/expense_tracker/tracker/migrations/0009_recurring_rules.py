@@ -0,0 +1,115 @@
+# Generated by Django 5.2 on 2026-10-18 10:58
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import tracker.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0008_rollup_period_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringRule",
+            fields=[
+                ("rule_id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("expense", "Expense"), ("income", "Income")],
+                        max_length=10,
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "amount",
+                    tracker.fields.MoneyField(
+                        validators=[
+                            django.core.validators.MinValueValidator(1, "Invalid value")
+                        ]
+                    ),
+                ),
+                (
+                    "category",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Healthcare", "Healthcare"),
+                            ("Education", "Education"),
+                            ("Entertainment", "Entertainment"),
+                            ("Utilities", "Utilities"),
+                            ("Groceries", "Groceries"),
+                            ("Memberships", "Memberships"),
+                            ("Debt", "Debt"),
+                            ("Emergency Fund", "Emergency Fund"),
+                            ("Other", "Other"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("weekly", "Weekly"),
+                            ("monthly", "Monthly"),
+                            ("yearly", "Yearly"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveIntegerField(
+                        default=1,
+                        validators=[django.core.validators.MinValueValidator(1)],
+                    ),
+                ),
+                ("start_date", models.DateField(default=django.utils.timezone.now)),
+                ("end_date", models.DateField(blank=True, null=True)),
+                ("active", models.BooleanField(default=True)),
+                (
+                    "materialized",
+                    models.PositiveIntegerField(default=0, editable=False),
+                ),
+                ("next_date", models.DateField(blank=True, editable=False, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="expenses",
+            name="recurring_rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="tracker.recurringrule",
+            ),
+        ),
+        migrations.AddField(
+            model_name="income",
+            name="recurring_rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="tracker.recurringrule",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="expenses",
+            constraint=models.UniqueConstraint(
+                fields=("recurring_rule", "date"), name="unique_expense_occurrence"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="income",
+            constraint=models.UniqueConstraint(
+                fields=("recurring_rule", "date"), name="unique_income_occurrence"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 11:29
+
+import django.core.validators
+import tracker.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0009_recurring_rules"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Budget",
+            fields=[
+                ("budget_id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("Healthcare", "Healthcare"),
+                            ("Education", "Education"),
+                            ("Entertainment", "Entertainment"),
+                            ("Utilities", "Utilities"),
+                            ("Groceries", "Groceries"),
+                            ("Memberships", "Memberships"),
+                            ("Debt", "Debt"),
+                            ("Emergency Fund", "Emergency Fund"),
+                            ("Other", "Other"),
+                        ],
+                        max_length=50,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "amount",
+                    tracker.fields.MoneyField(
+                        validators=[
+                            django.core.validators.MinValueValidator(1, "Invalid value")
+                        ]
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 11:42
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0010_budgets"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate("name", "NOCASE"),
+                name="expenses_name_nocase_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate("source", "NOCASE"),
+                name="income_source_nocase_idx",
+            ),
+        ),
+    ]
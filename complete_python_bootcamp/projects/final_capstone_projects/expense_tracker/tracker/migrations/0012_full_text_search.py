@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-18 12:05
+
+from django.db import migrations
+
+# (table, primary key, indexed column) of each ledger table.
+LEDGER_TABLES = [
+    ("tracker_expenses", "expense_id", "name"),
+    ("tracker_income", "income_id", "source"),
+]
+
+
+def full_text_index(table, pk, column):
+    """
+    An external-content FTS5 table over ``column`` of ``table`` (it stores
+    only the index, reading the text back from ``table``), the triggers that
+    keep it in sync with every write, including bulk and raw SQL ones, and
+    the statement indexing the existing rows.
+    """
+    fts = f"{table}_fts"
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.{pk}, old.{column});"
+    )
+    insert = f"INSERT INTO {fts}(rowid, {column}) VALUES (new.{pk}, new.{column});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({column}, content='{table}', "
+        f"content_rowid='{pk}', tokenize='unicode61 remove_diacritics 2', "
+        f"prefix='2 3');",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert} END;",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete} END;",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {pk}, {column} ON {table} "
+        f"BEGIN {delete} {insert} END;",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild');",
+    ]
+
+
+def drop_full_text_index(table, pk, column):
+    fts = f"{table}_fts"
+    return [
+        f"DROP TRIGGER {fts}_insert;",
+        f"DROP TRIGGER {fts}_delete;",
+        f"DROP TRIGGER {fts}_update;",
+        f"DROP TABLE {fts};",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0011_nocase_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            full_text_index(*ledger_table),
+            reverse_sql=drop_full_text_index(*ledger_table),
+        )
+        for ledger_table in LEDGER_TABLES
+    ]
@@ -1,12 +1,17 @@
-from decimal import Decimal
-
 from django.db import models
 
 # Create your models here.
+import calendar
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Collate
 from django.utils import timezone
 
+from .fields import MoneyField
+
 
 # Create your models here.
 
@@ -14,10 +19,37 @@ from django.utils import timezone
 class Income(models.Model):
     income_id = models.AutoField(primary_key=True)
     source = models.CharField(max_length=100)  # E.g., "Salary", "Bonus"
-    amount = models.DecimalField(
-        max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal("0.01"))]
+    amount = MoneyField(
+        validators=[
+            MinValueValidator(1, "Ensure this value is greater than or equal to 0.01.")
+        ]
     )
     date = models.DateField(default=timezone.now)
+    recurring_rule = models.ForeignKey(
+        "RecurringRule", null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        constraints = [
+            # One occurrence per rule and date, so materializing is idempotent.
+            models.UniqueConstraint(
+                fields=["recurring_rule", "date"], name="unique_income_occurrence"
+            )
+        ]
+        indexes = [
+            # Keyset pagination of the dashboard listing.
+            models.Index(fields=["date", "income_id"], name="income_date_pk_idx"),
+            # Admin filters and ordering.
+            models.Index(fields=["source", "date"], name="income_source_date_idx"),
+            models.Index(fields=["amount", "date"], name="income_amount_date_idx"),
+            # The admin's ordering within a source, so a page of one source
+            # is read in order instead of sorting all of its rows.
+            models.Index(
+                fields=["source", "amount", "date"], name="income_source_amount_idx"
+            ),
+            # Admin prefix search, which is case-insensitive.
+            models.Index(Collate("source", "NOCASE"), name="income_source_nocase_idx"),
+        ]
 
     def __str__(self):
         return f"{self.source}: ${self.amount} on {self.date}"
@@ -38,6 +70,181 @@ class Expenses(models.Model):
 
     expense_id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100)
-    expense = models.IntegerField(validators=[MinValueValidator(1, "Invalid value")])
+    expense = MoneyField(validators=[MinValueValidator(1, "Invalid value")])
     date = models.DateField(default=timezone.now)
     category = models.CharField(max_length=50, choices=categories)
+    recurring_rule = models.ForeignKey(
+        "RecurringRule", null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        constraints = [
+            # One occurrence per rule and date, so materializing is idempotent.
+            models.UniqueConstraint(
+                fields=["recurring_rule", "date"], name="unique_expense_occurrence"
+            )
+        ]
+        indexes = [
+            # Keyset pagination of the dashboard and expenses_list listings.
+            models.Index(fields=["date", "expense_id"], name="expenses_date_pk_idx"),
+            models.Index(fields=["name", "expense_id"], name="expenses_name_pk_idx"),
+            # Category filters and the per-category/day grouping of the rollups.
+            models.Index(
+                fields=["category", "date"], name="expenses_category_date_idx"
+            ),
+            # Top expenses and the admin's default ordering, overall and
+            # within a category.
+            models.Index(fields=["-expense"], name="expenses_expense_desc_idx"),
+            models.Index(
+                fields=["category", "-expense"], name="expenses_category_expense_idx"
+            ),
+            # Admin prefix search, which is case-insensitive.
+            models.Index(Collate("name", "NOCASE"), name="expenses_name_nocase_idx"),
+        ]
+
+
+class Rollup(models.Model):
+    """
+    Pre-aggregated ledger totals for one (kind, category, period) bucket.
+
+    Expenses are bucketed by their category, incomes by their source. The
+    rows are kept up to date by the signal handlers in ``tracker.signals``
+    and can be rebuilt from scratch with ``manage.py rebuild_rollups``.
+    """
+
+    EXPENSE = "expense"
+    INCOME = "income"
+    kinds = [
+        (EXPENSE, "Expense"),
+        (INCOME, "Income"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=kinds)
+    category = models.CharField(max_length=100)
+    period = models.DateField()
+    total = MoneyField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.kind} {self.category} {self.period}: ${self.total}"
+
+
+class DailyRollup(Rollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "category", "period"], name="unique_daily_rollup"
+            )
+        ]
+        indexes = [
+            # Dashboard date-range filters.
+            models.Index(fields=["period", "kind"], name="dailyrollup_period_idx"),
+        ]
+
+
+class MonthlyRollup(Rollup):
+    """Same as DailyRollup, with ``period`` set to the first day of the month."""
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "category", "period"], name="unique_monthly_rollup"
+            )
+        ]
+        indexes = [
+            # Dashboard date-range filters.
+            models.Index(fields=["period", "kind"], name="monthlyrollup_period_idx"),
+        ]
+
+
+class Budget(models.Model):
+    """
+    A monthly spending limit for one expense category.
+
+    Spending is compared against the category's MonthlyRollup row, which the
+    signal handlers keep as a running total per category and month, so
+    checking every budget never re-sums the month's expenses.
+    """
+
+    budget_id = models.AutoField(primary_key=True)
+    category = models.CharField(max_length=50, choices=Expenses.categories, unique=True)
+    amount = MoneyField(validators=[MinValueValidator(1, "Invalid value")])
+
+    def __str__(self):
+        return f"{self.category}: ${self.amount} a month"
+
+
+class RecurringRule(models.Model):
+    """
+    A repeating expense or income (rent, salary, a membership) that
+    ``manage.py materialize_recurring`` turns into ledger rows as they fall due.
+
+    ``materialized`` counts the occurrences written so far and ``next_date`` is
+    the date of the next one, so each run only computes the new occurrences.
+    """
+
+    EXPENSE = "expense"
+    INCOME = "income"
+    kinds = [
+        (EXPENSE, "Expense"),
+        (INCOME, "Income"),
+    ]
+
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+    frequencies = [
+        (WEEKLY, "Weekly"),
+        (MONTHLY, "Monthly"),
+        (YEARLY, "Yearly"),
+    ]
+
+    rule_id = models.AutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=kinds)
+    name = models.CharField(max_length=100)  # The expense name or income source.
+    amount = MoneyField(validators=[MinValueValidator(1, "Invalid value")])
+    category = models.CharField(max_length=50, choices=Expenses.categories, blank=True)
+    frequency = models.CharField(max_length=10, choices=frequencies)
+    interval = models.PositiveIntegerField(
+        default=1, validators=[MinValueValidator(1)]
+    )  # E.g. 2 with WEEKLY for every other week.
+    start_date = models.DateField(default=timezone.now)
+    end_date = models.DateField(null=True, blank=True)
+    active = models.BooleanField(default=True)
+    materialized = models.PositiveIntegerField(default=0, editable=False)
+    next_date = models.DateField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return f"{self.name}: ${self.amount} {self.frequency}"
+
+    def clean(self):
+        if self.kind == self.EXPENSE and not self.category:
+            raise ValidationError({"category": "Recurring expenses need a category."})
+        if self.end_date and self.end_date < self.start_date:
+            raise ValidationError({"end_date": "The end date is before the start."})
+
+    def occurrence(self, index: int) -> date | None:
+        """
+        Returns the date of the ``index``-th occurrence (counting from 0), or
+        None if it falls after ``end_date``.
+
+        Monthly and yearly rules keep the start date's day, moved back to the
+        last day of shorter months (a rule starting on Jan 31 falls on Feb 28).
+        """
+        start: date = self._meta.get_field("start_date").to_python(self.start_date)
+        if self.frequency == self.WEEKLY:
+            day: date = start + timedelta(weeks=self.interval * index)
+        else:
+            months: int = self.interval * index
+            if self.frequency == self.YEARLY:
+                months *= 12
+            year, month = divmod(start.month - 1 + months, 12)
+            year += start.year
+            last_day: int = calendar.monthrange(year, month + 1)[1]
+            day = date(year, month + 1, min(start.day, last_day))
+        if self.end_date and day > self.end_date:
+            return None
+        return day
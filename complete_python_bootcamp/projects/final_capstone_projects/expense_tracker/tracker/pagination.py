@@ -0,0 +1,200 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import BadRequest
+from django.db.models import Model, Q, QuerySet
+from django.http import HttpRequest
+
+PAGE_SIZE = 25
+
+
+@dataclass
+class KeysetPage:
+    """One page of a keyset-paginated listing."""
+
+    items: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+    next_url: str | None = None
+    previous_url: str | None = None
+
+
+def encode_cursor(values: tuple) -> str:
+    """Encodes the ordering key of a row as an opaque, URL-safe cursor."""
+    raw: bytes = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, queryset: QuerySet, ordering: tuple) -> tuple:
+    """
+    Decodes a cursor produced by ``encode_cursor`` back into field values.
+
+    Raises:
+        BadRequest: If the cursor is malformed or does not match ``ordering``.
+    """
+    try:
+        raw: bytes = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values: list = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError(cursor)
+        opts = queryset.model._meta
+        return tuple(
+            opts.get_field(field).to_python(value)
+            for field, value in zip(ordering, values)
+        )
+    except Exception as exc:
+        raise BadRequest(f"Invalid cursor: {cursor!r}") from exc
+
+
+def row_key(row: Model | dict, ordering: tuple) -> tuple:
+    """The ordering key of a model instance or of a ``values()`` dict."""
+    if isinstance(row, dict):
+        return tuple(row[field] for field in ordering)
+    return tuple(getattr(row, field) for field in ordering)
+
+
+def seek(ordering: tuple, values: tuple, lookup: str) -> Q:
+    """
+    Builds the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)``
+    (or ``<``) as a Q object that an index on ``ordering`` can serve.
+    """
+    condition = Q()
+    for position in range(len(ordering)):
+        equal = {field: value for field, value in zip(ordering, values[:position])}
+        condition |= Q(**equal, **{f"{ordering[position]}__{lookup}": values[position]})
+    return condition
+
+
+def page_query(
+    queryset: QuerySet,
+    ordering: tuple,
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = PAGE_SIZE,
+) -> QuerySet:
+    """
+    Returns the query reading the page of ``queryset`` that follows ``after``
+    (or precedes ``before``) in ascending ``ordering``, plus one extra row that
+    tells whether there is a further page.
+
+    ``ordering`` must end with a unique field (the primary key) so every row
+    has a distinct position. Only ``page_size + 1`` rows are read, however
+    deep into the listing the cursor points.
+    """
+    if before:
+        values: tuple = decode_cursor(before, queryset, ordering)
+        descending: list = [f"-{field}" for field in ordering]
+        return queryset.filter(seek(ordering, values, "lt")).order_by(*descending)[
+            : page_size + 1
+        ]
+
+    if after:
+        queryset = queryset.filter(
+            seek(ordering, decode_cursor(after, queryset, ordering), "gt")
+        )
+    return queryset.order_by(*ordering)[: page_size + 1]
+
+
+def make_page(
+    rows: list,
+    ordering: tuple,
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = PAGE_SIZE,
+) -> KeysetPage:
+    """Builds the KeysetPage from the rows read by ``page_query``."""
+    has_more: bool = len(rows) > page_size
+    if before:
+        items: list = rows[:page_size][::-1]
+        return KeysetPage(
+            items=items,
+            previous_cursor=(
+                encode_cursor(row_key(items[0], ordering)) if has_more else None
+            ),
+            next_cursor=encode_cursor(row_key(items[-1], ordering)) if items else None,
+        )
+
+    items = rows[:page_size]
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(row_key(items[-1], ordering)) if has_more else None,
+        previous_cursor=(
+            encode_cursor(row_key(items[0], ordering)) if after and items else None
+        ),
+    )
+
+
+def paginate(
+    queryset: QuerySet,
+    ordering: tuple,
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = PAGE_SIZE,
+) -> KeysetPage:
+    """Returns the page of ``queryset`` after ``after`` or before ``before``."""
+    rows: list = list(page_query(queryset, ordering, after, before, page_size))
+    return make_page(rows, ordering, after, before, page_size)
+
+
+async def apaginate(
+    queryset: QuerySet,
+    ordering: tuple,
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = PAGE_SIZE,
+) -> KeysetPage:
+    """Async version of ``paginate``, reading the rows with ``async for``."""
+    rows: list = [
+        row async for row in page_query(queryset, ordering, after, before, page_size)
+    ]
+    return make_page(rows, ordering, after, before, page_size)
+
+
+def add_links(request: HttpRequest, page: KeysetPage, prefix: str) -> KeysetPage:
+    """
+    Fills in the next/previous links of ``page``, keeping every other query
+    parameter (e.g. the cursor of another listing on the same page).
+    """
+    for cursor, param, attr in (
+        (page.next_cursor, "after", "next_url"),
+        (page.previous_cursor, "before", "previous_url"),
+    ):
+        if cursor is None:
+            continue
+        query = request.GET.copy()
+        query.pop(f"{prefix}_after", None)
+        query.pop(f"{prefix}_before", None)
+        query[f"{prefix}_{param}"] = cursor
+        setattr(page, attr, f"?{query.urlencode()}")
+
+    return page
+
+
+def paginate_request(
+    request: HttpRequest, queryset: QuerySet, ordering: tuple, prefix: str
+) -> KeysetPage:
+    """
+    Paginates ``queryset`` using the ``<prefix>_after`` / ``<prefix>_before``
+    query parameters, with links to the neighbouring pages.
+    """
+    page: KeysetPage = paginate(
+        queryset,
+        ordering,
+        after=request.GET.get(f"{prefix}_after"),
+        before=request.GET.get(f"{prefix}_before"),
+    )
+    return add_links(request, page, prefix)
+
+
+async def apaginate_request(
+    request: HttpRequest, queryset: QuerySet, ordering: tuple, prefix: str
+) -> KeysetPage:
+    """Async version of ``paginate_request``."""
+    page: KeysetPage = await apaginate(
+        queryset,
+        ordering,
+        after=request.GET.get(f"{prefix}_after"),
+        before=request.GET.get(f"{prefix}_before"),
+    )
+    return add_links(request, page, prefix)
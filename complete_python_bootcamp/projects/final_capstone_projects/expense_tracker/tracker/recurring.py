@@ -0,0 +1,146 @@
+import time
+from dataclasses import dataclass
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import caching, rollups
+from .ledger import insert_sql
+from .models import Expenses, Income, RecurringRule, Rollup
+
+BATCH_SIZE = 5000
+
+
+@dataclass
+class MaterializeReport:
+    """Outcome of a materialization run."""
+
+    created: int = 0
+    rules: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+
+def due_rules(until: date) -> QuerySet:
+    """The active rules with at least one occurrence on or before ``until``."""
+    return (
+        RecurringRule.objects.annotate(due=Coalesce("next_date", "start_date"))
+        .filter(due__lte=until, active=True)
+        .order_by("pk")
+    )
+
+
+# The columns each kind of rule writes, in the order of the rows built below.
+COLUMNS: dict = {
+    RecurringRule.EXPENSE: (
+        Expenses,
+        ("name", "expense", "category", "date", "recurring_rule"),
+    ),
+    RecurringRule.INCOME: (Income, ("source", "amount", "date", "recurring_rule")),
+}
+
+
+def row(rule: RecurringRule, day: str) -> tuple:
+    """
+    The ledger row of ``rule``'s occurrence on ``day`` (as the database stores
+    it), as a tuple of the rule kind's COLUMNS.
+    """
+    if rule.kind == RecurringRule.EXPENSE:
+        return rule.name, int(rule.amount), rule.category, day, rule.pk
+    return rule.name, int(rule.amount), day, rule.pk
+
+
+def flush(rows: dict, entries: list, progress: dict) -> int:
+    """
+    Writes the pending rows and their rollup entries and moves the rules'
+    cursors past them, in one transaction, so an interrupted run never writes
+    an occurrence twice.
+
+    Rows are plain tuples written with one ``executemany`` INSERT per kind,
+    like ``benchmarking.seed_ledger``, so no model instance is built per
+    occurrence. That skips the rollup signal handlers, hence ``entries``.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with transaction.atomic():
+        created: int = 0
+        with connection.cursor() as cursor:
+            for kind, kind_rows in rows.items():
+                if kind_rows:
+                    cursor.executemany(insert_sql(*COLUMNS[kind]), kind_rows)
+                    created += len(kind_rows)
+        rollups.apply(added=entries)
+        for rule, count in progress.items():
+            rule.materialized += count
+            rule.next_date = rule.occurrence(rule.materialized)
+            rule.active = rule.next_date is not None
+        RecurringRule.objects.bulk_update(
+            progress, ["materialized", "next_date", "active"]
+        )
+    for kind_rows in rows.values():
+        kind_rows.clear()
+    entries.clear()
+    progress.clear()
+    return created
+
+
+def materialize(
+    until: date | None = None, batch_size: int = BATCH_SIZE
+) -> MaterializeReport:
+    """
+    Writes every occurrence of the active rules up to ``until`` (today by
+    default) that has not been written yet.
+
+    Occurrences are written with ``executemany``, ``batch_size`` rows per
+    transaction, so back-filling years of history for thousands of rules takes
+    one INSERT per batch plus one rollup update per touched bucket. Running it
+    again writes nothing new; rules past their end date are deactivated.
+    """
+    until = until or timezone.localdate()
+    report = MaterializeReport()
+    started: float = time.perf_counter()
+    rows: dict = {kind: [] for kind in COLUMNS}
+    entries: list = []
+    progress: dict = {}
+    # What DateField.get_db_prep_save() ends up calling, looked up once rather
+    # than through the connection proxy for every occurrence.
+    adapt_date = connection.ops.adapt_datefield_value
+
+    for rule in list(due_rules(until)):
+        report.rules += 1
+        kind_rows: list = rows[rule.kind]
+        # The rollup entry of every occurrence, but for its date.
+        entry: tuple = (
+            (Rollup.EXPENSE, rule.category, rule.amount)
+            if rule.kind == RecurringRule.EXPENSE
+            else (Rollup.INCOME, rule.name, rule.amount)
+        )
+        index: int = rule.materialized
+        # The rule's occurrences since the last flush.
+        pending: int = 0
+        while (day := rule.occurrence(index)) is not None and day <= until:
+            kind_rows.append(row(rule, adapt_date(day)))
+            entries.append((entry[0], entry[1], day, entry[2]))
+            index += 1
+            pending += 1
+            if len(entries) >= batch_size:
+                progress[rule] = pending
+                report.created += flush(rows, entries, progress)
+                pending = 0
+        if pending or (day is None and index == rule.materialized):
+            # Also for a rule with nothing left to write: it ended since the
+            # last run, and is deactivated.
+            progress[rule] = pending
+
+    report.created += flush(rows, entries, progress)
+    if report.created:
+        transaction.on_commit(caching.bump_ledger_version)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,225 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, QuerySet, Sum
+
+from .fields import Money
+from .models import DailyRollup, Expenses, Income, MonthlyRollup, Rollup
+
+# Periods looked up per query when applying changes, to stay well below the
+# database's limit on query parameters.
+LOOKUP_CHUNK = 500
+
+# A single ledger row reduced to what the rollups care about:
+# (kind, category, date, amount).
+Entry = tuple[str, str, date, Money]
+
+
+def month_start(day: date) -> date:
+    """Returns the first day of the month that ``day`` falls in."""
+    return day.replace(day=1)
+
+
+def entry_for(instance: Expenses | Income) -> Entry:
+    """
+    Reduces an Expenses or Income instance to a rollup entry.
+
+    The values go through the model fields' ``to_python`` so unsaved instances
+    (e.g. a ``date`` still holding the ``timezone.now`` default) are bucketed
+    exactly as the database will store them.
+    """
+    day: date = instance._meta.get_field("date").to_python(instance.date)
+    if isinstance(instance, Expenses):
+        amount = instance._meta.get_field("expense").to_python(instance.expense)
+        return Rollup.EXPENSE, instance.category, day, amount
+
+    amount = instance._meta.get_field("amount").to_python(instance.amount)
+    return Rollup.INCOME, instance.source, day, amount
+
+
+def apply(added: Iterable[Entry] = (), removed: Iterable[Entry] = ()) -> None:
+    """
+    Incrementally applies ledger changes to the daily and monthly rollups.
+
+    Entries are first folded into one delta per rollup bucket, and the deltas
+    are written with one bulk UPDATE and one bulk INSERT per rollup table, so a
+    batch of thousands of rows costs a handful of queries however many buckets
+    it touches.
+    """
+    deltas: dict[tuple, list] = defaultdict(lambda: [Money(0), 0])
+    for sign, entries in ((1, added), (-1, removed)):
+        for kind, category, day, amount in entries:
+            for model, period in (
+                (DailyRollup, day),
+                (MonthlyRollup, month_start(day)),
+            ):
+                delta = deltas[(model, kind, category, period)]
+                delta[0] += sign * amount
+                delta[1] += sign
+
+    with transaction.atomic():
+        for model in (DailyRollup, MonthlyRollup):
+            changes: dict = {
+                key[1:]: delta
+                for key, delta in deltas.items()
+                if key[0] is model and any(delta)
+            }
+            if changes:
+                apply_changes(model, changes)
+
+
+def apply_changes(model: type[Rollup], changes: dict) -> None:
+    """
+    Adds the ``{(kind, category, period): [total, count]}`` deltas to the rows
+    of ``model``, creating the missing ones.
+
+    Both the updates and the inserts are single ``executemany`` statements
+    rather than ORM calls, as a back-fill can touch tens of thousands of
+    buckets. Updates add the delta in SQL (``total = total + delta``), so
+    concurrent writers cannot overwrite each other.
+    """
+    periods: dict[tuple, list] = defaultdict(list)
+    for kind, category, period in changes:
+        periods[(kind, category)].append(period)
+
+    # One indexed lookup per (kind, category) for the buckets that exist.
+    updates: list = []
+    for (kind, category), bucket_periods in periods.items():
+        for offset in range(0, len(bucket_periods), LOOKUP_CHUNK):
+            rows = model.objects.filter(
+                kind=kind,
+                category=category,
+                period__in=bucket_periods[offset : offset + LOOKUP_CHUNK],
+            ).values_list("pk", "period")
+            for pk, period in rows:
+                total, count = changes.pop((kind, category, period))
+                updates.append((int(total), count, pk))
+
+    opts = model._meta
+    quote = connection.ops.quote_name
+    table: str = quote(opts.db_table)
+    column = {
+        name: quote(opts.get_field(name).column)
+        for name in ("kind", "category", "period", "total", "count")
+    }
+    # What DateField.get_db_prep_save() ends up calling, looked up once rather
+    # than through the connection proxy for every bucket.
+    adapt_date = connection.ops.adapt_datefield_value
+    with connection.cursor() as cursor:
+        if updates:
+            cursor.executemany(
+                f"UPDATE {table} SET {column['total']} = {column['total']} + %s, "
+                f"{column['count']} = {column['count']} + %s "
+                f"WHERE {quote(opts.pk.column)} = %s",
+                updates,
+            )
+        if changes:
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(column.values())}) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [
+                    (
+                        kind,
+                        category,
+                        adapt_date(period),
+                        int(total),
+                        count,
+                    )
+                    for (kind, category, period), (total, count) in changes.items()
+                ],
+            )
+
+
+def rebuild() -> tuple[int, int]:
+    """
+    Recomputes every rollup row from the raw ledger.
+
+    Returns:
+        tuple[int, int]: The number of daily and monthly rollup rows written.
+    """
+    daily: dict[tuple, list] = defaultdict(lambda: [Money(0), 0])
+    monthly: dict[tuple, list] = defaultdict(lambda: [Money(0), 0])
+
+    sources = (
+        (Rollup.EXPENSE, Expenses.objects.values_list("category", "date"), "expense"),
+        (Rollup.INCOME, Income.objects.values_list("source", "date"), "amount"),
+    )
+
+    with transaction.atomic():
+        for kind, queryset, amount_field in sources:
+            rows = queryset.order_by().annotate(
+                total=Sum(amount_field), count=Count("pk")
+            )
+            for category, day, total, count in rows:
+                for buckets, period in ((daily, day), (monthly, month_start(day))):
+                    bucket = buckets[(kind, category, period)]
+                    bucket[0] += total
+                    bucket[1] += count
+
+        DailyRollup.objects.all().delete()
+        MonthlyRollup.objects.all().delete()
+        for model, buckets in ((DailyRollup, daily), (MonthlyRollup, monthly)):
+            model.objects.bulk_create(
+                (
+                    model(
+                        kind=kind,
+                        category=category,
+                        period=period,
+                        total=total,
+                        count=count,
+                    )
+                    for (kind, category, period), (total, count) in buckets.items()
+                ),
+                batch_size=500,
+            )
+
+    return len(daily), len(monthly)
+
+
+def totals() -> tuple[Money, Money]:
+    """
+    Returns the all-time (total income, total expenses) from the monthly rollups.
+    """
+    result: dict = MonthlyRollup.objects.aggregate(
+        income=Sum("total", filter=Q(kind=Rollup.INCOME)),
+        expenses=Sum("total", filter=Q(kind=Rollup.EXPENSE)),
+    )
+    return result["income"] or Money(0), result["expenses"] or Money(0)
+
+
+def rollup_rows(start: date | None = None, end: date | None = None) -> QuerySet:
+    """
+    Returns the non-empty rollup rows covering ``start`` to ``end`` inclusive.
+
+    Ranges made of whole months are served from the monthly rollups; any other
+    range from the daily ones.
+    """
+    whole_months: bool = (start is None or start.day == 1) and (
+        end is None or (end + timedelta(days=1)).day == 1
+    )
+    queryset: QuerySet = (
+        MonthlyRollup if whole_months else DailyRollup
+    ).objects.filter(count__gt=0)
+    if start:
+        queryset = queryset.filter(period__gte=start)
+    if end:
+        queryset = queryset.filter(period__lte=end)
+    return queryset
+
+
+def category_totals(
+    kind: str, start: date | None = None, end: date | None = None
+) -> QuerySet:
+    """
+    Returns the total and row count per category (per source, for incomes)
+    between ``start`` and ``end`` inclusive, largest total first.
+    """
+    return (
+        rollup_rows(start, end)
+        .filter(kind=kind)
+        .values("category")
+        .annotate(total=Sum("total"), count=Sum("count"))
+        .order_by("-total", "category")
+    )
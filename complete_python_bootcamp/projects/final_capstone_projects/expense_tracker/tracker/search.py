@@ -0,0 +1,108 @@
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from .ledger import KINDS
+
+# The column of each kind of ledger row that is full-text indexed. The FTS5
+# tables and the triggers keeping them in sync are created by migration 0012.
+SEARCH_COLUMNS = {"expense": "name", "income": "source"}
+
+RESULTS = 20
+
+# A window for searches that must stay fast: ranking only the newest
+# MATCH_WINDOW matching rows. FTS5 computes the BM25 score of every match it
+# sorts, even for ORDER BY rank with a LIMIT, so ranking a word found in every
+# one of a million expenses takes seconds where the window takes milliseconds.
+# Searches rank every match unless they pass a window.
+MATCH_WINDOW = 1000
+# The largest window the API accepts.
+MAX_WINDOW = 100_000
+
+
+def fts_query(text: str) -> str:
+    """
+    Turns free text typed by a user into an FTS5 query matching the rows that
+    contain all of its words, the last one possibly unfinished
+    (``"groceries" "we"*``). Every word is quoted, so FTS5 operators and
+    punctuation in ``text`` are never interpreted. Returns "" if ``text`` has
+    no words.
+
+    Only the last word is a prefix: a prefix is looked up by merging the
+    postings of every word it starts, which for a short, common one is much
+    slower than looking up a whole word.
+    """
+    words: list = [f'"{word}"' for word in re.findall(r"[^\W_]+", text)]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+def matching_ids(
+    kind: str, text: str, limit: int = RESULTS, window: int | None = None
+) -> list[int]:
+    """
+    Returns the primary keys of the ``limit`` expenses or incomes that best
+    match ``text``, best first: ranked by BM25, ties going to the newest row.
+
+    Parameters:
+        window (int | None): None (the default) ranks every match, which
+            takes time in proportion to the number of matches. Otherwise only
+            the newest ``window`` matches are ranked (at least ``limit``), so
+            common words cost no more than rare ones, e.g. MATCH_WINDOW.
+    """
+    query: str = fts_query(text)
+    if not query:
+        return []
+    model = KINDS[kind][0]
+    fts: str = connection.ops.quote_name(f"{model._meta.db_table}_fts")
+    with connection.cursor() as cursor:
+        if window is None:
+            cursor.execute(
+                f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s "
+                "ORDER BY rank, rowid DESC LIMIT %s",
+                [query, limit],
+            )
+        else:
+            cursor.execute(
+                f"SELECT rowid FROM (SELECT rowid, rank FROM {fts} "
+                f"WHERE {fts} MATCH %s ORDER BY rowid DESC LIMIT %s) "
+                "ORDER BY rank, rowid DESC LIMIT %s",
+                [query, max(window, limit), limit],
+            )
+        return [pk for (pk,) in cursor.fetchall()]
+
+
+def search(
+    kind: str, text: str, limit: int = RESULTS, window: int | None = None
+) -> list[dict]:
+    """
+    Returns the ``limit`` expenses or incomes that best match ``text`` as
+    ``values()`` dicts of their public columns, best first, ranked among all
+    the matches or the newest ``window`` of them like ``matching_ids``.
+
+    The full-text index only yields the ranked primary keys; the rows are
+    then read by primary key, so the amounts and dates go through the model
+    fields as in every other listing.
+    """
+    return in_order(kind, matching_ids(kind, text, limit, window))
+
+
+async def asearch(
+    kind: str, text: str, limit: int = RESULTS, window: int | None = None
+) -> list[dict]:
+    """Async version of ``search``."""
+    return await sync_to_async(search)(kind, text, limit, window)
+
+
+def in_order(kind: str, ids: list[int]) -> list[dict]:
+    """The public columns of the rows with primary keys ``ids``, in that order."""
+    if not ids:
+        return []
+    model, columns, _ = KINDS[kind]
+    rows: dict = {
+        row[model._meta.pk.name]: row
+        for row in model.objects.filter(pk__in=ids).values(*columns)
+    }
+    return [rows[pk] for pk in ids if pk in rows]
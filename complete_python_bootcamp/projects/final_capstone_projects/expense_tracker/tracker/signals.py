@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import caching, rollups
+from .models import Budget, Expenses, Income
+
+
+@receiver(pre_save, sender=Expenses)
+@receiver(pre_save, sender=Income)
+def remember_previous_entry(sender, instance, **kwargs) -> None:
+    """
+    Stores the row's current database state before an update, so that
+    post_save can move its amount out of the old rollup bucket.
+    """
+    instance._previous_rollup_entry = None
+    if instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._previous_rollup_entry = rollups.entry_for(previous)
+
+
+@receiver(post_save, sender=Expenses)
+@receiver(post_save, sender=Income)
+def update_rollups_on_save(sender, instance, **kwargs) -> None:
+    previous = getattr(instance, "_previous_rollup_entry", None)
+    rollups.apply(
+        added=[rollups.entry_for(instance)],
+        removed=[previous] if previous else [],
+    )
+    transaction.on_commit(caching.bump_ledger_version)
+
+
+@receiver(post_delete, sender=Expenses)
+@receiver(post_delete, sender=Income)
+def update_rollups_on_delete(sender, instance, **kwargs) -> None:
+    rollups.apply(removed=[rollups.entry_for(instance)])
+    transaction.on_commit(caching.bump_ledger_version)
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+def invalidate_budgets(sender, instance, **kwargs) -> None:
+    # The dashboard caches the budget statuses with the ledger version.
+    transaction.on_commit(caching.bump_ledger_version)
@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+
+from django.db.models import Q, QuerySet, Sum
+
+from . import rollups
+from .fields import Money
+from .ledger import LedgerFilter
+from .models import Rollup
+
+TOP_EXPENSES = 3
+
+
+@dataclass
+class DashboardStats:
+    """
+    The analytics shown on the dashboard, loaded in two queries: one grouped
+    pass over the rollups for every total, and one indexed read of the largest
+    expenses. Both are restricted to the same LedgerFilter as the listings.
+    """
+
+    total_income: Money = Money(0)
+    total_expenses: Money = Money(0)
+    expense_breakdown: list = field(default_factory=list)
+    top_expenses: list = field(default_factory=list)
+
+    @property
+    def net_worth(self) -> Money:
+        return self.total_income - self.total_expenses
+
+    @property
+    def savings_rate(self) -> float:
+        if self.total_income <= 0:
+            return 0.0
+        return self.net_worth / self.total_income * 100
+
+    @staticmethod
+    def category_totals(filters: LedgerFilter = LedgerFilter()) -> QuerySet:
+        """
+        (kind, category, total) for every rollup bucket matching ``filters``,
+        largest first.
+        """
+        queryset: QuerySet = rollups.rollup_rows(filters.start, filters.end)
+        if filters.category:
+            queryset = queryset.filter(
+                Q(kind=Rollup.INCOME) | Q(category=filters.category)
+            )
+        if filters.source:
+            queryset = queryset.filter(
+                Q(kind=Rollup.EXPENSE) | Q(category=filters.source)
+            )
+        return (
+            queryset.values_list("kind", "category")
+            .annotate(total=Sum("total"))
+            .order_by("-total", "category")
+        )
+
+    @staticmethod
+    def largest_expenses(top: int, filters: LedgerFilter = LedgerFilter()) -> QuerySet:
+        return filters.expenses().order_by("-expense")[:top]
+
+    @classmethod
+    def from_rows(cls, category_totals: list, top_expenses: list) -> "DashboardStats":
+        stats = cls(top_expenses=top_expenses)
+        for kind, category, total in category_totals:
+            if kind == Rollup.INCOME:
+                stats.total_income += total
+            else:
+                stats.total_expenses += total
+                stats.expense_breakdown.append({"category": category, "total": total})
+        return stats
+
+    @classmethod
+    def load(
+        cls, filters: LedgerFilter = LedgerFilter(), top: int = TOP_EXPENSES
+    ) -> "DashboardStats":
+        """
+        Loads the dashboard statistics.
+
+        Parameters:
+            filters (LedgerFilter): Date range, category and source to restrict
+                the statistics to.
+            top (int): How many of the largest expenses to include.
+
+        Returns:
+            DashboardStats: Totals, per-category breakdown and top expenses.
+        """
+        return cls.from_rows(
+            list(cls.category_totals(filters)),
+            list(cls.largest_expenses(top, filters)),
+        )
+
+    @classmethod
+    async def aload(
+        cls, filters: LedgerFilter = LedgerFilter(), top: int = TOP_EXPENSES
+    ) -> "DashboardStats":
+        """Async version of ``load``."""
+        return cls.from_rows(
+            [row async for row in cls.category_totals(filters)],
+            [row async for row in cls.largest_expenses(top, filters)],
+        )
+
+    def as_dict(self) -> dict:
+        """The statistics as JSON-serializable data, for the API."""
+        return {
+            "total_income": self.total_income,
+            "total_expenses": self.total_expenses,
+            "net_worth": self.net_worth,
+            "savings_rate": round(self.savings_rate, 2),
+            "expense_breakdown": self.expense_breakdown,
+            "top_expenses": [
+                {
+                    "expense_id": expense.expense_id,
+                    "name": expense.name,
+                    "expense": expense.expense,
+                    "category": expense.category,
+                    "date": expense.date,
+                }
+                for expense in self.top_expenses
+            ],
+        }
@@ -1,3 +1,1878 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    OperationalError,
+    connection,
+    transaction,
+)
+from django.db.models import Sum
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import (
+    analytics,
+    budgets,
+    caching,
+    importers,
+    metrics,
+    recurring,
+    rollups,
+    search,
+)
+from .admin import ExpensesAdmin
+from .benchmarking import compare_reports, sqlite_connection
+from .fields import Money
+from .ledger import LedgerFilter, insert_sql
+from .models import (
+    Budget,
+    DailyRollup,
+    Expenses,
+    Income,
+    MonthlyRollup,
+    RecurringRule,
+    Rollup,
+)
+from .pagination import PAGE_SIZE, encode_cursor, paginate
+from .stats import DashboardStats
+
+
+class TrackerTestCase(TestCase):
+    """
+    TestCase that starts every test with an empty cache and zeroed cache
+    counters, since the test database is rolled back between tests but the
+    cache is not.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caching.hits.clear()
+        caching.misses.clear()
+
+
+def rollup_snapshot(model) -> set:
+    """Returns the rollup rows of ``model`` as comparable tuples."""
+    return set(
+        model.objects.filter(count__gt=0).values_list(
+            "kind", "category", "period", "total", "count"
+        )
+    )
+
+
+# ========================
+# Tests for the money field
+# ========================
+
+
+class MoneyTests(TrackerTestCase):
+    def test_money_is_integer_cents_rendered_as_dollars(self):
+        """
+        Test that Money arithmetic stays in integer cents and str() renders
+        dollars.
+        """
+        total = sum([Money(1050), Money(250)]) - Money(2000)
+        self.assertIsInstance(total, Money)
+        self.assertEqual(total, -700)
+        self.assertEqual(str(total), "-7.00")
+        self.assertEqual(str(Money(5)), "0.05")
+        self.assertEqual(Money.from_dollars("12.5"), 1250)
+        with self.assertRaises(ValueError):
+            Money.from_dollars("0.125")
+
+    def test_form_input_is_stored_as_cents(self):
+        """
+        Test that dollar amounts entered in the form are stored as integer
+        cents and shown as dollars on the dashboard.
+        """
+        self.client.post(
+            reverse("add_expense"),
+            {
+                "name": "Lunch",
+                "expense": "12.75",
+                "category": "Groceries",
+                "date": "2025-04-01",
+            },
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT expense FROM tracker_expenses")
+            self.assertEqual(cursor.fetchone(), (1275,))
+        self.assertContains(self.client.get(reverse("home")), "$12.75")
+
+    def test_fractional_cents_are_rejected(self):
+        """Test that the form rejects amounts with more than two decimals."""
+        self.client.post(
+            reverse("add_income"),
+            {"source": "Salary", "amount": "10.005", "date": "2025-04-01"},
+        )
+        self.assertFalse(Income.objects.exists())
+
+    def test_sums_are_integer_cents(self):
+        """Test that SQL sums come back as Money, with no Decimal involved."""
+        Income.objects.create(source="Salary", amount="1000.10")
+        Income.objects.create(source="Bonus", amount=Money(5))
+        total = Income.objects.aggregate(total=Sum("amount"))["total"]
+        self.assertIsInstance(total, Money)
+        self.assertEqual(total, 100_015)
+
+
+# ========================
+# Tests for the rollups
+# ========================
+
+
+class RollupTests(TrackerTestCase):
+    def test_saving_an_expense_updates_daily_and_monthly_rollups(self):
+        """
+        Test that a new expense is added to its day and month bucket.
+        """
+        Expenses.objects.create(
+            name="Rent", expense=500, category="Utilities", date=date(2025, 4, 14)
+        )
+        Expenses.objects.create(
+            name="Power", expense=70, category="Utilities", date=date(2025, 4, 20)
+        )
+
+        daily = DailyRollup.objects.get(
+            kind=Rollup.EXPENSE, category="Utilities", period=date(2025, 4, 14)
+        )
+        monthly = MonthlyRollup.objects.get(
+            kind=Rollup.EXPENSE, category="Utilities", period=date(2025, 4, 1)
+        )
+        self.assertEqual((daily.total, daily.count), (Decimal(500), 1))
+        self.assertEqual((monthly.total, monthly.count), (Decimal(570), 2))
+
+    def test_editing_an_expense_moves_it_between_buckets(self):
+        """
+        Test that changing the category, date and amount of an expense moves it
+        out of its old bucket and into the new one.
+        """
+        expense = Expenses.objects.create(
+            name="Course", expense=100, category="Education", date=date(2025, 3, 2)
+        )
+        expense.category = "Other"
+        expense.date = date(2025, 4, 2)
+        expense.expense = 150
+        expense.save()
+
+        self.assertEqual(
+            rollup_snapshot(MonthlyRollup),
+            {(Rollup.EXPENSE, "Other", date(2025, 4, 1), Decimal(150), 1)},
+        )
+
+    def test_deleting_income_removes_it_from_the_rollups(self):
+        """
+        Test that deleting an income takes its amount back out of the rollups.
+        """
+        income = Income.objects.create(
+            source="Salary", amount=100_050, date=date(2025, 4, 1)
+        )
+        Income.objects.create(source="Salary", amount=20_025, date=date(2025, 4, 3))
+        income.delete()
+
+        self.assertEqual(rollups.totals(), (Money(20_025), Money(0)))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        """
+        Test that rebuild_rollups produces the same rows as the signal handlers.
+        """
+        Expenses.objects.create(
+            name="Gym", expense=30, category="Memberships", date=date(2025, 1, 5)
+        )
+        Expenses.objects.create(
+            name="Food", expense=45, category="Groceries", date=date(2025, 2, 5)
+        )
+        Income.objects.create(source="Bonus", amount=9_999, date=date(2025, 2, 6))
+        incremental = rollup_snapshot(DailyRollup), rollup_snapshot(MonthlyRollup)
+
+        DailyRollup.objects.all().delete()
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        self.assertEqual(
+            (rollup_snapshot(DailyRollup), rollup_snapshot(MonthlyRollup)), incremental
+        )
+
+    def test_failed_rollup_update_rolls_the_ledger_write_back(self):
+        """
+        Test that the views write a row and its rollup update in one
+        transaction: if the rollups fail, the row is not added or deleted.
+        """
+        income = Income.objects.create(source="Salary", amount=1000)
+        failing = mock.patch.object(
+            rollups, "apply", side_effect=DatabaseError("disk I/O error")
+        )
+        with failing, self.assertRaises(DatabaseError):
+            self.client.post(
+                reverse("add_expense"),
+                {
+                    "name": "Lunch",
+                    "expense": "12.75",
+                    "category": "Groceries",
+                    "date": "2025-04-01",
+                },
+            )
+        with failing, self.assertRaises(DatabaseError):
+            self.client.post(reverse("delete_income", args=[income.pk]))
+
+        self.assertFalse(Expenses.objects.exists())
+        self.assertTrue(Income.objects.filter(pk=income.pk).exists())
+        self.assertEqual(rollups.totals(), (Money(1000), Money(0)))
+
+    def test_home_serves_totals_from_rollups(self):
+        """
+        Test that the dashboard totals, savings rate and breakdown come from the
+        rollups.
+        """
+        Expenses.objects.create(name="Food", expense=200, category="Groceries")
+        Expenses.objects.create(name="Movie", expense=50, category="Entertainment")
+        Expenses.objects.create(name="Snacks", expense=100, category="Groceries")
+        Income.objects.create(source="Salary", amount=1000)
+
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_income"], Decimal(1000))
+        self.assertEqual(response.context["total_expenses"], Decimal(350))
+        self.assertEqual(response.context["savings_rate"], Decimal(65))
+        self.assertEqual(
+            list(response.context["expense_breakdown"]),
+            [
+                {"category": "Groceries", "total": Decimal(300)},
+                {"category": "Entertainment", "total": Decimal(50)},
+            ],
+        )
+
+
+# ========================
+# Tests for the pagination
+# ========================
+
+
+class KeysetPaginationTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        # Several rows share a date so the expense_id tie-breaker matters.
+        self.expenses = [
+            Expenses.objects.create(
+                name=f"Expense {index:02d}",
+                expense=index + 1,
+                category="Other",
+                date=date(2025, 1, 1 + index // 3),
+            )
+            for index in range(7)
+        ]
+
+    def test_pages_walk_the_listing_in_order_without_gaps(self):
+        """
+        Test that following next cursors visits every row exactly once, in
+        (date, expense_id) order.
+        """
+        seen: list = []
+        page = paginate(Expenses.objects.all(), ("date", "expense_id"), page_size=3)
+        seen += page.items
+        while page.next_cursor:
+            page = paginate(
+                Expenses.objects.all(),
+                ("date", "expense_id"),
+                after=page.next_cursor,
+                page_size=3,
+            )
+            seen += page.items
+
+        self.assertEqual(seen, self.expenses)
+
+    def test_previous_cursor_returns_the_preceding_page(self):
+        """
+        Test that the previous cursor of the second page leads back to the first.
+        """
+        ordering = ("date", "expense_id")
+        first = paginate(Expenses.objects.all(), ordering, page_size=3)
+        second = paginate(
+            Expenses.objects.all(), ordering, after=first.next_cursor, page_size=3
+        )
+        back = paginate(
+            Expenses.objects.all(), ordering, before=second.previous_cursor, page_size=3
+        )
+
+        self.assertEqual(back.items, first.items)
+        self.assertIsNone(back.previous_cursor)
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        """
+        Test that a tampered cursor results in a 400 response.
+        """
+        response = self.client.get(reverse("home"), {"expenses_after": "garbage"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_home_renders_one_page_with_links_keeping_other_cursors(self):
+        """
+        Test that home renders a bounded page and that the next link keeps the
+        income listing's cursor.
+        """
+        Expenses.objects.bulk_create(
+            Expenses(name="Bulk", expense=1, category="Other", date=date(2025, 2, 1))
+            for _ in range(PAGE_SIZE)
+        )
+        income_cursor: str = encode_cursor((date(2025, 1, 1), 1))
+        response = self.client.get(reverse("home"), {"incomes_after": income_cursor})
+        page = response.context["expense_page"]
+
+        self.assertEqual(len(response.context["expenses"]), PAGE_SIZE)
+        self.assertIn(f"expenses_after={page.next_cursor}", page.next_url)
+        self.assertIn(f"incomes_after={income_cursor}", page.next_url)
+
+    def test_expenses_list_is_ordered_by_name(self):
+        """
+        Test that expenses_list paginates on (name, expense_id).
+        """
+        Expenses.objects.create(name="AAA", expense=5, category="Other")
+        response = self.client.get(reverse("expenses_list"))
+        self.assertEqual(response.context["expenses"][0].name, "AAA")
+
+
+# ========================
+# Tests for the query plans
+# ========================
+
+
+class QueryPlanTests(TrackerTestCase):
+    """
+    Runs the view and admin queries and checks with EXPLAIN QUERY PLAN that
+    SQLite never reads a whole ledger table, through an index or not, nor
+    sorts the rows matched to return a page of them.
+    """
+
+    ledger_tables = ("tracker_expenses", "tracker_income")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        # More rows than an admin page, so the changelists are paginated
+        # with a LIMIT as on a real ledger.
+        rows: int = ExpensesAdmin.list_per_page + 1
+        Expenses.objects.bulk_create(
+            Expenses(
+                name="Rent",
+                expense=500 + n,
+                category="Utilities",
+                date=date(2025, 4, 1),
+            )
+            for n in range(rows)
+        )
+        Income.objects.bulk_create(
+            Income(source="Salary", amount=1000 + n, date=date(2025, 4, 1))
+            for n in range(rows)
+        )
+        rollups.rebuild()
+
+    def plans(self, queries: list) -> list:
+        """Returns (sql, plan lines) for the ``queries`` reading a ledger table."""
+        plans: list = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql: str = query["sql"]
+                if not sql.startswith("SELECT") or not any(
+                    f'"{table}"' in sql for table in self.ledger_tables
+                ):
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    def full_scans(self, queries: list, sorts: bool = False) -> list:
+        """
+        Returns the plan lines of ``queries`` that walk a whole ledger table
+        or index, unless the walk is in the ORDER BY's order and a LIMIT
+        stops it after a page; and, unless ``sorts``, the sorts of ledger
+        rows, which read every row matched before the LIMIT.
+        """
+        scans: list = []
+        for sql, details in self.plans(queries):
+            sorted_in_memory: bool = any("TEMP B-TREE" in line for line in details)
+            ordered_page: bool = (
+                "ORDER BY" in sql and " LIMIT " in sql and not sorted_in_memory
+            )
+            for detail in details:
+                scan: bool = any(
+                    detail == f"SCAN {table}" or detail.startswith(f"SCAN {table} ")
+                    for table in self.ledger_tables
+                )
+                if (scan and not ordered_page) or (
+                    "TEMP B-TREE" in detail and not sorts
+                ):
+                    scans.append((detail, sql))
+        return scans
+
+    def assertNoFullScans(self, *urls: str, sorts: bool = False):
+        self.client.force_login(self.admin)
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(self.full_scans(context.captured_queries, sorts), [], url)
+
+    def test_dashboard_queries_use_indexes(self):
+        """
+        Test that the paginated listings and top expenses are index scans.
+        """
+        cursor: str = encode_cursor((date(2025, 1, 1), 1))
+        self.assertNoFullScans(
+            reverse("home"),
+            f"{reverse('home')}?expenses_after={cursor}&incomes_before={cursor}",
+            reverse("expenses_list"),
+            f"{reverse('expenses_list')}?expenses_after="
+            f"{encode_cursor(('Rent', 1))}",
+        )
+
+    def test_admin_changelist_queries_use_indexes(self):
+        """
+        Test that the admin changelists, their default ordering, their list
+        filters and their searches are index scans, and that equality filters
+        read their page in order instead of sorting every match.
+        """
+        expenses: str = reverse("admin:tracker_expenses_changelist")
+        income: str = reverse("admin:tracker_income_changelist")
+        self.assertNoFullScans(
+            expenses,
+            f"{expenses}?category__exact=Utilities",
+            f"{expenses}?amount_range=100-1000",
+            income,
+            f"{income}?source=Salary",
+            f"{income}?amount_range=1000-",
+            f"{expenses}?q=ren",
+            f"{income}?q=SAL",
+        )
+        # No index returns a range of other values in the ordering's order:
+        # those matches are sorted.
+        self.assertNoFullScans(
+            f"{expenses}?date__gte=2025-04-01&date__lt=2025-05-01",
+            f"{income}?date__gte=2025-04-01&date__lt=2025-05-01",
+            sorts=True,
+        )
+
+    def test_search_api_uses_full_text_indexes(self):
+        """
+        Test that the search endpoint reads the FTS5 indexes and then the
+        matching rows by primary key.
+        """
+        self.assertNoFullScans(f"{reverse('api_search')}?q=ren")
+
+    def test_rollup_rebuild_uses_indexes(self):
+        """
+        Test that rebuild_rollups, which reads every ledger row, walks them
+        per category and day in an index's order instead of sorting them.
+        """
+        with CaptureQueriesContext(connection) as context:
+            rollups.rebuild()
+        details: list = [
+            line for _, plan in self.plans(context.captured_queries) for line in plan
+        ]
+        self.assertEqual(len(details), 2)
+        self.assertTrue(all("USING INDEX" in line for line in details), details)
+
+
+# ========================
+# Tests for the admin
+# ========================
+
+
+class LedgerAdminTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        for name, expense in (("Rent", 80_000), ("rental car", 5_000), ("Tea", 300)):
+            Expenses.objects.create(name=name, expense=expense, category="Other")
+        Income.objects.create(source="Salary", amount=250_000)
+        Income.objects.create(source="Bonus", amount=50_000)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def changelist(self, model: str, query: str = ""):
+        return self.client.get(f"{reverse(f'admin:tracker_{model}_changelist')}{query}")
+
+    def test_unfiltered_changelists_are_counted_from_the_rollups(self):
+        """
+        Test that the unfiltered changelist never counts the ledger table,
+        while filtered ones are counted exactly.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.changelist("expenses")
+        self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertFalse(
+            any(
+                "COUNT(" in query["sql"] and '"tracker_expenses"' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+        response = self.changelist("expenses", "?amount_range=10-100")
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    def test_filters_are_ranges_and_rollup_sources(self):
+        """
+        Test that the amount filter offers fixed ranges and the source filter
+        the sources known to the rollups.
+        """
+        response = self.changelist("income", "?amount_range=1000-")
+        self.assertEqual(
+            [income.source for income in response.context["cl"].result_list],
+            ["Salary"],
+        )
+        sources = [
+            choice["display"]
+            for spec in response.context["cl"].filter_specs
+            if spec.title == "source"
+            for choice in spec.choices(response.context["cl"])
+        ]
+        self.assertEqual(sources, ["All", "Bonus", "Salary"])
+
+    def test_search_matches_case_insensitive_prefixes(self):
+        """
+        Test that searching matches names starting with the term, in any case,
+        through the case-insensitive name index.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.changelist("expenses", "?q=REN")
+        self.assertEqual(
+            sorted(expense.name for expense in response.context["cl"].result_list),
+            ["Rent", "rental car"],
+        )
+
+        search: str = next(
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and " LIKE " in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {search}")
+            plan: str = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("expenses_name_nocase_idx (name>? AND name<?)", plan)
+
+
+# ========================
+# Tests for DashboardStats
+# ========================
+
+
+class DashboardStatsTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name, amount, category in (
+            ("Rent", 800, "Utilities"),
+            ("Food", 300, "Groceries"),
+            ("Power", 100, "Utilities"),
+            ("Cinema", 20, "Entertainment"),
+        ):
+            Expenses.objects.create(name=name, expense=amount, category=category)
+        Income.objects.create(source="Salary", amount=1500)
+        Income.objects.create(source="Bonus", amount=500)
+
+    def test_load_computes_every_statistic_in_two_queries(self):
+        """
+        Test that totals, breakdown and top expenses take exactly two queries.
+        """
+        with self.assertNumQueries(2):
+            stats = DashboardStats.load()
+
+        self.assertEqual(stats.total_income, Decimal(2000))
+        self.assertEqual(stats.total_expenses, Decimal(1220))
+        self.assertEqual(stats.net_worth, Decimal(780))
+        self.assertEqual(stats.savings_rate, Decimal(39))
+        self.assertEqual(
+            stats.expense_breakdown,
+            [
+                {"category": "Utilities", "total": Decimal(900)},
+                {"category": "Groceries", "total": Decimal(300)},
+                {"category": "Entertainment", "total": Decimal(20)},
+            ],
+        )
+        self.assertEqual(
+            [expense.name for expense in stats.top_expenses], ["Rent", "Food", "Power"]
+        )
+
+    def test_savings_rate_without_income_is_zero(self):
+        """
+        Test that the savings rate does not divide by zero when there is no income.
+        """
+        Income.objects.all().delete()
+        self.assertEqual(DashboardStats.load().savings_rate, 0)
+
+    def test_home_query_count_is_locked(self):
+        """
+        Test that rendering the dashboard costs two statistics queries, one for
+        the budgets and one per paginated listing, and that the template does
+        not re-query.
+        """
+        with self.assertNumQueries(5):
+            self.client.get(reverse("home"))
+
+
+# ========================
+# Tests for the dashboard filters
+# ========================
+
+
+class DashboardFilterTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name, amount, category, day in (
+            ("Rent", 500, "Utilities", date(2025, 4, 1)),
+            ("Power", 90, "Utilities", date(2025, 4, 20)),
+            ("Food", 60, "Groceries", date(2025, 4, 2)),
+            ("Heating", 300, "Utilities", date(2025, 3, 10)),
+        ):
+            Expenses.objects.create(
+                name=name, expense=amount, category=category, date=day
+            )
+        for source, amount, day in (
+            ("Salary", 1000, date(2025, 4, 1)),
+            ("Bonus", 200, date(2025, 4, 15)),
+            ("Salary", 900, date(2025, 3, 1)),
+        ):
+            Income.objects.create(source=source, amount=amount, date=day)
+
+    def test_filters_apply_to_listings_and_statistics(self):
+        """
+        Test that the date range, category and source filters restrict the
+        listings, totals, breakdown and top expenses alike.
+        """
+        response = self.client.get(
+            reverse("home"),
+            {
+                "start": "2025-04-01",
+                "end": "2025-04-30",
+                "category": "Utilities",
+                "source": "Salary",
+            },
+        )
+
+        self.assertEqual(
+            [expense.name for expense in response.context["expenses"]],
+            ["Rent", "Power"],
+        )
+        self.assertEqual(
+            [income.source for income in response.context["incomes"]], ["Salary"]
+        )
+        self.assertEqual(response.context["total_expenses"], 590)
+        self.assertEqual(response.context["total_income"], 1000)
+        self.assertEqual(
+            response.context["expense_breakdown"],
+            [{"category": "Utilities", "total": 590}],
+        )
+        self.assertEqual(
+            [expense.name for expense in response.context["top_expenses"]],
+            ["Rent", "Power"],
+        )
+
+    def test_partial_months_are_served_from_daily_rollups(self):
+        """
+        Test that a range not made of whole months sums the daily rollups.
+        """
+        stats = DashboardStats.load(
+            LedgerFilter(start=date(2025, 4, 2), end=date(2025, 4, 15))
+        )
+        self.assertEqual((stats.total_income, stats.total_expenses), (200, 60))
+
+    def test_invalid_filters_are_ignored(self):
+        """Test that an invalid filter value leaves the other filters in place."""
+        response = self.client.get(
+            reverse("home"), {"start": "April", "category": "Groceries"}
+        )
+        self.assertEqual(response.context["total_expenses"], 60)
+        self.assertIn("start", response.context["filter_form"].errors)
+
+    def test_filtered_queries_are_range_scans(self):
+        """
+        Test that every filtered query seeks into an index instead of scanning
+        a whole table or index, so its cost follows the size of the range.
+        """
+        for query in (
+            "start=2025-04-01&end=2025-04-30",
+            "start=2025-04-03&end=2025-04-20&category=Utilities&source=Salary",
+        ):
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(f"{reverse('home')}?{query}")
+            with connection.cursor() as cursor:
+                for captured in context.captured_queries:
+                    if not captured["sql"].startswith("SELECT"):
+                        continue
+                    cursor.execute(f"EXPLAIN QUERY PLAN {captured['sql']}")
+                    for row in cursor.fetchall():
+                        detail: str = row[-1]
+                        # The budgets are a handful of rows, read in full.
+                        if detail.startswith("SCAN tracker_budget"):
+                            continue
+                        if detail.startswith("SCAN tracker_"):
+                            self.fail(f"{detail} for {query}: {captured['sql']}")
+
+
+# ========================
+# Tests for the dashboard cache
+# ========================
+
+
+class DashboardCacheTests(TrackerTestCase):
+    def test_repeated_visits_are_served_from_the_cache(self):
+        """
+        Test that a second visit with the same CSRF cookie needs no queries.
+        """
+        Expenses.objects.create(name="Rent", expense=500, category="Utilities")
+        self.client.get(reverse("home"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"))
+
+        self.assertContains(response, "Rent")
+
+    def test_writes_invalidate_the_cache(self):
+        """
+        Test that adding and deleting entries through the views bumps the
+        ledger version, so the next visit sees the change.
+        """
+        self.client.get(reverse("home"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("add_income"),
+                {"source": "Salary", "amount": "1000", "date": "2025-04-01"},
+            )
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "Salary")
+        self.assertEqual(response.context["total_income"], Money(100_000))
+
+        income = Income.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_income", args=[income.pk]))
+        response = self.client.get(reverse("home"))
+        self.assertNotContains(response, "Salary")
+
+    def test_ledger_version_is_bumped_once_the_write_commits(self):
+        """
+        Test that a write bumps the shared ledger version only when its
+        transaction commits, so no request can cache the old data under the
+        new version, and that a rolled back write keeps the version.
+        """
+        version: int = caching.ledger_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Income.objects.create(source="Salary", amount=100)
+            self.assertEqual(caching.ledger_version(), version)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(caching.ledger_version(), version)
+        self.assertEqual(
+            caching.versions.get(caching.VERSION_KEY), caching.ledger_version()
+        )
+
+        version = caching.ledger_version()
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(
+            IntegrityError
+        ):
+            with transaction.atomic():
+                Income.objects.create(source="Bonus", amount=100)
+                raise IntegrityError
+        self.assertEqual(caching.ledger_version(), version)
+
+    def test_fragments_are_shared_between_visitors(self):
+        """
+        Test that the rendered listings, which hold no CSRF token, are served
+        from the cache to every visitor while each page gets its own token.
+        """
+        Expenses.objects.create(name="Rent", expense=500, category="Utilities")
+        first = self.client.get(reverse("home"))
+
+        other = Client()
+        second = other.get(reverse("home"))
+
+        self.assertEqual(caching.stats()["misses"]["expense_rows"], 1)
+        self.assertEqual(caching.stats()["hits"]["expense_rows"], 1)
+        self.assertNotEqual(
+            first.cookies["csrftoken"].value, second.cookies["csrftoken"].value
+        )
+
+    def test_cache_stats_reports_hits_and_misses(self):
+        """
+        Test that the monitoring endpoint exposes the hit/miss counters.
+        """
+        self.client.get(reverse("home"))
+        self.client.get(reverse("home"))
+
+        report = self.client.get(reverse("cache_stats")).json()
+
+        self.assertGreaterEqual(report["hits"]["stats"], 1)
+        self.assertGreaterEqual(report["misses"]["stats"], 1)
+        self.assertEqual(report["ledger_version"], caching.ledger_version())
+
+
+# ========================
+# Tests for the listing templates
+# ========================
+
+
+class ListingTemplateTests(TrackerTestCase):
+    def test_rows_share_one_delete_form(self):
+        """
+        Test that the rows render no form or CSRF token of their own, and that
+        each Delete button submits the shared form to its row's URL.
+        """
+        expenses = [
+            Expenses.objects.create(name=f"Item {n}", expense=500, category="Other")
+            for n in range(3)
+        ]
+        income = Income.objects.create(source="Salary", amount=100_000)
+
+        response = self.client.get(reverse("home"))
+
+        # The shared delete form and the add expense/income forms.
+        self.assertContains(response, 'name="csrfmiddlewaretoken"', count=3)
+        self.assertContains(response, 'form="deleteForm"', count=4)
+        for expense in expenses:
+            self.assertContains(
+                response,
+                f'formaction="{reverse("delete_expense", args=[expense.pk])}"',
+            )
+        self.assertContains(
+            response, f'formaction="{reverse("delete_income", args=[income.pk])}"'
+        )
+
+        self.client.post(reverse("delete_expense", args=[expenses[0].pk]))
+        self.assertEqual(Expenses.objects.count(), 2)
+
+    def test_templates_are_loaded_once(self):
+        """
+        Test that templates go through the cached loader, so they are parsed
+        once per process rather than on every request.
+        """
+        engine = engines.all()[0].engine
+        self.assertIsInstance(engine.template_loaders[0], CachedLoader)
+        self.assertIs(
+            engine.get_template("home.html"), engine.get_template("home.html")
+        )
+
+
+# ========================
+# Tests for the bulk importer
+# ========================
+
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250403120000
+<TRNAMT>-42.60
+<NAME>Corner Shop
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250405<TRNAMT>1500.00<NAME>ACME Payroll</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250406
+<TRNAMT>abc
+<NAME>Broken
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class LedgerImportTests(TrackerTestCase):
+    def test_csv_import_writes_valid_rows_and_reports_rejected_ones(self):
+        """
+        Test that valid CSV rows are bulk created, with the rollups updated, and
+        that invalid rows are rejected with their line number.
+        """
+        stream = StringIO(
+            "name,expense,category,date\n"
+            "Rent,800,Utilities,2025-04-01\n"
+            "Refund,-5,Other,2025-04-02\n"
+            "Food,60,Groceries,2025-04-03\n"
+            "Gift,10,Presents,2025-04-04\n"
+        )
+
+        report = importers.import_file(stream, "csv", kind="expense", batch_size=2)
+
+        self.assertEqual((report.created, report.rejected), (2, 2))
+        self.assertEqual([error["row"] for error in report.errors], [3, 5])
+        self.assertIn("expense", report.errors[0]["error"])
+        self.assertIn("category", report.errors[1]["error"])
+        self.assertEqual(rollups.totals(), (Money(0), Money(86_000)))
+
+    def test_csv_import_with_kind_column_mixes_expenses_and_income(self):
+        """
+        Test that a kind column lets one file hold both expenses and incomes.
+        """
+        stream = StringIO(
+            "kind,name,expense,category,source,amount,date\n"
+            "expense,Rent,800,Utilities,,,2025-04-01\n"
+            "income,,,,Salary,2500.50,2025-04-01\n"
+            ",Unknown,1,Other,,,2025-04-01\n"
+        )
+
+        report = importers.import_file(stream, "csv")
+
+        self.assertEqual((report.created, report.rejected), (2, 1))
+        self.assertEqual(Income.objects.get().amount, Money(250_050))
+
+    def test_ofx_import_maps_debits_to_expenses_and_credits_to_income(self):
+        """
+        Test that OFX debits become expenses and credits become incomes.
+        """
+        report = importers.import_file(StringIO(OFX_STATEMENT), "ofx")
+
+        self.assertEqual((report.created, report.rejected), (2, 1))
+        expense = Expenses.objects.get()
+        self.assertEqual(
+            (expense.name, expense.expense, expense.date),
+            ("Corner Shop", Money(4_260), date(2025, 4, 3)),
+        )
+        self.assertEqual(Income.objects.get().source, "ACME Payroll")
+
+    def test_ofx_elements_reads_across_chunk_boundaries(self):
+        """
+        Test that tags split between two read chunks are parsed correctly.
+        """
+        elements = list(importers.ofx_elements(StringIO(OFX_STATEMENT), chunk_size=7))
+        self.assertIn(("TRNAMT", "-42.60"), elements)
+        self.assertIn(("NAME", "ACME Payroll"), elements)
+
+    def test_import_endpoint_returns_a_json_report(self):
+        """
+        Test that uploading a file to the import endpoint imports it.
+        """
+        upload = SimpleUploadedFile(
+            "income.csv", b"source,amount,date\nSalary,1000,2025-04-01\n"
+        )
+        response = self.client.post(
+            reverse("import_ledger"),
+            {"file": upload, "format": "csv", "kind": "income"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(Income.objects.count(), 1)
+
+    def test_unreadable_files_are_imported_up_to_the_failing_row(self):
+        """
+        Test that a file that is not UTF-8, or not valid CSV, is answered with
+        a 400 report giving the failing row, the rows before it imported.
+        """
+        header: bytes = b"name,expense,category,date\n"
+        row: bytes = b"Lunch,5,Groceries,2025-04-01\n"
+        too_long: bytes = b'"' + b"x" * 200_000 + b'",5,Groceries,2025-04-01\n'
+        for content, failing_row in (
+            (header + row + b"Caf\xe9,4,Groceries,2025-04-02\n" + row, 3),
+            (header + row + row + too_long + row, 4),
+        ):
+            Expenses.objects.all().delete()
+            response = self.client.post(
+                reverse("import_ledger"),
+                {
+                    "file": SimpleUploadedFile("expenses.csv", content),
+                    "format": "csv",
+                    "kind": "expense",
+                },
+            )
+
+            self.assertEqual(response.status_code, 400)
+            report: dict = response.json()
+            self.assertEqual(report["failure"]["row"], failing_row)
+            self.assertEqual(report["created"], failing_row - 2)
+            self.assertEqual(Expenses.objects.count(), failing_row - 2)
+
+    def test_import_ledger_command(self):
+        """
+        Test that the import_ledger command guesses the format from the extension.
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".ofx", delete=False) as file:
+            file.write(OFX_STATEMENT)
+        self.addCleanup(os.remove, file.name)
+
+        out = StringIO()
+        call_command("import_ledger", file.name, stdout=out, stderr=StringIO())
+
+        self.assertIn("Imported 2 rows, rejected 1", out.getvalue())
+
+
+# ========================
+# Tests for the budgets
+# ========================
+
+
+class BudgetTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        Budget.objects.create(category="Groceries", amount=50_000)
+        Budget.objects.create(category="Utilities", amount=20_000)
+
+    def statuses(self, month: date = date(2024, 3, 1)) -> dict:
+        return {status.category: status for status in budgets.month_status(month)}
+
+    def test_spending_follows_added_and_deleted_expenses(self):
+        """
+        Test that a budget's spending is the category's total for the month,
+        updated as expenses are added and deleted.
+        """
+        Expenses.objects.create(
+            name="Market", expense=30_000, category="Groceries", date=date(2024, 3, 2)
+        )
+        big = Expenses.objects.create(
+            name="Party", expense=25_000, category="Groceries", date=date(2024, 3, 9)
+        )
+        Expenses.objects.create(
+            name="Market", expense=90_000, category="Groceries", date=date(2024, 4, 1)
+        )
+
+        groceries = self.statuses()["Groceries"]
+        self.assertEqual(groceries.spent, Money(55_000))
+        self.assertTrue(groceries.over)
+        self.assertEqual(groceries.remaining, Money(-5_000))
+
+        big.delete()
+        groceries = self.statuses()["Groceries"]
+        self.assertEqual(groceries.spent, Money(30_000))
+        self.assertFalse(groceries.over)
+
+    def test_budgets_without_spending_and_in_one_query(self):
+        """
+        Test that budgets with nothing spent report 0, and that every budget is
+        checked with a single query.
+        """
+        with self.assertNumQueries(1):
+            statuses = self.statuses()
+        self.assertEqual(statuses["Utilities"].spent, Money(0))
+        self.assertEqual(statuses["Utilities"].percent, 0)
+
+    def test_dashboard_and_api_flag_categories_over_budget(self):
+        """
+        Test that the dashboard and the API show this month's over-budget
+        categories, and pick up new expenses and budget changes.
+        """
+        client = Client()
+        self.assertNotContains(client.get(reverse("home")), "Over budget")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Expenses.objects.create(name="Power", expense=25_000, category="Utilities")
+        self.assertContains(client.get(reverse("home")), "Over budget", count=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Budget.objects.filter(category="Utilities").get().delete()
+        self.assertNotContains(client.get(reverse("home")), "Over budget")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Budget.objects.create(category="Utilities", amount=100)
+        results = client.get(reverse("api_budgets")).json()["results"]
+        self.assertEqual(
+            [(result["category"], result["over"]) for result in results],
+            [("Groceries", False), ("Utilities", True)],
+        )
+
+    def test_api_etag_changes_with_the_month(self):
+        """
+        Test that the budgets endpoint answers its ETag with a 304 until the
+        month rolls over, then with the new month's statuses in dollars.
+        """
+        url: str = reverse("api_budgets")
+        with mock.patch(
+            "django.utils.timezone.localdate", return_value=date(2024, 3, 31)
+        ):
+            etag: str = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with mock.patch(
+            "django.utils.timezone.localdate", return_value=date(2024, 4, 1)
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"][0],
+            {
+                "category": "Groceries",
+                "amount": "500.00",
+                "spent": "0.00",
+                "remaining": "500.00",
+                "over": False,
+            },
+        )
+
+
+# ========================
+# Tests for the recurring rules
+# ========================
+
+
+class RecurringRuleTests(TrackerTestCase):
+    def rule(self, **fields) -> RecurringRule:
+        defaults = {
+            "kind": RecurringRule.EXPENSE,
+            "name": "Rent",
+            "amount": 80_000,
+            "category": "Utilities",
+            "frequency": RecurringRule.MONTHLY,
+            "start_date": date(2024, 1, 31),
+        }
+        return RecurringRule.objects.create(**{**defaults, **fields})
+
+    def test_monthly_rules_keep_their_day_in_short_months(self):
+        """
+        Test that a rule starting on the 31st falls on the last day of shorter
+        months, and that the rule remembers where it stopped.
+        """
+        rule = self.rule()
+        report = recurring.materialize(until=date(2024, 4, 30))
+
+        self.assertEqual(report.created, 4)
+        self.assertEqual(
+            list(Expenses.objects.order_by("date").values_list("date", flat=True)),
+            [
+                date(2024, 1, 31),
+                date(2024, 2, 29),
+                date(2024, 3, 31),
+                date(2024, 4, 30),
+            ],
+        )
+        rule.refresh_from_db()
+        self.assertEqual((rule.materialized, rule.next_date), (4, date(2024, 5, 31)))
+
+    def test_materializing_again_writes_nothing_new(self):
+        """
+        Test that a repeated run only adds the occurrences that fell due since,
+        and that the rollups count every occurrence once.
+        """
+        self.rule(
+            kind=RecurringRule.INCOME,
+            name="Salary",
+            amount=250_000,
+            category="",
+            frequency=RecurringRule.WEEKLY,
+            start_date=date(2024, 1, 1),
+        )
+        recurring.materialize(until=date(2024, 1, 31))
+        self.assertEqual(recurring.materialize(until=date(2024, 1, 31)).created, 0)
+        self.assertEqual(recurring.materialize(until=date(2024, 2, 5)).created, 1)
+
+        self.assertEqual(Income.objects.count(), 6)
+        self.assertEqual(rollups.totals(), (Money(6 * 250_000), Money(0)))
+
+    def test_batches_split_rules_without_gaps_or_duplicates(self):
+        """
+        Test that occurrences of one rule spread over several batches are all
+        written exactly once.
+        """
+        self.rule(frequency=RecurringRule.WEEKLY, start_date=date(2024, 1, 1))
+        self.rule(name="Gym", category="Memberships", start_date=date(2023, 6, 15))
+        report = recurring.materialize(until=date(2024, 12, 31), batch_size=7)
+
+        self.assertEqual(report.created, 53 + 19)
+        self.assertEqual(Expenses.objects.count(), 53 + 19)
+        self.assertEqual(rollups.totals(), (Money(0), Money(72 * 80_000)))
+
+    def test_occurrences_are_linked_searchable_and_rolled_up(self):
+        """
+        Test that the rows written as plain tuples are complete: linked to
+        their rule, in the full-text index and in the daily rollups.
+        """
+        rule = self.rule(name="Studio rent", start_date=date(2024, 1, 1))
+        recurring.materialize(until=date(2024, 3, 15))
+
+        self.assertEqual(
+            list(Expenses.objects.values_list("recurring_rule", "expense")),
+            [(rule.pk, Money(80_000))] * 3,
+        )
+        self.assertEqual(len(search.search("expense", "studio")), 3)
+        self.assertEqual(
+            rollup_snapshot(DailyRollup),
+            {
+                (Rollup.EXPENSE, "Utilities", date(2024, month, 1), 80_000, 1)
+                for month in (1, 2, 3)
+            },
+        )
+
+    def test_rules_stop_at_their_end_date(self):
+        """Test that a rule past its end date is written up to it and deactivated."""
+        rule = self.rule(
+            frequency=RecurringRule.YEARLY,
+            start_date=date(2020, 2, 29),
+            end_date=date(2023, 12, 31),
+        )
+        call_command(
+            "materialize_recurring", "--until", "2025-01-01", stdout=StringIO()
+        )
+
+        self.assertEqual(
+            list(Expenses.objects.order_by("date").values_list("date", flat=True)),
+            [
+                date(2020, 2, 29),
+                date(2021, 2, 28),
+                date(2022, 2, 28),
+                date(2023, 2, 28),
+            ],
+        )
+        rule.refresh_from_db()
+        self.assertFalse(rule.active)
+        self.assertIsNone(rule.next_date)
+
+
+# ========================
+# Tests for the exporter
+# ========================
+
+
+class LedgerExportTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Expenses.objects.create(
+            name="Rent", expense=800, category="Utilities", date=date(2025, 3, 1)
+        )
+        Expenses.objects.create(
+            name="Food", expense=60, category="Groceries", date=date(2025, 4, 2)
+        )
+        Expenses.objects.create(
+            name="Power", expense=90, category="Utilities", date=date(2025, 4, 3)
+        )
+        Income.objects.create(source="Salary", amount=250_050, date=date(2025, 4, 1))
+
+    def test_csv_export_streams_filtered_rows(self):
+        """
+        Test that the CSV export is streamed and honours the date range and
+        category filters.
+        """
+        response = self.client.get(
+            reverse("export_ledger", args=["expense", "csv"]),
+            {"start": "2025-04-01", "category": "Utilities"},
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "expense_id,name,expense,category,date")
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], ["Power"])
+
+    def test_ndjson_export_of_income(self):
+        """
+        Test that the NDJSON export writes one JSON object per income.
+        """
+        response = self.client.get(reverse("export_ledger", args=["income", "ndjson"]))
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(rows[0]["source"], "Salary")
+        self.assertEqual(rows[0]["amount"], "2500.50")
+        self.assertEqual(rows[0]["date"], "2025-04-01")
+
+    def test_export_rejects_unknown_kinds_and_bad_filters(self):
+        """
+        Test that unknown export kinds are 404s and invalid dates are 400s.
+        """
+        self.assertEqual(
+            self.client.get(
+                reverse("export_ledger", args=["budget", "csv"])
+            ).status_code,
+            404,
+        )
+        response = self.client.get(
+            reverse("export_ledger", args=["expense", "csv"]), {"start": "yesterday"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_exported_csv_can_be_imported_again(self):
+        """
+        Test that an export_ledger CSV file is accepted by the importer.
+        """
+        out = StringIO()
+        call_command("export_ledger", "expense", stdout=out)
+        Expenses.objects.all().delete()
+
+        report = importers.import_file(StringIO(out.getvalue()), "csv", kind="expense")
+
+        self.assertEqual((report.created, report.rejected), (3, 0))
+        self.assertEqual(rollups.totals()[1], Decimal(950))
+
+
+# ========================
+# Tests for the async views
+# ========================
+
+
+class AsyncViewTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Expenses.objects.create(
+            name="Rent", expense=800, category="Utilities", date=date(2025, 4, 1)
+        )
+        Expenses.objects.create(
+            name="Food", expense=200, category="Groceries", date=date(2025, 4, 2)
+        )
+        Income.objects.create(source="Salary", amount=2000, date=date(2025, 4, 1))
+
+    async def test_aload_matches_load(self):
+        """
+        Test that the async statistics loader returns the same statistics.
+        """
+        stats = await DashboardStats.aload()
+        expected = await sync_to_async(DashboardStats.load)()
+        self.assertEqual(stats, expected)
+
+    async def test_async_dashboard_renders_statistics_and_listings(self):
+        """
+        Test that the async dashboard renders the listings and totals.
+        """
+        response = await self.async_client.get(reverse("home_async"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Rent")
+        self.assertContains(response, "Salary")
+        self.assertEqual(response.context["total_expenses"], Decimal(1000))
+
+    async def test_summary_api_returns_json_statistics(self):
+        """
+        Test that the summary API returns the statistics as JSON.
+        """
+        response = await self.async_client.get(reverse("api_summary"))
+        summary = response.json()
+
+        self.assertEqual(summary["total_income"], "20.00")
+        self.assertEqual(summary["net_worth"], "10.00")
+        self.assertEqual(Decimal(summary["savings_rate"]), Decimal(50))
+        self.assertEqual(
+            [expense["name"] for expense in summary["top_expenses"]], ["Rent", "Food"]
+        )
+
+
+# ========================
+# Tests for the JSON API
+# ========================
+
+
+class JsonApiTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for day, name, amount, category in (
+            (1, "Rent", 800, "Utilities"),
+            (2, "Food", 60, "Groceries"),
+            (3, "Power", 90, "Utilities"),
+            (4, "Gym", 30, "Memberships"),
+        ):
+            Expenses.objects.create(
+                name=name, expense=amount, category=category, date=date(2025, 4, day)
+            )
+        Expenses.objects.create(
+            name="Books", expense=40, category="Education", date=date(2025, 5, 10)
+        )
+        Income.objects.create(source="Salary", amount=2500, date=date(2025, 4, 1))
+
+    def test_expense_list_is_cursor_paginated_and_filtered(self):
+        """
+        Test that the expense list follows its next cursor and applies filters.
+        """
+        url: str = reverse("api_expenses")
+        first = self.client.get(url, {"limit": 2, "end": "2025-04-30"}).json()
+        second = self.client.get(
+            url, {"limit": 2, "end": "2025-04-30", "after": first["next"]}
+        ).json()
+
+        self.assertEqual([row["name"] for row in first["results"]], ["Rent", "Food"])
+        self.assertEqual([row["name"] for row in second["results"]], ["Power", "Gym"])
+        self.assertIsNone(second["next"])
+        self.assertEqual(
+            set(first["results"][0]),
+            {"expense_id", "name", "expense", "category", "date"},
+        )
+
+        filtered = self.client.get(url, {"category": "Utilities"}).json()
+        self.assertEqual(
+            [row["name"] for row in filtered["results"]], ["Rent", "Power"]
+        )
+
+    def test_list_rejects_invalid_parameters(self):
+        """
+        Test that an out-of-range limit and a bad cursor are 400s.
+        """
+        self.assertEqual(
+            self.client.get(reverse("api_income"), {"limit": 1000}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(reverse("api_income"), {"after": "x"}).status_code, 400
+        )
+
+    def test_categories_are_served_from_rollups_for_any_range(self):
+        """
+        Test that per-category totals are right for whole months and for
+        arbitrary day ranges.
+        """
+        month = self.client.get(
+            reverse("api_categories"), {"start": "2025-04-01", "end": "2025-04-30"}
+        ).json()
+        days = self.client.get(
+            reverse("api_categories"), {"start": "2025-04-02", "end": "2025-05-15"}
+        ).json()
+
+        self.assertEqual(
+            [(row["category"], row["count"]) for row in month["expenses"]],
+            [("Utilities", 2), ("Groceries", 1), ("Memberships", 1)],
+        )
+        self.assertEqual(month["income"][0]["total"], "25.00")
+        self.assertEqual(
+            {row["category"]: row["total"] for row in days["expenses"]},
+            {
+                "Utilities": "0.90",
+                "Groceries": "0.60",
+                "Education": "0.40",
+                "Memberships": "0.30",
+            },
+        )
+
+    def test_unchanged_ledger_answers_if_none_match_with_304(self):
+        """
+        Test that polling with the last ETag gets a 304 with no queries until
+        the ledger changes.
+        """
+        url: str = reverse("api_summary")
+        etag: str = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Income.objects.create(source="Bonus", amount=100)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+# ========================
+# Tests for the spending trends
+# ========================
+
+
+class SpendingTrendsTests(TrackerTestCase):
+    def spend(self, category: str, amounts: dict) -> None:
+        """Adds one expense of ``category`` per ``{(year, month): cents}``."""
+        for (year, month), amount in amounts.items():
+            Expenses.objects.create(
+                name=category,
+                expense=amount,
+                category=category,
+                date=date(year, month, 3),
+            )
+
+    def test_monthly_spend_rolling_averages_and_forecast(self):
+        """
+        Test the monthly series of each category and of the total, with
+        months before the first expense left out of the averages and the
+        current month left out of the history.
+        """
+        self.spend(
+            "Groceries",
+            {(2025, 1): 100, (2025, 2): 200, (2025, 3): 300, (2025, 5): 500},
+        )
+        self.spend("Debt", {(2024, 12): 1200, (2025, 6): 10_000})
+
+        trends = analytics.SpendingTrends.load(date(2025, 6, 15), history=4, horizon=2)
+        data: dict = trends.as_dict()
+
+        self.assertEqual(
+            data["months"],
+            [date(2025, 2, 1), date(2025, 3, 1), date(2025, 4, 1), date(2025, 5, 1)],
+        )
+        self.assertEqual(data["forecast_months"], [date(2025, 6, 1), date(2025, 7, 1)])
+        debt, groceries = data["categories"]
+        self.assertEqual(debt["category"], "Debt")
+        self.assertEqual(debt["spend"], [0, 0, 0, 0])
+        # The ledger started in December: 1200 / 3 in February, then 1200 / 4...
+        self.assertEqual(debt["average_3"], [400, 0, 0, 0])
+        self.assertEqual(debt["average_12"], [400, 300, 240, 200])
+        self.assertEqual(groceries["spend"], [200, 300, 0, 500])
+        self.assertEqual(groceries["average_3"], [100, 200, 167, 267])
+        # Divided by the months since the ledger started, not since January.
+        self.assertEqual(groceries["average_12"], [100, 150, 120, 183])
+        self.assertEqual(data["total"]["spend"], [200, 300, 0, 500])
+        self.assertEqual(data["total"]["average_12"], [500, 450, 360, 383])
+        # The trend of December to May, 0 to 500 cents: about 66 cents a month.
+        self.assertEqual(groceries["forecast"], [413, 479])
+
+    def test_empty_ledger(self):
+        """
+        Test that a ledger without expenses has no categories and zero totals.
+        """
+        data: dict = analytics.SpendingTrends.load(date(2025, 6, 1)).as_dict()
+
+        self.assertEqual(data["categories"], [])
+        self.assertEqual(len(data["months"]), analytics.HISTORY_MONTHS)
+        self.assertEqual(data["total"]["spend"], [0] * analytics.HISTORY_MONTHS)
+        self.assertEqual(data["total"]["forecast"], [0] * analytics.FORECAST_MONTHS)
+
+    def test_forecast_never_goes_below_zero(self):
+        """
+        Test that a falling trend is forecast down to zero, not below.
+        """
+        forecast = analytics.linear_forecast(
+            np.array([[900.0, 600.0, 300.0], [50.0, 50.0, 50.0]]), 3
+        )
+        self.assertEqual(forecast.tolist(), [[0.0, 0.0, 0.0], [50.0, 50.0, 50.0]])
+        self.assertEqual(
+            analytics.linear_forecast(np.array([[70.0]]), 2).tolist(), [[70.0, 70.0]]
+        )
+
+    def test_api_is_cached_until_the_ledger_changes(self):
+        """
+        Test that the endpoint computes the trends once per ledger version.
+        """
+        url: str = reverse("api_analytics")
+        self.client.get(url, {"months": 6})
+        with self.assertNumQueries(0):
+            data: dict = self.client.get(url, {"months": 6}).json()
+        self.assertEqual(len(data["months"]), 6)
+        self.assertEqual(len(data["forecast_months"]), analytics.FORECAST_MONTHS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.spend("Groceries", {(2020, 1): 10})
+        data = self.client.get(url, {"months": 6}).json()
+        self.assertEqual(data["categories"][0]["category"], "Groceries")
+        self.assertEqual(caching.stats()["misses"]["analytics"], 2)
+        self.assertEqual(self.client.get(url, {"horizon": 0}).status_code, 400)
+
+    def test_api_etag_changes_with_the_month(self):
+        """
+        Test that the endpoint answers its ETag with a 304 until the month
+        rolls over, then with the new month's trends, in dollars.
+        """
+        self.spend("Groceries", {(2025, 5): 1250})
+        url: str = reverse("api_analytics")
+        with mock.patch(
+            "django.utils.timezone.localdate", return_value=date(2025, 5, 31)
+        ):
+            etag: str = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with mock.patch(
+            "django.utils.timezone.localdate", return_value=date(2025, 6, 1)
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["months"][-1], "2025-05-01")
+        self.assertEqual(response.json()["total"]["spend"][-1], "12.50")
+
+
+# ========================
+# Tests for the full-text search
+# ========================
+
+
+class SearchTests(TrackerTestCase):
+    def names(self, text: str, kind: str = "expense") -> list:
+        column: str = search.SEARCH_COLUMNS[kind]
+        return [row[column] for row in search.search(kind, text)]
+
+    def test_query_quotes_every_word_and_prefixes_the_last(self):
+        """
+        Test that user input never reaches FTS5 as query syntax.
+        """
+        self.assertEqual(search.fts_query('rent OR "gro* -x'), '"rent" "OR" "gro" "x"*')
+        self.assertEqual(search.fts_query("Café_bar"), '"Café" "bar"*')
+        self.assertEqual(search.fts_query(' *" -- '), "")
+        self.assertEqual(search.search("expense", "--"), [])
+
+    def test_index_follows_every_kind_of_write(self):
+        """
+        Test that saves, updates, deletes, bulk inserts and raw SQL inserts
+        are all reflected in the full-text index.
+        """
+        rent = Expenses.objects.create(
+            name="Rent", expense=500, category="Utilities", date=date(2025, 4, 1)
+        )
+        Expenses.objects.bulk_create(
+            [
+                Expenses(name="Water bill", expense=30, category="Utilities"),
+                Expenses(name="Power bill", expense=90, category="Utilities"),
+            ]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                insert_sql(Income, ("source", "amount", "date")),
+                ["Freelance gig", 25000, "2025-04-02"],
+            )
+        self.assertEqual(self.names("rent"), ["Rent"])
+        self.assertCountEqual(self.names("bill"), ["Water bill", "Power bill"])
+        self.assertEqual(self.names("free", "income"), ["Freelance gig"])
+
+        rent.name = "Mortgage"
+        rent.save()
+        Expenses.objects.filter(name="Water bill").update(name="Water")
+        Expenses.objects.filter(name="Power bill").delete()
+        self.assertEqual(self.names("rent"), [])
+        self.assertEqual(self.names("mort"), ["Mortgage"])
+        self.assertEqual(self.names("bill"), [])
+        self.assertEqual(self.names("water"), ["Water"])
+
+    def test_matches_all_words_ranked_by_relevance(self):
+        """
+        Test that every word must match, the last one as a prefix, that
+        closer matches rank first and that ties go to the newest row.
+        """
+        for name in (
+            "Car insurance",
+            "Car",
+            "Insurance for the car, the house and the boat",
+            "Caravan",
+        ):
+            Expenses.objects.create(name=name, expense=100, category="Other")
+
+        self.assertEqual(
+            self.names("car"),
+            [
+                "Caravan",
+                "Car",
+                "Car insurance",
+                "Insurance for the car, the house and the boat",
+            ],
+        )
+        self.assertEqual(
+            self.names("car ins"),
+            ["Car insurance", "Insurance for the car, the house and the boat"],
+        )
+        self.assertEqual(self.names("insurance car"), self.names("car insurance"))
+        self.assertEqual(self.names("bus"), [])
+
+    def test_window_bounds_the_matches_ranked(self):
+        """
+        Test that every match is ranked by default, and only the newest
+        ``window`` matches when one is given, in the API too.
+        """
+        Expenses.objects.create(name="Car", expense=100, category="Other")
+        Expenses.objects.create(name="Car wash and wax", expense=100, category="Other")
+
+        self.assertEqual(self.names("car"), ["Car", "Car wash and wax"])
+        self.assertEqual(
+            [row["name"] for row in search.search("expense", "car", 1, window=1)],
+            ["Car wash and wax"],
+        )
+        self.assertEqual(
+            [row["name"] for row in search.search("expense", "car", 1)], ["Car"]
+        )
+        url: str = reverse("api_search")
+        data: dict = self.client.get(url, {"q": "car", "limit": 1}).json()
+        self.assertEqual(data["expenses"][0]["name"], "Car")
+        data: dict = self.client.get(url, {"q": "car", "limit": 1, "window": 1}).json()
+        self.assertEqual(data["expenses"][0]["name"], "Car wash and wax")
+        self.assertEqual(
+            self.client.get(url, {"q": "car", "window": 0}).status_code, 400
+        )
+
+    def test_search_api_returns_both_kinds(self):
+        """
+        Test that the endpoint returns ranked expenses and incomes with the
+        columns of the listings, and rejects a missing query.
+        """
+        Expenses.objects.create(
+            name="Salary advance repayment",
+            expense=200,
+            category="Debt",
+            date=date(2025, 4, 3),
+        )
+        Income.objects.create(source="Salary", amount=2500, date=date(2025, 4, 1))
+        Income.objects.create(source="Bonus", amount=300, date=date(2025, 4, 1))
+
+        data: dict = self.client.get(reverse("api_search"), {"q": "sal"}).json()
+
+        [expense] = data["expenses"]
+        self.assertEqual(
+            set(expense), {"expense_id", "name", "expense", "category", "date"}
+        )
+        self.assertEqual(expense["name"], "Salary advance repayment")
+        self.assertEqual(expense["expense"], "2.00")
+        self.assertEqual([row["source"] for row in data["income"]], ["Salary"])
+        self.assertEqual(self.client.get(reverse("api_search")).status_code, 400)
+
+
+# ========================
+# Tests for the metrics middleware
+# ========================
+
+
+class MetricsTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.histogram.clear()
+        Expenses.objects.create(
+            name="Rent", expense=80_000, category="Utilities", date=date(2025, 4, 1)
+        )
+
+    def server_timing(self, response) -> dict:
+        return metrics.parse_server_timing(response["Server-Timing"])
+
+    def test_server_timing_reports_queries_and_render_time(self):
+        """
+        Test that the dashboard's Server-Timing header counts the queries it
+        ran and reports SQL, template and total time.
+        """
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("home"))
+
+        timings = self.server_timing(response)
+        self.assertEqual(timings["db"][1], "5 queries")
+        self.assertGreater(timings["tpl"][0], 0)
+        self.assertGreaterEqual(timings["total"][0], timings["tpl"][0])
+
+    def test_metrics_endpoint_exposes_per_view_histograms(self):
+        """
+        Test that /metrics serves the requests seen so far per view in the
+        Prometheus text format, with cumulative buckets.
+        """
+        self.client.get(reverse("home"))
+        self.client.get(reverse("home"))
+        self.client.get(reverse("cache_stats"))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body: str = response.content.decode()
+        self.assertIn(
+            'tracker_request_duration_seconds_bucket{view="home",le="+Inf"} 2', body
+        )
+        self.assertIn('tracker_request_duration_seconds_count{view="home"} 2', body)
+        self.assertIn('tracker_db_queries_total{view="home"} 5', body)
+        self.assertIn(
+            'tracker_request_duration_seconds_count{view="cache_stats"} 1', body
+        )
+
+    async def test_async_views_are_measured(self):
+        """
+        Test that queries run by async views through the async ORM are counted.
+        """
+        response = await self.async_client.get(reverse("api_summary"))
+
+        self.assertEqual(self.server_timing(response)["db"][1], "2 queries")
+
+    def test_disabled_metrics_add_nothing(self):
+        """
+        Test that with TRACKER_METRICS off the middleware is not used at all.
+        """
+        with self.settings(TRACKER_METRICS=False):
+            response = Client().get(reverse("home"))
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(metrics.histogram.views, {})
+
+
+# ========================
+# Tests for the benchmark suite
+# ========================
+
+
+class BenchmarkReportTests(TestCase):
+    def test_regressions_are_more_queries_or_slower_renders(self):
+        """
+        Test that comparing benchmark reports flags endpoints that run more
+        queries or got slower beyond the tolerance, and nothing else.
+        """
+
+        def report(queries: int, median: float, template: float) -> dict:
+            result = {"queries": queries, "median_ms": median, "template_ms": template}
+            return {"results": {"10000": {"home": result}}}
+
+        baseline = report(5, 40.0, 20.0)
+        self.assertEqual(compare_reports(report(5, 55.0, 25.0), baseline, 0.5), [])
+        self.assertEqual(
+            compare_reports(report(6, 70.0, 20.0), baseline, 0.5),
+            [
+                "home at 10,000 rows: 5 -> 6 queries",
+                "home at 10,000 rows: median_ms 40.0 -> 70.0",
+            ],
+        )
+        self.assertEqual(
+            compare_reports(
+                {"results": {"100": report(9, 1, 1)["results"]["10000"]}}, baseline, 0.5
+            ),
+            [],
+        )
+
+
+# ========================
+# Tests for the SQLite profile
+# ========================
+
+
+class SqliteProfileTests(SimpleTestCase):
+    # The tests use database files of their own, since the test database is an
+    # in-memory one, which has no journal to tune.
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory: str = directory.name
+        self.options: dict = settings.DATABASES["default"]["OPTIONS"]
+
+    def connect(self, name: str, options: dict):
+        database = sqlite_connection(os.path.join(self.directory, name), options)
+        self.addCleanup(database.close)
+        return database.cursor()
+
+    def test_new_connections_get_the_profile(self):
+        """
+        Test that every new connection runs the profile's pragmas and that
+        connections are kept open across requests.
+        """
+        cursor = self.connect("tuned.sqlite3", self.options)
+        pragmas = {
+            pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+        }
+
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": 20_000,
+                "cache_size": -64 * 1024,
+            },
+        )
+        self.assertGreater(settings.DATABASES["default"]["CONN_MAX_AGE"], 0)
+
+    def test_readers_do_not_wait_for_bulk_inserts(self):
+        """
+        Test that with the profile a reader sees the committed rows at once
+        while a bulk insert is in progress, where the default rollback journal
+        locks readers out as soon as the insert spills to disk.
+        """
+        for name, options, blocked in (
+            ("default.sqlite3", {}, True),
+            ("tuned.sqlite3", self.options, False),
+        ):
+            with self.subTest(name):
+                # A tiny page cache makes the insert spill to disk early.
+                writer = self.connect(name, {**options, "timeout": 0.1})
+                writer.execute("CREATE TABLE entry (id INTEGER PRIMARY KEY, name TEXT)")
+                writer.execute("INSERT INTO entry (name) VALUES ('committed')")
+                writer.execute("PRAGMA cache_size = 10")
+                reader = self.connect(name, {**options, "timeout": 0.1})
+
+                writer.execute("BEGIN IMMEDIATE")
+                writer.executemany(
+                    "INSERT INTO entry (name) VALUES (%s)", [("x" * 100,)] * 20_000
+                )
+                if blocked:
+                    with self.assertRaisesMessage(OperationalError, "locked"):
+                        reader.execute("SELECT COUNT(*) FROM entry")
+                else:
+                    reader.execute("SELECT COUNT(*) FROM entry")
+                    self.assertEqual(reader.fetchone(), (1,))
+                writer.execute("COMMIT")
@@ -1,52 +1,250 @@
+import calendar
+import functools
+from datetime import date
+from typing import NamedTuple
+
+from django.core.handlers.asgi import ASGIRequest
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Sum, QuerySet
-from .forms import ExpensesForm, IncomeForm
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_POST
+from . import budgets, caching, exporters, importers, metrics
+from .forms import (
+    DashboardFilterForm,
+    ExpensesForm,
+    IncomeForm,
+    LedgerFilterForm,
+    LedgerImportForm,
+)
+from .ledger import LedgerFilter
 from .models import Expenses, Income
+from .pagination import KeysetPage, apaginate_request, paginate_request
+from .stats import DashboardStats
 
 
 def home(request: WSGIRequest) -> HttpResponse:
-    expenses: QuerySet = Expenses.objects.all().order_by("date")
-    incomes: QuerySet = Income.objects.all().order_by("date")
-
-    total_income: float = incomes.aggregate(total=Sum("amount"))["total"] or 0
-    total_expenses: float = expenses.aggregate(total=Sum("expense"))["total"] or 0
-    net_worth: float = total_income - total_expenses
-
-    expense_breakdown: QuerySet = (
-        Expenses.objects.values("category")
-        .annotate(total=Sum("expense"))
-        .order_by("-total")
-    )
-    top_expenses: QuerySet = Expenses.objects.all().order_by("-expense")[:3]
-    savings_rate: float = (net_worth / total_income * 100) if total_income > 0 else 0
-
     # Process expense form if POST, else create an empty expense form.
     if request.method == "POST" and "expense" in request.POST:
         expense_form = ExpensesForm(request.POST)
         if expense_form.is_valid():
-            expense_form.save()
+            # The post_save signal updates the rollups: commit both or neither.
+            with transaction.atomic():
+                expense_form.save()
             return redirect("home")
     else:
         expense_form = ExpensesForm()
 
-    # Always create an empty income form for inline income entry.
-    income_form = IncomeForm()
-
-    context: dict = {
-        "expenses": expenses,
-        "incomes": incomes,
-        "form": expense_form,
-        "income_form": income_form,
-        "net_worth": net_worth,
-        "total_income": total_income,
-        "total_expenses": total_expenses,
-        "expense_breakdown": expense_breakdown,
-        "savings_rate": savings_rate,
-        "top_expenses": top_expenses,
+    filter_form = DashboardFilterForm(request.GET)
+    filters: LedgerFilter = filter_form.ledger_filter()
+
+    # The statistics and the rendered listings are cached per ledger version,
+    # so repeated visits do not touch the database until something is written.
+    # The listings hold no CSRF token (rows submit the page's shared delete
+    # form), so every visitor gets the same cached fragments.
+    stats: DashboardStats = caching.cached(
+        "stats", lambda: DashboardStats.load(filters), *filters.key_parts()
+    )
+    budget_status: list = caching.cached(
+        "budgets", budgets.month_status, timezone.localdate().isoformat()
+    )
+    query: str = request.GET.urlencode()
+    expense_rows: str = caching.cached(
+        "expense_rows",
+        lambda: render_listing(
+            request,
+            "expense_rows.html",
+            filters.expenses(),
+            ("date", "expense_id"),
+            "expenses",
+        ),
+        query,
+    )
+    income_rows: str = caching.cached(
+        "income_rows",
+        lambda: render_listing(
+            request,
+            "income_rows.html",
+            filters.incomes(),
+            ("date", "income_id"),
+            "incomes",
+        ),
+        query,
+    )
+
+    return render(
+        request,
+        "home.html",
+        dashboard_context(
+            stats,
+            expense_rows,
+            income_rows,
+            filter_form,
+            budget_status,
+            expense_form,
+        ),
+    )
+
+
+@require_GET
+async def home_async(request: ASGIRequest) -> HttpResponse:
+    """
+    Async version of the dashboard, for ASGI servers.
+
+    Reads the statistics and both listings with the async ORM, which runs the
+    queries one after another on Django's single sync thread: the view
+    queries no faster than ``home``, but serves the dashboard under ASGI
+    without a worker thread per request. Entries are still added through the
+    regular form views.
+    """
+    filter_form = DashboardFilterForm(request.GET)
+    filters: LedgerFilter = filter_form.ledger_filter()
+    query: str = request.GET.urlencode()
+    stats: DashboardStats = await caching.acached(
+        "stats", lambda: DashboardStats.aload(filters), *filters.key_parts()
+    )
+    budget_status: list = await caching.acached(
+        "budgets", budgets.amonth_status, timezone.localdate().isoformat()
+    )
+    expense_rows: str = await caching.acached(
+        "expense_rows",
+        lambda: arender_listing(
+            request,
+            "expense_rows.html",
+            filters.expenses(),
+            ("date", "expense_id"),
+            "expenses",
+        ),
+        query,
+    )
+    income_rows: str = await caching.acached(
+        "income_rows",
+        lambda: arender_listing(
+            request,
+            "income_rows.html",
+            filters.incomes(),
+            ("date", "income_id"),
+            "incomes",
+        ),
+        query,
+    )
+    return render(
+        request,
+        "home.html",
+        dashboard_context(stats, expense_rows, income_rows, filter_form, budget_status),
+    )
+
+
+def dashboard_context(
+    stats: DashboardStats,
+    expense_rows: str,
+    income_rows: str,
+    filter_form: DashboardFilterForm,
+    budget_status: list,
+    expense_form: ExpensesForm | None = None,
+) -> dict:
+    today: date = timezone.localdate()
+    return {
+        "expense_rows": expense_rows,
+        "income_rows": income_rows,
+        "filter_form": filter_form,
+        "this_month": {
+            "start": today.replace(day=1),
+            "end": today.replace(day=calendar.monthrange(today.year, today.month)[1]),
+        },
+        "form": expense_form or ExpensesForm(),
+        # Always create an empty income form for inline income entry.
+        "income_form": IncomeForm(),
+        "net_worth": stats.net_worth,
+        "total_income": stats.total_income,
+        "total_expenses": stats.total_expenses,
+        "expense_breakdown": stats.expense_breakdown,
+        "savings_rate": stats.savings_rate,
+        "top_expenses": stats.top_expenses,
+        "budgets": budget_status,
+    }
+
+
+def render_listing(
+    request: WSGIRequest,
+    template: str,
+    queryset: QuerySet,
+    ordering: tuple,
+    prefix: str,
+) -> str:
+    """
+    Renders one keyset-paginated page of ``queryset`` with the given row template.
+
+    The page is exposed to the template as ``<prefix>`` (the rows) and as
+    ``<singular prefix>_page`` (the page with its links), e.g. ``expenses`` and
+    ``expense_page``.
+    """
+    page: KeysetPage = paginate_request(request, queryset, ordering, prefix)
+    return render_to_string(template, listing_context(page, prefix), request=request)
+
+
+async def arender_listing(
+    request: ASGIRequest,
+    template: str,
+    queryset: QuerySet,
+    ordering: tuple,
+    prefix: str,
+) -> str:
+    """Async version of ``render_listing``."""
+    page: KeysetPage = await apaginate_request(request, queryset, ordering, prefix)
+    return render_to_string(template, listing_context(page, prefix), request=request)
+
+
+def listing_context(page: KeysetPage, prefix: str) -> dict:
+    return {
+        prefix: page.items,
+        f"{prefix[:-1]}_page": page,
+        "delete_url": pk_url(f"delete_{prefix[:-1]}"),
     }
-    return render(request, "home.html", context)
+
+
+class PkUrl(NamedTuple):
+    """A URL split around its primary key argument."""
+
+    prefix: str
+    suffix: str
+
+
+# Reversed in place of the primary key, then split on.
+PK_PLACEHOLDER = 2_147_483_647
+
+
+@functools.cache
+def pk_url(name: str) -> PkUrl:
+    """
+    Returns the URL of the view ``name`` split around its primary key, so the
+    row templates build each row's URL by concatenation rather than calling
+    ``{% url %}`` per row.
+    """
+    prefix, suffix = reverse(name, args=[PK_PLACEHOLDER]).split(str(PK_PLACEHOLDER))
+    return PkUrl(prefix, suffix)
+
+
+def cache_stats(request: WSGIRequest) -> JsonResponse:
+    """
+    Report the dashboard cache hit/miss counters of this process for monitoring.
+    """
+    return JsonResponse(caching.stats())
+
+
+def metrics_view(request: WSGIRequest) -> HttpResponse:
+    """
+    Report the per-view latency histogram, query counts, SQL and template time
+    of this process in the Prometheus text format, for scraping.
+    """
+    return HttpResponse(
+        metrics.histogram.exposition(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 def add_expense(request: WSGIRequest) -> HttpResponse:
@@ -59,7 +257,8 @@ def add_expense(request: WSGIRequest) -> HttpResponse:
     if request.method == "POST":
         form = ExpensesForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             return redirect("home")
     else:
         form = ExpensesForm()
@@ -68,12 +267,21 @@ def add_expense(request: WSGIRequest) -> HttpResponse:
 
 def expenses_list(request: WSGIRequest) -> HttpResponse:
     """
-    List all expense entries.
+    List expense entries.
 
-    Retrieves all expenses ordered by name and renders them in the home template.
+    Retrieves one keyset-paginated page of expenses ordered by name, restricted
+    to the dashboard filters in the query string, and renders it in the home
+    template.
     """
-    expenses: QuerySet = Expenses.objects.all().order_by("name")
-    return render(request, "home.html", {"expenses": expenses})
+    filters: LedgerFilter = DashboardFilterForm(request.GET).ledger_filter()
+    expense_rows: str = render_listing(
+        request,
+        "expense_rows.html",
+        filters.expenses(),
+        ("name", "expense_id"),
+        "expenses",
+    )
+    return render(request, "home.html", {"expense_rows": expense_rows})
 
 
 def delete_expense(request: WSGIRequest, expense_id: int) -> HttpResponse:
@@ -84,7 +292,8 @@ def delete_expense(request: WSGIRequest, expense_id: int) -> HttpResponse:
     """
     expense: Expenses = get_object_or_404(Expenses, pk=expense_id)
     if request.method == "POST":
-        expense.delete()
+        with transaction.atomic():
+            expense.delete()
         return redirect("home")
     return render(request, "home.html", {"expense": expense})
 
@@ -99,7 +308,8 @@ def add_income(request: WSGIRequest) -> HttpResponse:
     if request.method == "POST":
         form = IncomeForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             return redirect("home")
     else:
         form = IncomeForm()
@@ -114,6 +324,54 @@ def delete_income(request: WSGIRequest, income_id: int) -> HttpResponse:
     """
     income: Income = get_object_or_404(Income, pk=income_id)
     if request.method == "POST":
-        income.delete()
+        with transaction.atomic():
+            income.delete()
         return redirect("home")
     return render(request, "home.html", {"income": income})
+
+
+@require_POST
+def import_ledger(request: WSGIRequest) -> JsonResponse:
+    """
+    Bulk import expenses and/or incomes from an uploaded CSV or OFX file.
+
+    The upload is streamed and written in batches (see tracker.importers), and
+    the response is a JSON report of created and rejected rows. A file that is
+    not UTF-8 or not valid CSV is imported up to the failing row and answered
+    with a 400, its report giving that row.
+    """
+    form = LedgerImportForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    file_format: str = form.cleaned_data["format"]
+    report: importers.ImportReport = importers.import_file(
+        importers.decode(form.cleaned_data["file"].file, file_format),
+        file_format,
+        kind=form.cleaned_data["kind"] or None,
+    )
+    return JsonResponse(report.as_dict(), status=400 if report.failure else 200)
+
+
+@require_GET
+def export_ledger(request: WSGIRequest, kind: str, file_format: str) -> HttpResponse:
+    """
+    Stream all expenses or incomes as CSV or NDJSON.
+
+    Accepts optional ``start``/``end`` dates and a ``category`` (the source, for
+    incomes) in the query string. Rows are sent as they are read, so the first
+    bytes go out immediately and memory use is constant.
+    """
+    if kind not in exporters.KINDS or file_format not in exporters.FORMATS:
+        raise Http404(f"No {file_format} export for {kind}.")
+
+    form = LedgerFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    response = StreamingHttpResponse(
+        exporters.export(kind, file_format, **form.cleaned_data),
+        content_type=exporters.FORMATS[file_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{kind}.{file_format}"'
+    return response